@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --- Batch AI Assessments ---
+# Pre-assesses many veterans at once (e.g. every Emergent and Urgent case at
+# shift start). Calls fan out over a bounded thread pool, since each one
+# mostly waits on the network, and a client-side rate limit spaces request
+# starts so the batch stays inside the provider quota. Results are yielded
+# in completion order, so the caller can store and report each one as it
+# lands.
+
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_MINUTE = 30
+
+BatchResult = namedtuple("BatchResult", ["key", "result", "error", "done", "total", "elapsed"])
+
+
+class RateLimiter:
+    """Spaces calls at least 60 / requests_per_minute seconds apart, across threads"""
+
+    def __init__(self, requests_per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        """Block until the caller may start its request"""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            self._sleep(start - now)
+
+
+def iter_batch(items, work, max_workers=DEFAULT_WORKERS, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+               limiter=None, initializer=None):
+    """Run work(item) for each (key, item) pair concurrently; yield a BatchResult per completion
+
+    Exceptions from work are returned in BatchResult.error instead of
+    stopping the batch. Closing the generator early cancels calls that
+    have not started yet. initializer runs once in each worker thread.
+    """
+    items = list(items)
+    limiter = limiter or RateLimiter(requests_per_minute)
+    started = time.perf_counter()
+
+    def run(item):
+        limiter.acquire()
+        return work(item)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-batch", initializer=initializer)
+    try:
+        futures = {pool.submit(run, item): key for key, item in items}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+            yield BatchResult(futures[future], result, error, done, len(items), time.perf_counter() - started)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+from collections import Counter, defaultdict
+
+# --- Appointment Store ---
+# Appointments indexed by date. Per-day and per-month counters of status
+# ('available', 'reserved', 'cancelled') and mode ('Face-to-Face',
+# 'Video Call') are kept up to date on every insert and update. Rendering a
+# month therefore costs one dictionary lookup per day instead of scanning
+# every appointment for every calendar cell.
+
+COUNTED_FIELDS = ('status', 'mode')
+
+
+class AppointmentStore:
+    """Appointments by date with per-day and per-month status/mode counts"""
+
+    def __init__(self, appointments=()):
+        self._by_date = defaultdict(list)
+        self._day_counts = defaultdict(Counter)
+        self._month_counts = defaultdict(Counter)
+        self._size = 0
+        for appointment in appointments:
+            self.add(appointment)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for date in sorted(self._by_date):
+            yield from self._by_date[date]
+
+    def _count(self, appointment, step):
+        date = appointment['date']
+        day, month = self._day_counts[date], self._month_counts[(date.year, date.month)]
+        for field in COUNTED_FIELDS:
+            day[appointment[field]] += step
+            month[appointment[field]] += step
+
+    def add(self, appointment):
+        """Insert an appointment dict (needs 'date', 'status' and 'mode')"""
+        self._by_date[appointment['date']].append(appointment)
+        self._count(appointment, 1)
+        self._size += 1
+        return appointment
+
+    def update(self, appointment, **changes):
+        """Change fields of a stored appointment, moving it if its date changes"""
+        self._count(appointment, -1)
+        if 'date' in changes and changes['date'] != appointment['date']:
+            # Match by identity: two slots can hold equal field values
+            day = self._by_date[appointment['date']]
+            del day[next(i for i, stored in enumerate(day) if stored is appointment)]
+            self._by_date[changes['date']].append(appointment)
+        appointment.update(changes)
+        self._count(appointment, 1)
+        return appointment
+
+    def on(self, date):
+        """Appointments on one date, by start time"""
+        return sorted(self._by_date.get(date, ()), key=lambda appointment: appointment['time'])
+
+    def count_on(self, date):
+        """Number of appointments on one date"""
+        return len(self._by_date.get(date, ()))
+
+    def day_counts(self, date):
+        """Status and mode counts for one date (missing keys count 0)"""
+        return self._day_counts.get(date, Counter())
+
+    def month_counts(self, year, month):
+        """Status and mode counts for one month (missing keys count 0)"""
+        return self._month_counts.get((year, month), Counter())
@@ -0,0 +1,115 @@
+import hashlib
+import threading
+from collections import namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Veterans Feed Client ---
+# Long-lived HTTP client for the veterans endpoint. Keeps a pooled keep-alive
+# session and revalidates with If-None-Match / If-Modified-Since, so an
+# unchanged feed costs a 304 instead of a full download. Bodies are streamed
+# rather than buffered so large payloads can be parsed incrementally.
+
+StreamResult = namedtuple("StreamResult", ["body", "not_modified", "server_date"])
+
+BODY_CHUNK_BYTES = 1 << 16
+
+
+class StreamedBody:
+    """Iterable over response body chunks that derives the payload version as it is read"""
+
+    def __init__(self, response, etag=None, chunk_bytes=BODY_CHUNK_BYTES):
+        self._response = response
+        self._chunk_bytes = chunk_bytes
+        self._digest = None if etag else hashlib.sha256()
+        self.version = f"etag:{etag}" if etag else None
+        self.on_complete = None
+
+    def __iter__(self):
+        try:
+            for chunk in self._response.iter_content(chunk_size=self._chunk_bytes):
+                if self._digest is not None:
+                    self._digest.update(chunk)
+                yield chunk
+            if self._digest is not None:
+                self.version = f"sha256:{self._digest.hexdigest()}"
+            if self.on_complete:
+                self.on_complete(self.version)
+        finally:
+            self._response.close()
+
+    def close(self):
+        self._response.close()
+
+
+class VeteransClient:
+    """Pooled, conditional-GET client for the veterans dashboard endpoint"""
+
+    def __init__(self, url, connect_timeout=3.05, read_timeout=10, pool_maxsize=4):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+        self._lock = threading.Lock()
+        self._etag = None
+        self._last_modified = None
+        self.last_version = None
+        self.requests_sent = 0
+        self.not_modified = 0
+
+    def _conditional_headers(self):
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def _body_complete(self, version):
+        with self._lock:
+            self.last_version = version
+
+    def stream(self, params=None, revalidate=True):
+        """Open the feed and return its body as a stream of chunks
+
+        With revalidate=True the request is conditional on the last body read;
+        the caller must then still hold data for `last_version`, because a 304
+        carries no body.
+        """
+        with self._lock:
+            headers = self._conditional_headers() if revalidate else {}
+
+        response = self.session.get(self.url, params=params, headers=headers, timeout=self.timeout, stream=True)
+        server_date = response.headers.get("Date")
+
+        with self._lock:
+            self.requests_sent += 1
+            if response.status_code == 304:
+                response.close()
+                self.not_modified += 1
+                return StreamResult(None, True, server_date)
+
+            try:
+                response.raise_for_status()  # Raise an error for HTTP errors
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self.last_version = None
+
+        body = StreamedBody(response, self._etag)
+        body.on_complete = self._body_complete
+        return StreamResult(body, False, server_date)
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests_sent, "not_modified": self.not_modified}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,168 @@
+import json
+import threading
+
+from streaming_ingest import DEFAULT_CHUNK_ROWS, iter_payload_records, iter_record_batches
+from veteran_schema import concat_frames
+
+# --- Incremental Delta Sync ---
+# Keeps the scored veterans frame up to date by merging only the records that
+# changed since the last refresh, keyed by Veteran ID.
+#
+# The upstream is asked for changes since a high-water mark via the
+# `updated_since` query parameter. A server that honours it replies with
+#   {"delta": true, "data": [...changed rows...], "deleted": [ids], "high_water_mark": "..."}
+# Any other reply is treated as a full snapshot and diffed client-side by
+# hashing each record, so only new or modified rows are rescored. Records are
+# consumed from the streamed body, so memory follows the churn, not the feed.
+# An optional triage queue is kept in step with every merge: changed veterans
+# are pushed and removed ones dropped, instead of rebuilding it per version.
+
+
+def _record_hash(record):
+    return hash(json.dumps(record, sort_keys=True, default=str))
+
+
+class DeltaSyncer:
+    """Maintains a scored frame by merging per-veteran changes from the feed"""
+
+    def __init__(self, client, prepare_rows, order_rows, key="Veteran ID", since_param="updated_since",
+                 chunk_rows=DEFAULT_CHUNK_ROWS, build_queue=None):
+        self.client = client
+        self.prepare_rows = prepare_rows  # list of records -> cleaned, scored DataFrame
+        self.order_rows = order_rows      # scored DataFrame -> triage-ordered DataFrame
+        self.build_queue = build_queue    # scored DataFrame -> TriageQueue, updated by push/remove on merges
+        self.key = key
+        self.since_param = since_param
+        self.chunk_rows = chunk_rows
+
+        self._lock = threading.Lock()
+        self.sequence = 0  # Never rewound, so versions stay unique for the process lifetime
+        self.reset()
+
+    def reset(self):
+        """Forget the synced frame so the next refresh performs a full load"""
+        # Waits for a refresh in progress on another thread, so it cannot merge into a cleared state
+        with self._lock:
+            self.frame = None
+            self.queue = None
+            self.high_water_mark = None
+            self._row_hashes = {}
+            self._synced_body = None
+            self.last_changed = 0
+            self.last_removed = 0
+            self.last_skipped = 0
+            self.last_mode = None
+
+    @property
+    def version(self):
+        return f"delta:{self.sequence}"
+
+    def queue_for(self, version):
+        """The triage queue matching version, or None once the syncer has moved on (or keeps no queue)"""
+        with self._lock:
+            return self.queue if version == self.version else None
+
+    def refresh(self):
+        """Pull changes from the upstream and return (frame, version)"""
+        with self._lock:
+            has_frame = self.frame is not None
+            params = {self.since_param: self.high_water_mark} if self.high_water_mark and has_frame else None
+            # Only revalidate when the frame reflects the client's last complete body
+            revalidate = has_frame and self._synced_body is not None and self.client.last_version == self._synced_body
+            result = self.client.stream(params=params, revalidate=revalidate)
+            if result.not_modified:
+                self.last_changed = self.last_removed = self.last_skipped = 0
+                self.last_mode = "not-modified"
+                return self.frame, self.version
+
+            meta = {}
+            records = iter_payload_records(result.body, meta)
+            if has_frame:
+                self._diff_and_merge(records, meta, params is not None)
+            else:
+                self._full_load(records)
+
+            self._synced_body = result.body.version
+            self.high_water_mark = meta.get('high_water_mark') or result.server_date
+            return self.frame, self.version
+
+    def _keyed(self, records):
+        self.last_skipped = 0
+        for record in records:
+            if isinstance(record, dict) and record.get(self.key) is not None:
+                yield record
+            else:
+                self.last_skipped += 1  # Rows without a Veteran ID cannot be merged
+
+    def _full_load(self, records):
+        row_hashes = {}
+        frames = []
+        for batch in iter_record_batches(self._keyed(records), self.chunk_rows):
+            for record in batch:
+                row_hashes[record[self.key]] = _record_hash(record)
+            frames.append(self.prepare_rows(batch))
+        if not frames:
+            raise ValueError("Veterans feed returned no records")
+        frame = self.order_rows(concat_frames(frames))
+        queue = self.build_queue(frame) if self.build_queue else None
+        self._row_hashes, self.frame, self.queue = row_hashes, frame, queue
+        self.sequence += 1
+        self.last_changed, self.last_removed = len(row_hashes), 0
+        self.last_mode = "full"
+
+    def _diff_and_merge(self, records, meta, requested_delta):
+        """Hash every streamed record and merge only the ones that differ"""
+        incoming = set()
+        changed = {}
+        for record in self._keyed(records):
+            record_id = record[self.key]
+            record_hash = _record_hash(record)
+            incoming.add(record_id)
+            if self._row_hashes.get(record_id) != record_hash:
+                changed[record_id] = (record, record_hash)
+
+        if requested_delta and meta.get('delta') is True:
+            removed = [record_id for record_id in meta.get('deleted', []) if record_id in self._row_hashes]
+            self.last_mode = "server-delta"
+        else:
+            removed = [record_id for record_id in self._row_hashes if record_id not in incoming]
+            self.last_mode = "hash-diff"
+        self._merge(changed, removed)
+
+    def _merge(self, changed, removed):
+        if not changed and not removed:
+            self.last_changed, self.last_removed = 0, 0
+            return
+
+        touched = set(removed) | set(changed)
+        kept = self.frame[~self.frame[self.key].isin(touched)]
+        parts = [kept]
+        if changed:
+            parts.append(self.prepare_rows([record for record, _ in changed.values()]))  # Only changed rows are rescored
+        frame = self.order_rows(concat_frames(parts))
+        queue = None
+        if self.queue is not None:
+            # The previous version keeps its queue; this one moves only the touched veterans
+            queue = self.queue.copy()
+            for record_id in removed:
+                queue.remove(record_id)
+            if changed:
+                queue.push_rows(parts[-1], self.key)
+
+        # Commit hashes only with the frame that holds them, so a failed rescore is retried next refresh
+        for record_id, (_, record_hash) in changed.items():
+            self._row_hashes[record_id] = record_hash
+        for record_id in removed:
+            self._row_hashes.pop(record_id, None)
+        self.frame, self.queue = frame, queue
+        self.sequence += 1
+        self.last_changed, self.last_removed = len(changed), len(removed)
+
+    def stats(self):
+        return {
+            "mode": self.last_mode,
+            "changed": self.last_changed,
+            "removed": self.last_removed,
+            "skipped": self.last_skipped,
+            "high_water_mark": self.high_water_mark,
+        }
@@ -0,0 +1,423 @@
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+# --- Sidebar Filter Engine ---
+# Compiles the sidebar selections into one boolean mask that is evaluated in
+# a single pass over the typed columns, instead of re-slicing a copied frame
+# once per filter. Categorical columns are matched through a per-category
+# lookup table indexed by their codes, so no strings are compared per row.
+# A FilterIndex built once per dataset version answers multiselects from
+# bitsets and slider ranges from sorted permutations.
+
+# Multiselect columns that get a bitmap index per dataset version
+INDEXED_COLUMNS = ["VA Category", "C-SSRS Screen", "Risk Level", "Treatment Preference", "Gender", "Assigned Clinician"]
+
+# Slider columns that get a sorted range index per dataset version
+RANGE_COLUMNS = ["PHQ-9 Score", "GAD-7 Score"]
+
+FILTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Ranges selecting less than this share of rows are answered from their candidates alone
+SPARSE_RANGE_FRACTION = 1 / 8
+
+# selections: ((column, (value, ...)), ...), ranges: ((column, (low, high)), ...)
+FilterState = namedtuple("FilterState", ["selections", "ranges"])
+
+
+def build_filter_state(selections=None, ranges=None):
+    """Normalize widget values into a hashable FilterState
+
+    An empty multiselect means "no filter" for that column, matching the
+    sidebar's existing behaviour. Range bounds are inclusive.
+    """
+    selections = tuple(sorted(
+        (column, tuple(sorted(values, key=str)))
+        for column, values in (selections or {}).items() if values
+    ))
+    ranges = tuple(sorted(
+        (column, (bounds[0], bounds[1])) for column, bounds in (ranges or {}).items()
+    ))
+    return FilterState(selections, ranges)
+
+
+def _isin_mask(series, values):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # One lookup per category; code -1 (missing) selects the trailing False
+        allowed = np.append(series.cat.categories.isin(values), False)
+        return allowed[series.cat.codes.to_numpy()]
+    return series.isin(values).to_numpy(dtype=bool)
+
+
+def _range_mask(series, low, high):
+    values = series.to_numpy()
+    return (values >= low) & (values <= high)
+
+
+# Set-bit count of every byte value (np.bitwise_count needs NumPy 2)
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def popcount(bits):
+    """Number of set bits in a packed uint8 bitset"""
+    return int(_BYTE_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+class BitmapIndex:
+    """Packed per-value row bitsets for the categorical filter columns of one dataset
+
+    Built once per dataset version; a multiselect then costs an OR over the
+    selected values' bitsets and an AND per column instead of an isin() scan.
+    """
+
+    def __init__(self, df, columns=INDEXED_COLUMNS):
+        self.rows = len(df)
+        self.bitmaps = {}  # column -> {value: packed uint8 bitset}
+        self.value_counts = {}  # column -> {value: rows}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes, values = series.cat.codes.to_numpy(), series.cat.categories
+            else:
+                codes, values = pd.factorize(series)
+            bitmaps, counts = {}, {}
+            for code, value in enumerate(values):
+                bits = np.packbits(codes == code)
+                count = popcount(bits)
+                if count:
+                    bitmaps[value], counts[value] = bits, count
+            self.bitmaps[column] = bitmaps
+            self.value_counts[column] = counts
+
+    def covers(self, df, column):
+        return column in self.bitmaps and len(df) == self.rows
+
+    def column_bits(self, column, values):
+        """Bitset of rows whose column value is any of values"""
+        bits = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        bitmaps = self.bitmaps[column]
+        for value in values:
+            value_bits = bitmaps.get(value)
+            if value_bits is not None:
+                bits |= value_bits
+        return bits
+
+    def counts(self, column):
+        """{value: rows} for an indexed column, from the bitset popcounts"""
+        return self.value_counts.get(column, {})
+
+    def spans_all(self, column, values):
+        """True when selecting values keeps every row, i.e. the column has no missing values"""
+        counts = self.value_counts.get(column)
+        return counts is not None and set(counts) <= set(values) and sum(counts.values()) == self.rows
+
+
+class SortedRangeIndex:
+    """Sorted permutation of one numeric column; answers low <= value <= high by binary search"""
+
+    def __init__(self, series):
+        values = series.to_numpy()
+        order = np.argsort(values, kind="stable")
+        sorted_values = values[order]
+        if sorted_values.dtype.kind == "f":
+            # NaN sorts last and never satisfies a range, so leave it out
+            valid = int(np.count_nonzero(~np.isnan(sorted_values)))
+            order, sorted_values = order[:valid], sorted_values[:valid]
+        self.rows = len(values)
+        self.order = order
+        self.sorted_values = sorted_values
+
+    def bounds(self, low, high):
+        """(start, stop) slice of self.order holding the rows in range, in O(log n)"""
+        dtype = self.sorted_values.dtype
+        if dtype.kind in "iu":
+            # Search with keys of the column's own dtype, or numpy upcasts the whole column per call
+            info = np.iinfo(dtype)
+            low, high = math.ceil(low), math.floor(high)
+            if low > info.max or high < info.min or low > high:
+                return 0, 0
+            low, high = dtype.type(max(low, info.min)), dtype.type(min(high, info.max))
+        else:
+            low, high = dtype.type(low), dtype.type(high)
+        start = int(np.searchsorted(self.sorted_values, low, side="left"))
+        stop = int(np.searchsorted(self.sorted_values, high, side="right"))
+        return start, max(start, stop)
+
+    def spans_all(self, low, high):
+        """True when [low, high] keeps every row, missing values included"""
+        return len(self.order) == self.rows and self.bounds(low, high) == (0, self.rows)
+
+    def positions(self, low, high):
+        """Row positions (unordered) whose value lies in [low, high]"""
+        start, stop = self.bounds(low, high)
+        return self.order[start:stop]
+
+
+class FilterIndex:
+    """Bitmap and sorted range indexes over one dataset version"""
+
+    def __init__(self, df, categorical_columns=INDEXED_COLUMNS, range_columns=RANGE_COLUMNS):
+        self.rows = len(df)
+        self.bitmaps = BitmapIndex(df, categorical_columns)
+        self.ranges = {column: SortedRangeIndex(df[column]) for column in range_columns if column in df.columns}
+
+    def covers(self, df, column):
+        return len(df) == self.rows and (column in self.ranges or self.bitmaps.covers(df, column))
+
+    def counts(self, column):
+        return self.bitmaps.counts(column)
+
+
+def canonical_filter_state(state, index=None):
+    """Drop filters that cannot exclude a row, so equivalent sidebar states share one key
+
+    Selecting every value of a column without missing values is the same as
+    no selection, and a slider spanning the whole column is the same as no
+    slider.
+    """
+    if not isinstance(index, FilterIndex):
+        return state
+    selections = tuple(
+        (column, values) for column, values in state.selections
+        if not index.bitmaps.spans_all(column, values)
+    )
+    ranges = tuple(
+        (column, bounds) for column, bounds in state.ranges
+        if not (column in index.ranges and index.ranges[column].spans_all(*bounds))
+    )
+    return FilterState(selections, ranges)
+
+
+def _selection_bits(df, selections, index):
+    """Split selections into (bitset of the indexed ones or None, the rest to scan)"""
+    bitmaps = index.bitmaps if isinstance(index, FilterIndex) else index
+    bits = None
+    remaining = []
+    for column, values in selections:
+        if bitmaps is not None and bitmaps.covers(df, column):
+            column_bits = bitmaps.column_bits(column, values)
+            bits = column_bits if bits is None else np.bitwise_and(bits, column_bits, out=bits)
+        else:
+            remaining.append((column, values))
+    return bits, remaining
+
+
+def filter_mask(df, state, index=None):
+    """Evaluate every filter in state into one boolean mask over df's rows
+
+    Selections on columns covered by the index are answered from its bitsets.
+    """
+    bits, remaining = _selection_bits(df, state.selections, index)
+    if bits is None:
+        mask = np.ones(len(df), dtype=bool)
+    else:
+        mask = np.unpackbits(bits, count=len(df)).view(bool)
+    for column, values in remaining:
+        mask &= _isin_mask(df[column], values)
+    for column, (low, high) in state.ranges:
+        mask &= _range_mask(df[column], low, high)
+    return mask
+
+
+def _check_candidates(df, candidates, state, index):
+    """Keep the candidate positions that pass state, touching only those rows"""
+    bits, remaining = _selection_bits(df, state.selections, index)
+    if bits is not None:
+        keep = (bits[candidates >> 3] >> (7 - (candidates & 7))) & 1
+        candidates = candidates[keep.astype(bool)]
+    for column, values in remaining:
+        candidates = candidates[_isin_mask(df[column].iloc[candidates], values)]
+    for column, (low, high) in state.ranges:
+        values = df[column].to_numpy()[candidates]
+        candidates = candidates[(values >= low) & (values <= high)]
+    return candidates
+
+
+def filter_positions(df, state, index=None):
+    """Row positions of df, in order, that pass every filter in state
+
+    With a FilterIndex, slider ranges are resolved by binary search: the most
+    selective range supplies the candidate rows, and only those rows are
+    checked against the other filters. Wide ranges fall back to one mask.
+    """
+    ranges = index.ranges if isinstance(index, FilterIndex) and len(df) == index.rows else {}
+    slices = []
+    for column, (low, high) in state.ranges:
+        if column in ranges:
+            start, stop = ranges[column].bounds(low, high)
+            slices.append((stop - start, column, start, stop))
+    if not slices or min(slices)[0] >= len(df) * SPARSE_RANGE_FRACTION:
+        return np.flatnonzero(filter_mask(df, state, index))
+
+    _, column, start, stop = min(slices)
+    candidates = ranges[column].order[start:stop]
+    rest = FilterState(state.selections, tuple(item for item in state.ranges if item[0] != column))
+    candidates = _check_candidates(df, candidates, rest, index)
+    # Sort a copy: with nothing else to check, candidates is still a view of the shared index
+    return np.sort(candidates)
+
+
+def apply_filter_state(df, state, index=None):
+    """Return the rows of df that pass state; df itself when nothing is filtered out"""
+    positions = filter_positions(df, state, index)
+    if len(positions) == len(df):
+        return df
+    return df.iloc[positions]
+
+
+class FilterResultCache:
+    """Byte-bounded LRU of filtered frames keyed by dataset version and canonical filter state
+
+    Cached frames are shared by every session and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes=FILTER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # (version, state) -> (frame, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def apply(self, df, version, state, index=None):
+        """Return the rows of df that pass state, reusing a cached result when possible"""
+        if isinstance(index, FilterIndex) and len(df) == index.rows:
+            state = canonical_filter_state(state, index)
+        key = (version, state)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key][0]
+
+        result = apply_filter_state(df, state, index)
+        # Shallow size: taken rows share their string objects and categories with df
+        size = 0 if result is df else int(result.memory_usage(index=True, deep=False).sum())
+
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes and key not in self._results:
+                self._results[key] = (result, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, evicted) = self._results.popitem(last=False)
+                    self.bytes -= evicted
+                    self.evictions += 1
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._results.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._results),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# --- Benchmark ---
+
+def _chained_filter(df, state):
+    """The previous sidebar implementation: copy, then one slice per filter"""
+    df_filtered = df.copy()
+    for column, values in state.selections:
+        df_filtered = df_filtered[df_filtered[column].isin(values)]
+    conditions = None
+    for column, (low, high) in state.ranges:
+        condition = (df_filtered[column] >= low) & (df_filtered[column] <= high)
+        conditions = condition if conditions is None else conditions & condition
+    return df_filtered if conditions is None else df_filtered[conditions]
+
+
+def benchmark(sizes=(10000, 100000, 1000000), repeats=5):
+    """Time the chained filter against the single-mask engine on synthetic data"""
+    from risk_engine import SCORE_COLUMNS, score_veterans
+    from synthetic_data import generate_synthetic_frame
+    from veteran_schema import apply_veteran_schema
+
+    state = build_filter_state(
+        {
+            "VA Category": ["Urgent", "Routine"],
+            "C-SSRS Screen": ["Negative", "Positive - Passive Ideation", "Positive - Active Ideation"],
+            "Risk Level": ["Critical - Ideation", "High - Self-Harm Flag", "High - Symptom Severity", "Medium"],
+            "Treatment Preference": ["Therapy", "Both"],
+            "Gender": ["Male", "Female"],
+            "Assigned Clinician": ["Dr. Smith", "Dr. Johnson", "Dr. Brown", "Unassigned"],
+        },
+        {"PHQ-9 Score": (5, 27), "GAD-7 Score": (0, 18)},
+    )
+    rows = []
+    for size in sizes:
+        df = generate_synthetic_frame(size)
+        df[SCORE_COLUMNS] = score_veterans(df)
+        df = apply_veteran_schema(df)
+        index = FilterIndex(df)
+
+        def with_index(frame, filters):
+            return apply_filter_state(frame, filters, index)
+
+        timings = {}
+        for name, run in (("chained", _chained_filter), ("single mask", apply_filter_state), ("indexed", with_index)):
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                result = run(df, state)
+                best = min(best, time.perf_counter() - started)
+            timings[name] = (best, len(result))
+        rows.append({
+            "Rows": size,
+            "Matched": timings["single mask"][1],
+            "Chained (ms)": round(timings["chained"][0] * 1000, 2),
+            "Single mask (ms)": round(timings["single mask"][0] * 1000, 2),
+            "Indexed (ms)": round(timings["indexed"][0] * 1000, 2),
+            "Speedup": round(timings["chained"][0] / timings["indexed"][0], 1),
+        })
+        assert timings["chained"][1] == timings["single mask"][1] == timings["indexed"][1]
+    return pd.DataFrame(rows)
+
+
+def benchmark_slider_drag(size=1000000, repeats=5):
+    """Time filter_positions() over a PHQ-9 slider drag, with and without the range index"""
+    from synthetic_data import generate_synthetic_frame
+
+    df = generate_synthetic_frame(size)
+    index = FilterIndex(df)
+    rows = []
+    for low in (0, 10, 18, 24, 27):
+        state = build_filter_state({"Gender": ["Female"]}, {"PHQ-9 Score": (low, 27), "GAD-7 Score": (0, 21)})
+        timings = {}
+        for name, use_index in (("mask", None), ("range index", index)):
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                positions = filter_positions(df, state, use_index)
+                best = min(best, time.perf_counter() - started)
+            timings[name] = (best, positions)
+        assert np.array_equal(timings["mask"][1], timings["range index"][1])
+        rows.append({
+            "PHQ-9 range": f"{low}-27",
+            "Matched": len(timings["mask"][1]),
+            "Mask (ms)": round(timings["mask"][0] * 1000, 2),
+            "Range index (ms)": round(timings["range index"][0] * 1000, 2),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
+    print()
+    print(benchmark_slider_drag().to_string(index=False))
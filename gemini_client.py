@@ -0,0 +1,240 @@
+import json
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Gemini API Client ---
+# Long-lived client for the Gemini generateContent endpoint. Keeps a pooled
+# keep-alive session with separate connect and read timeouts. Throttling and
+# transient server errors (429, 5xx, dropped connections) are retried with
+# jittered exponential backoff, waiting at least as long as the server's
+# Retry-After. A circuit breaker opens after repeated failed calls so that,
+# while the API is down, clinicians get an immediate answer instead of
+# waiting out every timeout. stream_generate() reads the server-sent-event
+# endpoint and yields text as it arrives.
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    """A Gemini call failed; str() is the message shown in the dashboard"""
+
+
+class GeminiHTTPError(GeminiError):
+    def __init__(self, status_code, detail):
+        super().__init__(f"API Error ({status_code}): {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class CircuitOpenError(GeminiError):
+    def __init__(self, retry_in):
+        super().__init__(f"AI service temporarily unavailable. Retrying automatically in {math.ceil(retry_in)}s.")
+        self.retry_in = retry_in
+
+
+def retry_after_seconds(value, now=None):
+    """Parse a Retry-After header (delta seconds or HTTP date); None if absent or invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; one trial call after `reset_seconds`"""
+
+    def __init__(self, failure_threshold=5, reset_seconds=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self.opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._clock() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go out now"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = self._clock() - self._opened_at
+            if waited < self.reset_seconds or self._trial_running:
+                raise CircuitOpenError(max(self.reset_seconds - waited, 0))
+            self._trial_running = True  # Half-open: this call is the trial
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    self.opened += 1
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class GeminiClient:
+    """Pooled Gemini client with timeouts, retry/backoff and a circuit breaker"""
+
+    def __init__(self, api_key, base_url=GEMINI_API_BASE, connect_timeout=3.05, read_timeout=60, max_retries=3,
+                 backoff_base=0.5, backoff_cap=8.0, max_retry_after=30.0, failure_threshold=5, reset_seconds=30,
+                 pool_maxsize=8, sleep=time.sleep, clock=time.monotonic):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds, clock)
+        self._sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def _post(self, url, payload, stream=False, params=None):
+        """POST with retries; returns a 200 response or raises GeminiError"""
+        self.breaker.before_call()
+        try:
+            return self._post_with_retries(url, payload, stream, params)
+        except GeminiError:
+            raise  # Already recorded on the breaker
+        except BaseException:
+            # Anything else (a bug, an interrupted backoff sleep) still ends a half-open trial
+            self.breaker.record_failure()
+            raise
+
+    def _post_with_retries(self, url, payload, stream, params):
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                with self._lock:
+                    self.requests_sent += 1
+                response = self.session.post(url, params={"key": self.api_key, **(params or {})}, json=payload,
+                                             timeout=self.timeout, stream=stream)
+            except requests.exceptions.Timeout:
+                error = GeminiError("Request timed out. Please try again.")
+            except requests.exceptions.RequestException as e:
+                error = GeminiError(f"Network error: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response
+                try:
+                    detail = response.json() if response.content else "Unknown error"
+                except ValueError:
+                    detail = response.text or "Unknown error"
+                error = GeminiHTTPError(response.status_code, detail)
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+                response.close()
+                if response.status_code not in RETRY_STATUSES:
+                    # The request itself is wrong (bad key, bad prompt): retrying cannot help,
+                    # and it says nothing about the API being down
+                    self.breaker.record_success()
+                    raise error
+
+            if attempt >= self.max_retries or (retry_after or 0) > self.max_retry_after:
+                with self._lock:
+                    self.failures += 1
+                self.breaker.record_failure()
+                raise error
+            with self._lock:
+                self.retries += 1
+            self._sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def generate(self, prompt, model, generation_config=None):
+        """Text of the first candidate for one prompt; raises GeminiError"""
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        response = self._post(f"{self.base_url}/models/{model}:generateContent", payload)
+        result = response.json()
+        if 'candidates' in result and len(result['candidates']) > 0:
+            if 'content' in result['candidates'][0] and 'parts' in result['candidates'][0]['content']:
+                return result['candidates'][0]['content']['parts'][0]['text']
+            raise GeminiError("AI response format unexpected. Please try again.")
+        raise GeminiError("No response generated. Please try again.")
+
+    def stream_generate(self, prompt, model, generation_config=None):
+        """Yield the answer's text pieces as the server streams them; raises GeminiError
+
+        Retries only cover opening the stream: once text has been yielded, a
+        dropped connection is reported rather than replayed.
+        """
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        response = self._post(f"{self.base_url}/models/{model}:streamGenerateContent", payload, stream=True,
+                              params={"alt": "sse"})
+        # SSE is always UTF-8; without a charset requests would decode it as ISO-8859-1
+        response.encoding = "utf-8"
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                for candidate in event.get('candidates', [])[:1]:
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+        except requests.exceptions.Timeout:
+            raise GeminiError("Request timed out. Please try again.")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise GeminiError(f"Network error: {str(e)}")
+        finally:
+            response.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests_sent,
+                "retries": self.retries,
+                "failures": self.failures,
+                "circuit": self.breaker.state,
+                "circuit_opened": self.breaker.opened,
+            }
+
+    def close(self):
+        self.session.close()
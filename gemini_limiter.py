@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import Future
+
+# --- Gemini Rate Limiter ---
+# One process-wide gate in front of every Gemini call, shared by all
+# sessions. Two token buckets enforce requests per minute and tokens per
+# minute. Callers reserve capacity as they arrive, so they are served in
+# arrival order, and sleep off any deficit outside the lock. Identical
+# prompts already in flight are coalesced: the first caller makes the
+# request and everyone else waits for its result, so several clinicians
+# clicking the same summary at once cost one request.
+
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_TOKENS_PER_MINUTE = 1000000
+
+
+def estimate_tokens(prompt, max_output_tokens=0):
+    """Rough token cost of one request: ~4 characters per prompt token plus the output budget"""
+    return len(prompt) // 4 + 1 + max_output_tokens
+
+
+class TokenBucket:
+    """Refills continuously up to `capacity`; reservations may run it negative"""
+
+    def __init__(self, per_minute, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    def reserve(self, amount):
+        """Take `amount` now; returns the seconds until the bucket has covered it"""
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+        self._level -= amount
+        return max(0.0, -self._level / self.rate)
+
+
+class GeminiLimiter:
+    """Process-wide requests/min and tokens/min limiter with in-flight prompt coalescing"""
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 clock=time.monotonic, sleep=time.sleep):
+        self._requests = TokenBucket(requests_per_minute, clock)
+        self._tokens = TokenBucket(tokens_per_minute, clock)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future shared with coalesced callers
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, tokens):
+        """Block until one request costing `tokens` fits inside both limits"""
+        with self._lock:
+            wait = max(self._requests.reserve(1), self._tokens.reserve(tokens))
+            self.requests += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        if wait > 0:
+            try:
+                self._sleep(wait)
+            finally:
+                with self._lock:
+                    self.queue_depth -= 1
+        return wait
+
+    def _claim(self, key):
+        """(future, True) for the caller that should make the request, (future, False) for the rest"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._in_flight[key] = Future()
+            return future, True
+
+    def _release(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def run(self, key, tokens, call):
+        """Return call() within the limits; concurrent callers with the same key share one call"""
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+        try:
+            self.acquire(tokens)
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key)
+
+    def stream(self, key, tokens, open_stream):
+        """Like run() for a generator: the leader streams, coalesced callers get the whole text once"""
+        future, leader = self._claim(key)
+        if not leader:
+            yield future.result()
+            return
+        pieces = []
+        try:
+            self.acquire(tokens)
+            for piece in open_stream():
+                pieces.append(piece)
+                yield piece
+        except GeneratorExit:
+            future.set_exception(RuntimeError("The AI response was abandoned before it completed"))
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result("".join(pieces))
+        finally:
+            self._release(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "waited": self.waited,
+                "avg_wait": self.total_wait / self.waited if self.waited else 0.0,
+                "max_wait": self.max_wait,
+            }
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+# --- Versioned Dataset Cache ---
+# Holds the scored, sorted veterans frame keyed by the version of the payload
+# it was built from (ETag or content hash, see data_client.StreamedBody), so
+# Streamlit reruns with unchanged data skip rescoring.
+
+
+class VersionedFrameCache:
+    """Thread-safe cache of built DataFrames keyed by dataset version"""
+
+    def __init__(self, max_versions=2):
+        self.max_versions = max_versions
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.current_version = None
+
+    def get_or_build(self, version, builder):
+        """Return the frame cached for version, calling builder() to create it on a miss"""
+        with self._lock:
+            if version in self._frames:
+                self._frames.move_to_end(version)
+                self.hits += 1
+                self.current_version = version
+                return self._frames[version]
+
+        frame = builder()
+
+        with self._lock:
+            self.misses += 1
+            self._frames[version] = frame
+            self._frames.move_to_end(version)
+            while len(self._frames) > self.max_versions:
+                self._frames.popitem(last=False)
+            self.current_version = version
+        return frame
+
+    def __contains__(self, version):
+        with self._lock:
+            return version in self._frames
+
+    def invalidate(self):
+        """Drop every cached frame so the next request rebuilds from source"""
+        with self._lock:
+            self._frames.clear()
+            self.invalidations += 1
+            self.current_version = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "cached_versions": len(self._frames),
+                "current_version": self.current_version,
+            }
+
+
+class BackgroundRefresher:
+    """Serves the latest dataset immediately while refreshing it on a worker thread
+
+    refresh_fn() must return (frame, version, source) and may raise; the last
+    error is kept so the UI can report it while still showing older data.
+    """
+
+    def __init__(self, refresh_fn, min_interval=30):
+        self.refresh_fn = refresh_fn
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self.frame = None
+        self.version = None
+        self.source = None
+        self.refreshed_at = None
+        self.last_attempt = 0.0
+        self.last_error = None
+
+    def seed(self, frame, version, source):
+        """Install an initial frame (e.g. a disk snapshot) without touching the network"""
+        with self._lock:
+            self.frame, self.version, self.source = frame, version, source
+
+    def refresh_now(self):
+        """Run refresh_fn synchronously; returns True on success"""
+        with self._lock:
+            self.last_attempt = time.time()
+        try:
+            frame, version, source = self.refresh_fn()
+        except Exception as e:
+            with self._lock:
+                self.last_error = e
+            return False
+        with self._lock:
+            self.frame, self.version, self.source = frame, version, source
+            self.refreshed_at = time.time()
+            self.last_error = None
+        return True
+
+    def refresh_in_background(self, force=False):
+        """Start a refresh on a daemon thread unless one is running or ran recently"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            if not force and time.time() - self.last_attempt < self.min_interval:
+                return False
+            self.last_attempt = time.time()
+            self._thread = threading.Thread(target=self.refresh_now, name="dataset-refresh", daemon=True)
+            self._thread.start()
+        return True
+
+    def current(self):
+        """Return (frame, version, source) as one consistent snapshot"""
+        with self._lock:
+            return self.frame, self.version, self.source
+
+    @property
+    def refreshing(self):
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
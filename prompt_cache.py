@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# --- Gemini Prompt Cache ---
+# Remembers Gemini responses by a SHA-256 of (model, generation config,
+# prompt), so repeated prompts such as the all-patients summary for an
+# unchanged caseload skip the round trip and the quota. A small in-memory LRU
+# sits in front of an on-disk store that survives restarts. Entries expire
+# after a TTL, and both tiers are bounded by size: the LRU by entry count,
+# the disk store by total bytes (oldest files are evicted first). Expired
+# files are deleted when the store is scanned and on every write, so they do
+# not sit on disk waiting for the byte budget to push them out.
+#
+# Layout:
+#   <root>/<first 2 hex chars>/<key>.json   {"created", "model", "response"}
+
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 32 * 1024 * 1024
+
+
+def prompt_key(model, config, prompt):
+    """Stable cache key for one request"""
+    payload = json.dumps({"model": model, "config": config, "prompt": prompt}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """Two-tier (memory LRU over disk) cache of Gemini responses with a TTL"""
+
+    def __init__(self, root, ttl_seconds=DEFAULT_TTL_SECONDS, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 disk_bytes=DEFAULT_DISK_BYTES):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()  # key -> (created, response)
+        self._disk_sizes = None       # key -> (created, file size), oldest first; scanned on first disk access
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def _fresh(self, created):
+        return time.time() - created < self.ttl_seconds
+
+    def _remember(self, key, created, response):
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _scan_disk(self):
+        if self._disk_sizes is None:
+            self._disk_sizes = {}
+            for path in sorted(self.root.glob("*/*.json"), key=lambda p: p.stat().st_mtime):
+                stat = path.stat()
+                if self._fresh(stat.st_mtime):  # Files are written once, so mtime is their creation time
+                    self._disk_sizes[path.stem] = (stat.st_mtime, stat.st_size)
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self.expired += 1
+        return self._disk_sizes
+
+    def _drop_file(self, key):
+        self._scan_disk().pop(key, None)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def get(self, key):
+        """Cached response for key, or None when missing or expired"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+                self._drop_file(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            try:
+                record = json.loads(self._path(key).read_text())
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            if not self._fresh(record["created"]):
+                self._drop_file(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._remember(key, record["created"], record["response"])
+            self.hits += 1
+            self.disk_hits += 1
+            return record["response"]
+
+    def put(self, key, response, model=None):
+        """Store a response in memory and on disk, deleting expired files and old ones past the byte budget"""
+        created = time.time()
+        body = json.dumps({"created": created, "model": model, "response": response})
+        with self._lock:
+            self._remember(key, created, response)
+            path = self._path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                staging = path.with_suffix(".tmp")
+                staging.write_text(body)
+                os.replace(staging, path)
+            except OSError:
+                return  # A read-only disk still leaves the memory tier working
+            sizes = self._scan_disk()
+            sizes.pop(key, None)
+            sizes[key] = (created, len(body.encode("utf-8")))  # Newest last, so iteration order is eviction order
+            total = sum(size for _, size in sizes.values())
+            for old_key in list(sizes):
+                old_created, size = sizes[old_key]
+                expired = not self._fresh(old_created)
+                if old_key == key or (total <= self.disk_bytes and not expired):
+                    break
+                total -= size
+                self._drop_file(old_key)
+                if expired:
+                    self.expired += 1
+                else:
+                    self.evictions += 1
+
+    def clear(self):
+        """Forget every cached response, in memory and on disk"""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._scan_disk()):
+                self._drop_file(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_sizes) if self._disk_sizes is not None else None,
+            }
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# --- Column-wise VA Risk Scoring ---
+# Mirrors calculate_va_category_and_risk() and calculate_detailed_risk_score()
+# in triage_dashboard_3.py, but evaluates whole columns at once instead of
+# calling a Python function per veteran.
+
+VA_SCORE_COLUMNS = ['VA Category', 'VA Risk Score', 'VA Explanation']
+DETAILED_SCORE_COLUMNS = ['Risk Score', 'Risk Level', 'Risk Explanation']
+SCORE_COLUMNS = VA_SCORE_COLUMNS + DETAILED_SCORE_COLUMNS
+
+VA_EXPLANATIONS = {
+    "Emergent": "EMERGENT - Imminent risk of suicide or harm. Requires immediate crisis response.",
+    "Urgent": "URGENT - Same day mental health evaluation required.",
+    "Routine": "ROUTINE - Timely mental health care needed, but not at imminent risk."
+}
+
+RISK_LEVELS = {
+    6: "Critical - Behavior", 5: "Critical - Ideation", 4: "High - Self-Harm Flag",
+    3: "High - Symptom Severity", 2: "Medium", 1: "Low"
+}
+
+BEHAVIOR_EXPLANATION = "C-SSRS Positive: Recent suicidal behavior reported. REQUIRES IMMEDIATE INTERVENTION."
+IDEATION_EXPLANATION = "C-SSRS Positive: Active suicidal ideation with plan/intent. Requires urgent evaluation."
+SELF_HARM_EXPLANATION = "PHQ-9 Q9 Positive (Self-Harm)."
+SEVERITY_EXPLANATION = "High symptom severity on standard screeners."
+
+RISK_LEVEL_LOOKUP = np.array([None] + [RISK_LEVELS[score] for score in range(1, 7)], dtype=object)
+
+COMPOUNDING_LABELS = ["Low Social Support", "High Substance Use Risk", "Homeless"]
+
+
+def _build_low_acuity_explanations():
+    """Precompute explanations for every moderate/compounding-factor combination"""
+    # Index = moderate * 8 + (low_support | high_substance << 1 | homeless << 2)
+    table = []
+    for moderate in (False, True):
+        for code in range(8):
+            parts = []
+            if moderate:
+                parts.append("Moderate symptom severity")
+            details = [label for bit, label in enumerate(COMPOUNDING_LABELS) if code & (1 << bit)]
+            if details:
+                parts.append(f"Compounding factors: {', '.join(details)}")
+            if not parts:
+                parts.append("Low to minimal symptoms reported")
+            table.append(". ".join(parts) + ".")
+    return np.array(table, dtype=object)
+
+
+LOW_ACUITY_EXPLANATIONS = _build_low_acuity_explanations()
+
+
+def _numeric(df, column):
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+
+
+def _equals(df, column, value):
+    return (df[column] == value).to_numpy(dtype=bool)
+
+
+def _flag(df, column):
+    """Yes/No answers are bool after apply_veteran_schema(); accept legacy strings too"""
+    if df[column].dtype == bool:
+        return df[column].to_numpy()
+    return _equals(df, column, "Yes")
+
+
+def score_veterans(df):
+    """Calculate VA Category and detailed risk columns for every veteran in one pass"""
+    active = _equals(df, "C-SSRS Screen", 'Positive - Active Ideation')
+    passive = _equals(df, "C-SSRS Screen", 'Positive - Passive Ideation')
+    behavior = _equals(df, "C-SSRS Screen", 'Positive - Recent Behavior')
+    self_harm = _flag(df, "PHQ-9 Q9 (Self-Harm)")
+
+    phq9 = _numeric(df, "PHQ-9 Score")
+    gad7 = _numeric(df, "GAD-7 Score")
+    pcl5 = _numeric(df, "PCL-5 Score")
+    high_severity = (phq9 >= 20) | (gad7 >= 15) | (pcl5 >= 55)
+    moderate_severity = ((phq9 >= 15) & (phq9 < 20)) | ((gad7 >= 10) & (gad7 < 15))
+
+    # VA triage category
+    emergent = behavior | (active & self_harm)
+    urgent = ~emergent & (active | passive | self_harm | high_severity)
+    va_category = np.select([emergent, urgent], ["Emergent", "Urgent"], "Routine").astype(object)
+    va_score = np.select([emergent, urgent], [6, 4], 2)
+    va_explanation = np.select(
+        [emergent, urgent],
+        [VA_EXPLANATIONS["Emergent"], VA_EXPLANATIONS["Urgent"]],
+        VA_EXPLANATIONS["Routine"]
+    ).astype(object)
+
+    # Detailed internal prioritization score
+    compounding_code = (
+        _equals(df, "Social Support", "Low").astype(np.int64)
+        | (_equals(df, "Substance Use Risk", "High").astype(np.int64) << 1)
+        | (_equals(df, "Housing Status", "Homeless").astype(np.int64) << 2)
+    )
+    low_acuity_index = moderate_severity.astype(np.int64) * 8 + compounding_code
+    low_acuity_score = np.where(moderate_severity | (compounding_code > 0), 2, 1)
+
+    conditions = [behavior, active, self_harm, high_severity]
+    risk_score = np.select(conditions, [6, 5, 4, 3], low_acuity_score)
+    risk_explanation = np.select(
+        conditions,
+        [BEHAVIOR_EXPLANATION, IDEATION_EXPLANATION, SELF_HARM_EXPLANATION, SEVERITY_EXPLANATION],
+        LOW_ACUITY_EXPLANATIONS[low_acuity_index]
+    ).astype(object)
+    risk_level = RISK_LEVEL_LOOKUP[risk_score]
+
+    return pd.DataFrame({
+        'VA Category': va_category,
+        'VA Risk Score': va_score,
+        'VA Explanation': va_explanation,
+        'Risk Score': risk_score,
+        'Risk Level': risk_level,
+        'Risk Explanation': risk_explanation,
+    }, index=df.index)
+
+
+def calculate_va_category_batch(df):
+    """Column-wise drop-in for df.apply(calculate_va_category_and_risk, axis=1, result_type='expand')"""
+    return score_veterans(df)[VA_SCORE_COLUMNS]
+
+
+def calculate_detailed_risk_batch(df):
+    """Column-wise drop-in for df.apply(calculate_detailed_risk_score, axis=1, result_type='expand')"""
+    return score_veterans(df)[DETAILED_SCORE_COLUMNS]
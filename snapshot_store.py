@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- Columnar Snapshot Store ---
+# Persists the last good scored dataset as one .npy file per column so a cold
+# start can memory-map it instead of waiting on the network. String columns
+# are stored as integer codes plus a JSON category list; mostly-unique string
+# columns (IDs) are stored as UTF-8 byte strings instead.
+#
+# Layout:
+#   <root>/CURRENT                  name of the active snapshot directory
+#   <root>/<snapshot>/manifest.json column order, kinds, version, saved_at
+#   <root>/<snapshot>/NNN.npy       column data (or category codes)
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+
+def _column_payload(series):
+    """Return (kind, array, extra manifest fields) for one column"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return "category", series.cat.codes.to_numpy(), {
+            "categories": series.cat.categories.tolist(),
+            "ordered": bool(series.cat.ordered),
+        }
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufM":
+        return "array", series.to_numpy(), {}
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if len(uniques) > len(series) // 2 and codes.min(initial=0) >= 0 and all(isinstance(v, str) for v in uniques[:100]):
+        # A category list would be as long as the column itself
+        encoded = series.str.encode("utf-8").to_numpy(dtype=object)
+        return "bytes", np.array(encoded, dtype=bytes), {}
+    return "object", codes.astype(np.int32), {"categories": list(uniques)}
+
+
+def _column_from_payload(spec, array):
+    if spec["kind"] == "array":
+        return array
+    if spec["kind"] == "bytes":
+        return np.char.decode(array, "utf-8").astype(object)
+    categories = spec["categories"]
+    if spec["kind"] == "category":
+        return pd.Categorical.from_codes(array, categories=categories, ordered=spec["ordered"])
+    values = np.array(categories + [None], dtype=object)
+    return values[array]  # Code -1 selects the trailing None
+
+
+def write_columns(path, df):
+    """Write each column of df to path as NNN.npy and return the column specs"""
+    columns = []
+    for i, column in enumerate(df.columns):
+        kind, array, extra = _column_payload(df[column])
+        filename = f"{i:03d}.npy"
+        np.save(Path(path) / filename, array, allow_pickle=False)
+        columns.append({"name": column, "kind": kind, "file": filename, **extra})
+    return columns
+
+
+def read_columns(path, columns, mmap=True):
+    """Rebuild a DataFrame from column specs written by write_columns()"""
+    mmap_mode = "r" if mmap else None
+    data = {}
+    for spec in columns:
+        array = np.load(Path(path) / spec["file"], mmap_mode=mmap_mode, allow_pickle=False)
+        data[spec["name"]] = _column_from_payload(spec, array)
+    return pd.DataFrame(data, copy=False)
+
+
+class SnapshotStore:
+    """Reads and writes columnar snapshots of the scored veterans frame"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.saved_version = None  # Last version written by this process
+
+    def _current_dir(self):
+        try:
+            name = (self.root / CURRENT_FILE).read_text().strip()
+        except OSError:
+            return None
+        path = self.root / name
+        return path if (path / MANIFEST_FILE).exists() else None
+
+    def save(self, df, version):
+        """Write df as the new current snapshot and drop older ones"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        saved_at = time.time()
+        name = f"snapshot-{int(saved_at * 1000)}-{os.getpid()}"
+        staging = self.root / f".{name}.tmp"
+        staging.mkdir()
+
+        columns = write_columns(staging, df)
+        manifest = {"version": version, "saved_at": saved_at, "rows": len(df), "columns": columns}
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, default=str))
+        staging.rename(self.root / name)
+
+        # Point CURRENT at the new snapshot atomically, then prune the rest
+        pointer = self.root / f".{CURRENT_FILE}.tmp"
+        pointer.write_text(name)
+        os.replace(pointer, self.root / CURRENT_FILE)
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name.startswith("snapshot-") and path.name != name:
+                shutil.rmtree(path, ignore_errors=True)
+        self.saved_version = version
+        return manifest
+
+    @staticmethod
+    def _read_manifest(path):
+        try:
+            return json.loads((path / MANIFEST_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def manifest(self):
+        """Return the manifest of the current snapshot, or None if there is none"""
+        path = self._current_dir()
+        return None if path is None else self._read_manifest(path)
+
+    def load(self, mmap=True):
+        """Return (df, manifest) for the current snapshot, or (None, None) if unavailable"""
+        path = self._current_dir()
+        manifest = None if path is None else self._read_manifest(path)
+        if manifest is None:
+            return None, None
+        return read_columns(path, manifest["columns"], mmap), manifest
+
+    def age_seconds(self):
+        manifest = self.manifest()
+        return None if manifest is None else max(0.0, time.time() - manifest["saved_at"])
+
+
+def format_age(seconds):
+    """Format an age in seconds as a short human-readable string"""
+    if seconds is None:
+        return "none"
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
@@ -0,0 +1,152 @@
+import codecs
+import json
+
+import pandas as pd
+
+from veteran_schema import concat_frames
+
+# --- Streaming JSON Ingestion ---
+# Parses the veterans payload incrementally from the HTTP body so the raw
+# bytes, the full list of dicts and the DataFrame never coexist in memory.
+# Records from the `data` array are yielded one at a time and assembled into
+# typed DataFrame chunks of a fixed number of rows.
+
+DEFAULT_CHUNK_ROWS = 10000
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _StreamCursor:
+    """Text buffer over an iterable of byte chunks with on-demand refills"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk to the buffer; return False once the body is exhausted"""
+        if self.eof:
+            return False
+        # Drop the consumed prefix so the buffer only holds the unparsed tail
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON payload")
+
+    def finish(self):
+        """Consume the rest of the body, which may only contain whitespace"""
+        while True:
+            if self.buf[self.pos:].strip(_WHITESPACE):
+                raise ValueError(f"Unexpected trailing data at offset {self.pos} of JSON payload")
+            self.pos = len(self.buf)
+            if not self.fill():
+                return
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of JSON payload")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value, refilling until it is fully buffered"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(cursor):
+    cursor.expect("[")
+    if cursor.peek() == "]":
+        cursor.pos += 1
+        return
+    while True:
+        yield cursor.value()
+        if cursor.peek() == ",":
+            cursor.pos += 1
+            continue
+        cursor.expect("]")
+        return
+
+
+def iter_payload_records(chunks, meta=None, array_key="data"):
+    """Yield records from a `{"data": [...]}` or bare `[...]` JSON body given as byte chunks
+
+    Any other top-level keys of an object payload are decoded into `meta`.
+    """
+    meta = {} if meta is None else meta
+    cursor = _StreamCursor(chunks)
+    if cursor.peek() == "[":
+        yield from _iter_array(cursor)
+        cursor.finish()
+        return
+
+    cursor.expect("{")
+    if cursor.peek() == "}":
+        cursor.pos += 1
+        cursor.finish()
+        return
+    while True:
+        key = cursor.value()
+        cursor.expect(":")
+        if key == array_key and cursor.peek() == "[":
+            yield from _iter_array(cursor)
+        else:
+            meta[key] = cursor.value()
+        if cursor.peek() == ",":
+            cursor.pos += 1
+            continue
+        cursor.expect("}")
+        cursor.finish()
+        return
+
+
+def iter_record_batches(records, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Group an iterable of records into lists of at most chunk_rows records"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= chunk_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_records_frame(records, prepare_chunk=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Build a DataFrame from streamed records in typed, fixed-size chunks"""
+    frames = []
+    for batch in iter_record_batches(records, chunk_rows):
+        frame = pd.DataFrame.from_records(batch)
+        del batch  # Only one chunk of raw dicts is alive at a time
+        frames.append(prepare_chunk(frame) if prepare_chunk else frame)
+    return concat_frames(frames)
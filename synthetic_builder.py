@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from snapshot_store import read_columns, write_columns
+from synthetic_data import DEFAULT_CHUNK_ROWS, DEFAULT_SEED, FIRST_VETERAN_NUMBER, generate_synthetic_chunk, veteran_id_width
+from veteran_schema import concat_frames
+
+# --- Sharded Synthetic Dataset Builder ---
+# Fans synthetic generation out over a process pool for 10M+ row caseloads.
+# Shard k owns a contiguous block of row numbers, so Veteran IDs never
+# collide, and is seeded from (seed, k) only. Each shard writes its chunks as
+# columnar partitions in the snapshot store's .npy format. Given the same
+# seed, shard count and as_of date, the output is byte-identical no matter
+# how many workers ran it.
+#
+# Layout:
+#   <root>/dataset.json               rows, seeds, ID range, partition list
+#   <root>/part-SSSS-CCCCC/           one partition per shard chunk
+#   <root>/part-SSSS-CCCCC/columns.json
+#   <root>/part-SSSS-CCCCC/NNN.npy
+
+DATASET_FILE = "dataset.json"
+PARTITION_FILE = "columns.json"
+DEFAULT_AS_OF = "2025-01-01"  # Fixed so rebuilds match byte for byte; pass as_of for other dates
+
+
+def _dump_json(path, payload):
+    Path(path).write_text(json.dumps(payload, sort_keys=True, indent=1, default=str))
+
+
+def shard_bounds(num_records, shards):
+    """Split num_records into `shards` contiguous (start, rows) blocks"""
+    base, extra = divmod(num_records, shards)
+    bounds, start = [], 0
+    for shard in range(shards):
+        rows = base + (1 if shard < extra else 0)
+        bounds.append((start, rows))
+        start += rows
+    return bounds
+
+
+def _build_shard(root, shard, start, rows, seed, chunk_rows, as_of, id_width):
+    """Generate one shard and write its chunks as partitions; runs in a worker process"""
+    partitions = []
+    for chunk_index, offset in enumerate(range(0, rows, chunk_rows)):
+        chunk = generate_synthetic_chunk(start + offset, min(chunk_rows, rows - offset), (seed, shard),
+                                         chunk_index, as_of, id_width)
+        name = f"part-{shard:04d}-{chunk_index:05d}"
+        path = Path(root) / name
+        path.mkdir()
+        columns = write_columns(path, chunk)
+        _dump_json(path / PARTITION_FILE, {"rows": len(chunk), "start": start + offset, "columns": columns})
+        partitions.append({"name": name, "shard": shard, "start": start + offset, "rows": len(chunk)})
+    return partitions
+
+
+def build_synthetic_dataset(root, num_records, shards=None, seed=DEFAULT_SEED, chunk_rows=DEFAULT_CHUNK_ROWS,
+                            as_of=DEFAULT_AS_OF, workers=None):
+    """Generate num_records veterans over a process pool into a partitioned dataset at root"""
+    root = Path(root)
+    shards = shards or os.cpu_count() or 1
+    workers = min(workers or os.cpu_count() or 1, shards)
+    id_width = veteran_id_width(num_records)
+
+    # Build beside the target and swap it in once every shard has finished
+    staging = root.with_name(f".{root.name}.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        bounds = shard_bounds(num_records, shards)
+        jobs = [(str(staging), shard, start, rows, seed, chunk_rows, as_of, id_width)
+                for shard, (start, rows) in enumerate(bounds) if rows]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_build_shard, *zip(*jobs)))
+        else:
+            results = [_build_shard(*job) for job in jobs]
+
+        manifest = {
+            "rows": num_records,
+            "seed": seed,
+            "shards": shards,
+            "chunk_rows": chunk_rows,
+            "as_of": as_of,
+            "first_id": f"VET-{FIRST_VETERAN_NUMBER:0{id_width}d}",
+            "last_id": f"VET-{FIRST_VETERAN_NUMBER + max(num_records, 1) - 1:0{id_width}d}",
+            "partitions": [partition for partitions in results for partition in partitions],
+        }
+        _dump_json(staging / DATASET_FILE, manifest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if root.exists():
+        shutil.rmtree(root)
+    staging.rename(root)
+    return manifest
+
+
+def iter_synthetic_partitions(root, mmap=True):
+    """Yield the partitions of a built dataset as DataFrames, in Veteran ID order"""
+    root = Path(root)
+    manifest = json.loads((root / DATASET_FILE).read_text())
+    for partition in manifest["partitions"]:
+        path = root / partition["name"]
+        spec = json.loads((path / PARTITION_FILE).read_text())
+        yield read_columns(path, spec["columns"], mmap)
+
+
+def load_synthetic_dataset(root, mmap=True):
+    """Load a built dataset as one DataFrame"""
+    return concat_frames(iter_synthetic_partitions(root, mmap))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a sharded synthetic veterans dataset for capacity planning")
+    parser.add_argument("root")
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--shards", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--as-of", default=DEFAULT_AS_OF)
+    args = parser.parse_args()
+    result = build_synthetic_dataset(args.root, args.rows, args.shards, args.seed, args.chunk_rows, args.as_of,
+                                     args.workers)
+    print(f"{result['rows']} veterans ({result['first_id']} .. {result['last_id']}) "
+          f"in {len(result['partitions'])} partitions at {args.root}")
@@ -0,0 +1,209 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from veteran_schema import concat_frames
+
+# --- Vectorized Synthetic Veterans ---
+# Column-at-a-time NumPy generator for realistic synthetic veteran records.
+# Keeps the distributions of the original per-record generator (VA gender
+# mix, age-banded service eras, C-SSRS-correlated scores, median-50 ages,
+# gender-matched names) but yields fixed-size chunks, each seeded from
+# (seed, chunk index), so any chunk can be regenerated on its own and large
+# datasets can stream straight to disk.
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 100000
+FIRST_VETERAN_NUMBER = 1000
+
+MALE_FIRST_NAMES = ['James', 'Michael', 'Robert', 'John', 'William', 'David', 'Richard', 'Joseph', 'Thomas', 'Christopher',
+                    'Daniel', 'Matthew', 'Anthony', 'Mark', 'Donald', 'Steven', 'Paul', 'Andrew', 'Joshua', 'Kenneth',
+                    'Kevin', 'Brian', 'George', 'Timothy', 'Ronald', 'Jason', 'Edward', 'Jeffrey', 'Ryan', 'Jacob',
+                    'Nicholas', 'Eric', 'Jonathan', 'Stephen', 'Larry', 'Justin', 'Scott', 'Brandon', 'Benjamin', 'Samuel']
+
+FEMALE_FIRST_NAMES = ['Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 'Jessica', 'Sarah', 'Karen',
+                      'Lisa', 'Nancy', 'Betty', 'Helen', 'Sandra', 'Donna', 'Carol', 'Ruth', 'Sharon', 'Michelle',
+                      'Laura', 'Kimberly', 'Deborah', 'Dorothy', 'Amy', 'Angela', 'Ashley', 'Brenda', 'Emma', 'Olivia',
+                      'Cynthia', 'Marie', 'Janet', 'Catherine', 'Frances', 'Christine', 'Samantha', 'Debra', 'Rachel',
+                      'Carolyn']
+
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+              'Anderson', 'Taylor', 'Thomas', 'Hernandez', 'Moore', 'Martin', 'Jackson', 'Thompson', 'White', 'Lopez',
+              'Lee', 'Gonzalez', 'Harris', 'Clark', 'Lewis', 'Robinson', 'Walker', 'Perez', 'Hall', 'Young',
+              'Allen', 'Sanchez', 'Wright', 'King', 'Scott', 'Green', 'Baker', 'Adams', 'Nelson', 'Hill']
+
+# Every "First Last" combination; a name is picked by index so no strings are built per row
+_MALE_NAMES = np.array([f"{first} {last}" for first in MALE_FIRST_NAMES for last in LAST_NAMES], dtype=object)
+_FEMALE_NAMES = np.array([f"{first} {last}" for first in FEMALE_FIRST_NAMES for last in LAST_NAMES], dtype=object)
+
+C_SSRS_OPTIONS = ['Negative', 'Positive - Passive Ideation', 'Positive - Active Ideation', 'Positive - Recent Behavior']
+C_SSRS_WEIGHTS = [0.78, 0.14, 0.06, 0.02]
+
+# Inclusive (low, high) score ranges per C-SSRS status, in C_SSRS_OPTIONS order
+PHQ9_RANGES = np.array([(0, 16), (8, 20), (14, 24), (18, 27)])
+GAD7_RANGES = np.array([(0, 12), (6, 16), (11, 20), (14, 21)])
+PCL5_RANGES = np.array([(0, 45), (25, 55), (45, 70), (55, 80)])
+
+SERVICE_ERAS = ["Vietnam", "Gulf War", "OEF/OIF", "Recent"]
+
+# Column -> (options, weights); weights of None mean a uniform choice
+CATEGORICAL_FIELDS = {
+    "Branch": (["Army", "Navy", "Air Force", "Marines", "Coast Guard"], [0.36, 0.26, 0.24, 0.13, 0.01]),
+    "Social Support": (["Low", "Medium", "High"], [0.3, 0.5, 0.2]),
+    "Substance Use Risk": (["Low", "Medium", "High"], [0.5, 0.35, 0.15]),
+    "Housing Status": (["Stable", "At Risk", "Homeless"], [0.75, 0.18, 0.07]),
+    "Treatment Preference": (["Therapy", "Medication", "Both"], [0.35, 0.25, 0.4]),
+    "Assigned Clinician": (["Dr. Smith", "Dr. Johnson", "Dr. Williams", "Dr. Brown", "Dr. Davis", "Unassigned"], None),
+    # Blank notes were listed twice in the original choice list
+    "Priority Notes": (["", "Family concerns", "Recent hospitalization", "Employment issues", "Financial stress",
+                        "Medication compliance", "Transportation barriers"], [2, 1, 1, 1, 1, 1, 1]),
+    "Contact Method": (["Phone", "Email", "Video Call", "In-Person"], None),
+    "Emergency Contact": (["Available", "Limited", "None"], [0.7, 0.2, 0.1]),
+    "Transportation": (["Own Vehicle", "Public Transit", "VA Transport", "Family/Friends", "None"],
+                       [0.6, 0.15, 0.1, 0.1, 0.05]),
+}
+
+COLUMN_ORDER = [
+    "Veteran ID", "Name", "Intake Date", "Age", "Gender", "Branch", "Service Era", "C-SSRS Screen",
+    "PHQ-9 Q9 (Self-Harm)", "PHQ-9 Score", "GAD-7 Score", "PCL-5 Score", "Social Support", "Substance Use Risk",
+    "Housing Status", "Previous Mental Health Treatment", "Treatment Preference", "Last Contact",
+    "Assigned Clinician", "Priority Notes", "Contact Method", "Emergency Contact", "Transportation",
+]
+
+
+def veteran_id_width(num_records):
+    """Digits needed so every ID of a num_records dataset has the same width (at least 4)"""
+    return max(4, len(str(FIRST_VETERAN_NUMBER + max(num_records, 1) - 1)))
+
+
+def format_veteran_ids(start, num_rows, width=4):
+    """IDs VET-{1000 + start} onwards, zero-padded to width so they sort like their numbers"""
+    numbers = np.arange(FIRST_VETERAN_NUMBER + start, FIRST_VETERAN_NUMBER + start + num_rows)
+    return np.char.zfill(numbers.astype(str), width).astype(object) if num_rows else np.array([], dtype=object)
+
+
+def _choice_codes(rng, n, options, weights=None):
+    if weights is None:
+        return rng.integers(0, len(options), size=n).astype(np.int8)
+    p = np.asarray(weights, dtype=float)
+    return rng.choice(len(options), size=n, p=p / p.sum()).astype(np.int8)
+
+
+def _categorical(codes, options):
+    return pd.Categorical.from_codes(codes, categories=options)
+
+
+def _ages(rng, n):
+    """Normal(50, 12) ages clamped to 22-80 and shifted so the median is 50"""
+    ages = np.clip(np.trunc(rng.normal(50, 12, size=n)), 22, 80)
+    ages.sort()
+    mid_point = n // 2
+    if n and n % 2 == 0:
+        adjustment = 50 - (ages[mid_point - 1] + ages[mid_point]) / 2
+        ages = np.clip(np.trunc(ages + adjustment), 22, 80)
+    elif n:
+        ages[mid_point] = 50
+    rng.shuffle(ages)
+    return ages.astype(np.int8)
+
+
+def _service_eras(rng, ages):
+    roll = rng.random(len(ages))
+    codes = np.select(
+        [ages >= 70, ages >= 55, ages >= 40, ages >= 30],
+        [0, np.where(roll < 0.3, 0, 1), np.where(roll < 0.4, 1, 2), 2],
+        default=np.where(roll < 0.7, 2, 3),
+    )
+    return _categorical(codes.astype(np.int8), SERVICE_ERAS)
+
+
+def _scores(rng, status, ranges):
+    low, high = ranges[status, 0], ranges[status, 1]
+    return rng.integers(low, high + 1)
+
+
+def generate_synthetic_chunk(start, num_rows, seed=DEFAULT_SEED, chunk_index=0, as_of=None, id_width=4):
+    """Generate num_rows synthetic veterans whose IDs start at VET-{1000 + start}
+
+    The chunk depends only on (seed, chunk_index, as_of), never on the chunks
+    before it. seed may also be a tuple, e.g. (seed, shard) for sharded builds.
+    """
+    rng = np.random.default_rng([*np.atleast_1d(seed).tolist(), chunk_index])
+    today = pd.Timestamp.now().normalize() if as_of is None else pd.Timestamp(as_of).normalize()
+    n = num_rows
+
+    # Generate gender first (85% male, 15% female based on VA demographics), then a matching name
+    male = rng.random(n) < 0.85
+    names = np.where(
+        male,
+        _MALE_NAMES[rng.integers(0, len(_MALE_NAMES), size=n)],
+        _FEMALE_NAMES[rng.integers(0, len(_FEMALE_NAMES), size=n)],
+    )
+
+    ages = _ages(rng, n)
+
+    # Clinical scores correlated with C-SSRS status
+    status = _choice_codes(rng, n, C_SSRS_OPTIONS, C_SSRS_WEIGHTS)
+    phq9 = _scores(rng, status, PHQ9_RANGES)
+    gad7 = _scores(rng, status, GAD7_RANGES)
+    pcl5 = _scores(rng, status, PCL5_RANGES)
+    roll = rng.random(n)
+    self_harm = np.select(
+        [status >= 2, status == 1],
+        [True, roll < 0.4],
+        default=(phq9 > 12) & (roll < 0.1),
+    )
+
+    # Date-only intake (last 30 days) and last contact (last 7 days)
+    intake = today - pd.to_timedelta(rng.integers(0, 31, size=n), unit="D")
+    last_contact = today - pd.to_timedelta(rng.integers(0, 8, size=n), unit="D")
+
+    data = {
+        "Veteran ID": "VET-" + format_veteran_ids(start, n, id_width),
+        "Name": names,
+        "Intake Date": intake,
+        "Age": ages,
+        "Gender": _categorical(np.where(male, 0, 1).astype(np.int8), ["Male", "Female"]),
+        "Service Era": _service_eras(rng, ages),
+        "C-SSRS Screen": _categorical(status, C_SSRS_OPTIONS),
+        "PHQ-9 Q9 (Self-Harm)": self_harm.astype(bool),
+        "PHQ-9 Score": phq9.astype(np.int8),
+        "GAD-7 Score": gad7.astype(np.int8),
+        "PCL-5 Score": pcl5.astype(np.int16),
+        "Previous Mental Health Treatment": rng.random(n) < 0.65,
+        "Last Contact": last_contact,
+    }
+    for column, (options, weights) in CATEGORICAL_FIELDS.items():
+        data[column] = _categorical(_choice_codes(rng, n, options, weights), options)
+
+    return pd.DataFrame(data, index=pd.RangeIndex(start, start + n))[COLUMN_ORDER]
+
+
+def iter_synthetic_chunks(num_records, chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED, as_of=None):
+    """Yield DataFrames of at most chunk_rows synthetic veterans, num_records in total"""
+    id_width = veteran_id_width(num_records)
+    for chunk_index, start in enumerate(range(0, num_records, chunk_rows)):
+        yield generate_synthetic_chunk(start, min(chunk_rows, num_records - start), seed, chunk_index, as_of, id_width)
+
+
+def generate_synthetic_frame(num_records, chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED, as_of=None):
+    """Generate num_records synthetic veterans as a single DataFrame"""
+    return concat_frames(iter_synthetic_chunks(num_records, chunk_rows, seed, as_of))
+
+
+def write_synthetic_csv(path, num_records, chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED, as_of=None):
+    """Stream num_records synthetic veterans to a CSV file one chunk at a time"""
+    for chunk_index, chunk in enumerate(iter_synthetic_chunks(num_records, chunk_rows, seed, as_of)):
+        chunk.to_csv(path, mode="w" if chunk_index == 0 else "a", header=chunk_index == 0, index=False,
+                     date_format="%Y-%m-%d")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic veteran records for load testing")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    write_synthetic_csv(args.path, args.rows, args.chunk_rows, args.seed)
@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# --- Server-Side Table Paging ---
+# The Triage Queue can hold the whole caseload. Instead of handing the full
+# frame (and a Styler over every cell) to st.dataframe, the table works on
+# row positions: sorting produces a position array over the frame without
+# copying any rows, and only the visible page is materialized and sent to
+# the browser.
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 50
+TRIAGE_ORDER = "Triage Priority"  # Sort option that keeps the frame's own (triage) order
+
+
+def sort_positions(df, column=TRIAGE_ORDER, descending=False):
+    """Row positions of df ordered by one column; ties and missing values keep triage order
+
+    Missing values always sort last. The frame itself is never reordered.
+    """
+    if column == TRIAGE_ORDER or column not in df.columns:
+        positions = np.arange(len(df))
+        return positions[::-1].copy() if descending else positions
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Rank the categories once, then sort small integer codes instead of strings
+        ranks = np.argsort(np.argsort(series.cat.categories.astype(str), kind="stable"))
+        codes = series.cat.codes.to_numpy()
+        values = ranks[codes].astype(np.float64)
+        values[codes < 0] = np.nan
+        series = pd.Series(values)
+    else:
+        series = series.reset_index(drop=True)
+    return series.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+
+
+def page_bounds(total, page, page_size):
+    """(start, stop, page, pages) for a 1-based page number, clamped into range"""
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), page, pages
+
+
+def page_frame(df, positions, page, page_size, columns=None):
+    """The visible page of df in `positions` order; only those rows are copied"""
+    start, stop, _, _ = page_bounds(len(positions), page, page_size)
+    page_df = df.iloc[positions[start:stop]]
+    return page_df[columns] if columns is not None else page_df
@@ -0,0 +1,130 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from veteran_schema import format_date
+
+# --- Veterans Table Styling ---
+# Row colours follow the VA Category. Instead of calling a Python function
+# per row through Styler.apply(axis=1), the category codes index a
+# precomputed CSS array once for the whole table. Large pages skip the
+# Styler altogether: the category is shown as a badge and formatting comes
+# from st.dataframe's column_config (see the dashboard), so only Arrow data
+# is sent to the browser.
+
+CATEGORY_ROW_STYLES = {
+    'Emergent': 'background-color: rgba(220, 38, 38, 0.1); color: #7f1d1d',
+    'Urgent': 'background-color: rgba(245, 158, 11, 0.1); color: #78350f',
+    'Routine': 'background-color: rgba(119, 221, 119, 0.1); color: #166534',
+}
+
+CATEGORY_BADGES = {'Emergent': '🔴 Emergent', 'Urgent': '🟠 Urgent', 'Routine': '🟢 Routine'}
+
+# Pages above this many cells render through column_config instead of a Styler
+STYLER_MAX_CELLS = 1000
+
+
+def row_styles(df, column='VA Category'):
+    """One CSS string per row, looked up from the category codes in a single step"""
+    categories = df[column]
+    if not isinstance(categories.dtype, pd.CategoricalDtype):
+        categories = categories.astype('category')
+    # Code -1 (missing) picks the trailing empty style
+    styles = np.array([CATEGORY_ROW_STYLES.get(value, '') for value in categories.cat.categories] + [''], dtype=object)
+    return styles[categories.cat.codes.to_numpy()]
+
+
+def style_table(df):
+    """Styler colouring each row by VA Category, with readable dates"""
+    styles = row_styles(df)
+    css = pd.DataFrame(np.broadcast_to(styles[:, None], df.shape), index=df.index, columns=df.columns)
+    date_columns = [column for column in df.columns if pd.api.types.is_datetime64_any_dtype(df[column])]
+    return df.style.apply(lambda _: css, axis=None).format({column: format_date for column in date_columns})
+
+
+def badge_table(df, column='VA Category'):
+    """Copy of df with the category shown as a coloured badge, for Styler-free rendering"""
+    df = df.copy()
+    categories = df[column]
+    if not isinstance(categories.dtype, pd.CategoricalDtype):
+        categories = categories.astype('category')
+    df[column] = categories.cat.rename_categories(
+        [CATEGORY_BADGES.get(value, value) for value in categories.cat.categories]
+    )
+    return df
+
+
+def use_styler(df):
+    """Whether a page is small enough for the Styler path"""
+    return df.size <= STYLER_MAX_CELLS
+
+
+def _legacy_style_table(df):
+    """The previous per-row Styler.apply, kept for benchmark comparison"""
+    def highlight_row(row):
+        return [CATEGORY_ROW_STYLES.get(row['VA Category'], '')] * len(row)
+    date_columns = [column for column in df.columns if pd.api.types.is_datetime64_any_dtype(df[column])]
+    return df.style.apply(highlight_row, axis=1).format({column: format_date for column in date_columns})
+
+
+def _arrow_size(df):
+    """Bytes of df as an Arrow IPC stream, the format st.dataframe ships"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def _render_payload(data):
+    """Bytes of the message st.dataframe would send for data"""
+    try:
+        # Private Streamlit helpers: exact, but free to move between releases
+        from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+        from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+        from streamlit.proto.ArrowData_pb2 import ArrowData
+    except ImportError:
+        # Public approximation: the Arrow data, plus the Styler's HTML for its CSS and display values
+        if isinstance(data, pd.DataFrame):
+            return _arrow_size(data)
+        return _arrow_size(data.data) + len(data.to_html().encode())
+
+    proto = ArrowData()
+    if isinstance(data, pd.DataFrame):
+        proto.data = convert_pandas_df_to_arrow_bytes(data)
+    else:
+        marshall_styler(proto, data, "bench")
+        proto.data = convert_pandas_df_to_arrow_bytes(data.data)
+    return proto.ByteSize()
+
+
+def benchmark(sizes=(50, 500, 5000), repeats=3):
+    """Compare render time and payload of the legacy Styler, the vectorized Styler and badges"""
+    from risk_engine import SCORE_COLUMNS, score_veterans
+    from synthetic_data import generate_synthetic_frame
+    from veteran_schema import apply_veteran_schema
+
+    rows = []
+    for size in sizes:
+        df = generate_synthetic_frame(size)
+        df[SCORE_COLUMNS] = score_veterans(df)
+        df = apply_veteran_schema(df)
+        pd.set_option("styler.render.max_elements", max(df.size, 262144))
+        for name, render in (("per-row Styler", _legacy_style_table), ("vectorized Styler", style_table),
+                             ("column_config", badge_table)):
+            best, payload = float("inf"), 0
+            for _ in range(repeats):
+                started = time.perf_counter()
+                data = render(df)
+                payload = _render_payload(data)
+                best = min(best, time.perf_counter() - started)
+            rows.append({"Rows": size, "Mode": name, "Server (ms)": round(best * 1000, 1),
+                         "Payload (KB)": round(payload / 1024, 1)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
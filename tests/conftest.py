@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The dashboard modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeGemini:
+    """Local Gemini stand-in that plays back scripted (status, headers, body, delay) replies
+
+    A body of None echoes the prompt as "echo:<prompt>", as JSON for
+    generateContent and as server-sent events for streamGenerateContent.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.default = (200, {}, None, 0)
+        self.log = []  # (path, client port, request body)
+        self.stream_pieces = 4
+        self.stream_content_type = "text/event-stream"
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.log.append((self.path, self.client_address[1], body))
+                status, headers, reply, delay = fake.script.pop(0) if fake.script else fake.default
+                time.sleep(delay)
+                if reply is None:
+                    text = "echo:" + body["contents"][0]["parts"][0]["text"]
+                    if "streamGenerateContent" in self.path:
+                        return fake._stream(self, text)
+                    reply = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+                data = json.dumps(reply).encode()
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out first
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1beta"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def _stream(self, handler, text):
+        handler.send_response(200)
+        handler.send_header("Content-Type", self.stream_content_type)
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        step = max(1, len(text) // self.stream_pieces)
+        for start in range(0, len(text), step):
+            event = {"candidates": [{"content": {"parts": [{"text": text[start:start + step]}]}}]}
+            raw = ("data: " + json.dumps(event, ensure_ascii=False) + "\r\n\r\n").encode("utf-8")
+            handler.wfile.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+        handler.wfile.write(b"0\r\n\r\n")
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_gemini():
+    fake = FakeGemini()
+    yield fake
+    fake.close()
+
+
+class FakeFeed:
+    """Local veterans feed that serves `payload` with an ETag and answers matching revalidations with 304
+
+    `script` holds (status, headers, body) replies that take precedence.
+    """
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.etag = '"v1"'
+        self.last_modified = "Sun, 18 Oct 2026 08:00:00 GMT"
+        self.script = []
+        self.log = []  # (path, client port, request headers)
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fake.log.append((self.path, self.client_address[1], dict(self.headers)))
+                if fake.script:
+                    status, headers, data = fake.script.pop(0)
+                elif self.headers.get("If-None-Match") == fake.etag:
+                    status, headers, data = 304, {"ETag": fake.etag}, b""
+                else:
+                    headers = {"ETag": fake.etag, "Last-Modified": fake.last_modified}
+                    status, data = 200, json.dumps(fake.payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/veterans/dashboard"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_feed():
+    feed = FakeFeed({"data": [{"Veteran ID": "VET-1000", "Name": "Test Veteran"}]})
+    yield feed
+    feed.close()
@@ -0,0 +1,71 @@
+import pytest
+import requests
+
+from data_client import VeteransClient
+from pipeline_cache import VersionedFrameCache
+from streaming_ingest import iter_payload_records
+
+
+def read_records(result):
+    return list(iter_payload_records(result.body))
+
+
+def test_unchanged_feed_is_a_304_that_reuses_the_cached_frame(fake_feed):
+    client = VeteransClient(fake_feed.url)
+    cache = VersionedFrameCache()
+    builds = []
+
+    def build(records):
+        builds.append(records)
+        return records
+
+    result = client.stream(revalidate=False)
+    assert not result.not_modified
+    records = read_records(result)  # Reading the body to the end records its version
+    first = cache.get_or_build(client.last_version, lambda: build(records))
+    assert client.last_version == 'etag:"v1"'
+
+    result = client.stream(revalidate=True)
+    assert result.not_modified and result.body is None
+    assert cache.get_or_build(client.last_version, lambda: build(None)) is first
+    assert len(builds) == 1
+    assert client.stats() == {"requests": 2, "not_modified": 1}
+
+
+def test_revalidation_sends_validators(fake_feed):
+    client = VeteransClient(fake_feed.url)
+    read_records(client.stream(revalidate=True))  # Nothing to revalidate yet
+    assert "If-None-Match" not in fake_feed.log[0][2]
+
+    client.stream(revalidate=True)
+    headers = fake_feed.log[1][2]
+    assert headers["If-None-Match"] == fake_feed.etag
+    assert headers["If-Modified-Since"] == fake_feed.last_modified
+
+    read_records(client.stream(revalidate=False))
+    assert "If-None-Match" not in fake_feed.log[2][2]
+
+
+def test_connection_is_reused_across_requests(fake_feed):
+    client = VeteransClient(fake_feed.url)
+    for _ in range(3):
+        read_records(client.stream(revalidate=False))
+    client.stream(revalidate=True)
+    assert len({port for _, port, _ in fake_feed.log}) == 1
+
+
+def test_failed_response_is_closed(fake_feed):
+    client = VeteransClient(fake_feed.url)
+    responses = []
+    get = client.session.get
+
+    def tracking_get(*args, **kwargs):
+        responses.append(get(*args, **kwargs))
+        return responses[-1]
+
+    client.session.get = tracking_get
+    fake_feed.script = [(500, {}, b'{"error": "down"}')]
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.stream(revalidate=False)
+    assert responses[0].raw.closed
+    assert client.last_version is None
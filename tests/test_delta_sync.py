@@ -0,0 +1,141 @@
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from data_client import StreamResult
+from delta_sync import DeltaSyncer
+from triage_queue import TriageQueue, triage_order
+
+
+class FakeBody:
+    def __init__(self, payload, version):
+        self._chunks = [json.dumps(payload).encode()]
+        self.version = version
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+
+class FakeClient:
+    """Serves the current records as a full snapshot on every stream()"""
+
+    def __init__(self, records):
+        self.records = records
+        self.last_version = None
+        self.served = 0
+
+    def stream(self, params=None, revalidate=True):
+        self.served += 1
+        self.last_version = f"v{self.served}"
+        return StreamResult(FakeBody({"data": self.records}, self.last_version), False, None)
+
+
+def prepare_rows(records):
+    return pd.DataFrame(records)
+
+
+def order_rows(df):
+    return df.sort_values("Veteran ID").reset_index(drop=True)
+
+
+def test_failed_rescore_is_merged_on_the_next_refresh():
+    client = FakeClient([{"Veteran ID": "VET-1", "C-SSRS Screen": "Negative"},
+                         {"Veteran ID": "VET-2", "C-SSRS Screen": "Negative"}])
+    failing = {"on": False}
+
+    def flaky_prepare(records):
+        if failing["on"]:
+            raise RuntimeError("rescore failed")
+        return prepare_rows(records)
+
+    syncer = DeltaSyncer(client, flaky_prepare, order_rows)
+    syncer.refresh()
+
+    client.records = [{"Veteran ID": "VET-1", "C-SSRS Screen": "Positive - Recent Behavior"},
+                      {"Veteran ID": "VET-2", "C-SSRS Screen": "Negative"}]
+    failing["on"] = True
+    with pytest.raises(RuntimeError):
+        syncer.refresh()
+    assert syncer.frame["C-SSRS Screen"].tolist() == ["Negative", "Negative"]
+
+    failing["on"] = False
+    frame, _ = syncer.refresh()
+    assert syncer.stats()["changed"] == 1
+    assert frame["C-SSRS Screen"].tolist() == ["Positive - Recent Behavior", "Negative"]
+
+
+def test_removed_veteran_survives_a_failed_reorder():
+    client = FakeClient([{"Veteran ID": "VET-1"}, {"Veteran ID": "VET-2"}])
+    failing = {"on": False}
+
+    def flaky_order(df):
+        if failing["on"]:
+            raise RuntimeError("reorder failed")
+        return order_rows(df)
+
+    syncer = DeltaSyncer(client, prepare_rows, flaky_order)
+    syncer.refresh()
+
+    client.records = [{"Veteran ID": "VET-1"}]
+    failing["on"] = True
+    with pytest.raises(RuntimeError):
+        syncer.refresh()
+
+    failing["on"] = False
+    frame, _ = syncer.refresh()
+    assert syncer.stats()["removed"] == 1
+    assert frame["Veteran ID"].tolist() == ["VET-1"]
+
+
+def test_reset_waits_for_a_refresh_in_progress():
+    client = FakeClient([{"Veteran ID": "VET-1"}])
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_prepare(records):
+        entered.set()
+        release.wait(5)
+        return prepare_rows(records)
+
+    syncer = DeltaSyncer(client, slow_prepare, order_rows)
+    refresh = threading.Thread(target=syncer.refresh)
+    refresh.start()
+    entered.wait(5)
+    reset = threading.Thread(target=syncer.reset)
+    reset.start()
+    reset.join(timeout=0.2)
+    assert reset.is_alive()  # Blocked behind the refresh
+    release.set()
+    refresh.join(timeout=5)
+    reset.join(timeout=5)
+    assert syncer.frame is None and syncer.stats()["mode"] is None
+
+
+def test_queue_follows_merges():
+    def scored(records):
+        return pd.DataFrame(records)
+
+    def triage_rows(df):
+        return df.take(triage_order(df)).reset_index(drop=True)
+
+    records = [{"Veteran ID": f"VET-{i}", "VA Category": category, "Risk Score": risk, "Intake Date": "2024-01-0%d" % day}
+               for i, (category, risk, day) in enumerate([("Routine", 2, 1), ("Urgent", 6, 2), ("Emergent", 9, 3),
+                                                          ("Routine", 3, 4), ("Urgent", 5, 5)])]
+    client = FakeClient(records)
+    syncer = DeltaSyncer(client, scored, triage_rows, build_queue=TriageQueue.from_frame)
+    _, first_version = syncer.refresh()
+    first_queue = syncer.queue_for(first_version)
+    first_order = first_queue.top(10)
+
+    client.records = [dict(record) for record in records if record["Veteran ID"] != "VET-2"]
+    client.records[0].update({"VA Category": "Emergent", "Risk Score": 10})
+    client.records.append({"Veteran ID": "VET-9", "VA Category": "Urgent", "Risk Score": 7, "Intake Date": "2024-01-09"})
+    frame, version = syncer.refresh()
+
+    queue = syncer.queue_for(version)
+    assert queue is not first_queue and first_queue.top(10) == first_order
+    assert syncer.queue_for(first_version) is None
+    assert queue.top(10) == frame["Veteran ID"].tolist() == ["VET-0", "VET-9", "VET-1", "VET-4", "VET-3"]
+    for category in ["Emergent", "Urgent", "Routine"]:
+        assert (frame["VA Category"].iloc[queue.category_slice(category)] == category).all()
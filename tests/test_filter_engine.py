@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from filter_engine import (FilterIndex, FilterResultCache, apply_filter_state, build_filter_state,
+                           canonical_filter_state, filter_mask, filter_positions)
+from synthetic_data import generate_synthetic_frame
+
+
+@pytest.fixture(scope="module")
+def veterans():
+    return generate_synthetic_frame(2000, seed=7)
+
+
+def test_overlapping_range_queries_share_one_index(veterans):
+    index = FilterIndex(veterans)
+    order_before = index.ranges["PHQ-9 Score"].order.copy()
+    for low, high in [(20, 27), (23, 25), (20, 27)]:
+        state = build_filter_state(ranges={"PHQ-9 Score": (low, high)})
+        positions = filter_positions(veterans, state, index)
+        assert np.array_equal(positions, np.flatnonzero(filter_mask(veterans, state)))
+        assert veterans["PHQ-9 Score"].iloc[positions].between(low, high).all()
+    assert np.array_equal(index.ranges["PHQ-9 Score"].order, order_before)
+
+
+def test_cache_keeps_the_rows_a_full_selection_excludes(veterans):
+    df = veterans.copy()
+    df.loc[df.index[:10], "Assigned Clinician"] = None
+    index = FilterIndex(df)
+    state = build_filter_state({"Assigned Clinician": list(index.counts("Assigned Clinician"))})
+    expected = apply_filter_state(df, state, index)
+    assert len(expected) == len(df) - 10
+    assert len(FilterResultCache().apply(df, "v1", state, index)) == len(expected)
+    assert canonical_filter_state(state, index) == state
+
+    # Without missing values the same selection filters nothing and is dropped from the key
+    full = FilterIndex(veterans)
+    state = build_filter_state({"Assigned Clinician": list(full.counts("Assigned Clinician"))})
+    assert canonical_filter_state(state, full).selections == ()
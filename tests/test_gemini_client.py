@@ -0,0 +1,146 @@
+import pytest
+
+from gemini_client import CircuitOpenError, GeminiClient, GeminiHTTPError, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+def make_client(fake_gemini, clock, sleeps, **options):
+    options.setdefault("read_timeout", 2)
+    return GeminiClient("test-key", fake_gemini.url, sleep=sleeps.append, clock=clock, **options)
+
+
+def test_transient_errors_are_retried(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps)
+    fake_gemini.script = [(503, {}, {"error": "busy"}, 0), (500, {}, {"error": "oops"}, 0)]
+    assert client.generate("hi", "m") == "echo:hi"
+    assert len(fake_gemini.log) == 3
+    assert len(sleeps) == 2
+    assert client.stats()["retries"] == 2 and client.stats()["failures"] == 0
+
+
+def test_retry_waits_at_least_retry_after(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps)
+    fake_gemini.script = [(429, {"Retry-After": "7"}, {"error": "quota"}, 0)]
+    assert client.generate("a", "m") == "echo:a"
+    assert sleeps[0] >= 7
+
+
+def test_retry_after_past_the_cap_fails_fast(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps, max_retry_after=30)
+    fake_gemini.script = [(429, {"Retry-After": "120"}, {"error": "quota"}, 0)]
+    with pytest.raises(GeminiHTTPError) as error:
+        client.generate("a", "m")
+    assert error.value.status_code == 429
+    assert len(fake_gemini.log) == 1 and sleeps == []
+
+
+def test_slow_response_times_out_and_is_retried(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps, read_timeout=0.2)
+    fake_gemini.script = [(200, {}, None, 0.6)]
+    assert client.generate("slow", "m") == "echo:slow"
+    assert client.stats()["retries"] == 1
+
+
+def test_client_errors_are_not_retried(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps, failure_threshold=1)
+    fake_gemini.script = [(400, {}, {"error": "bad key"}, 0)]
+    with pytest.raises(GeminiHTTPError, match=r"API Error \(400\)"):
+        client.generate("x", "m")
+    assert len(fake_gemini.log) == 1 and sleeps == []
+    assert client.stats()["circuit"] == "closed"
+
+
+def test_circuit_opens_then_recovers_after_a_trial_call(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps, max_retries=0, failure_threshold=2, reset_seconds=30)
+    fake_gemini.default = (503, {}, {"error": "down"}, 0)
+    for _ in range(2):
+        with pytest.raises(GeminiHTTPError):
+            client.generate("x", "m")
+    assert client.stats()["circuit"] == "open"
+
+    sent = len(fake_gemini.log)
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as error:
+        client.generate("x", "m")
+    assert error.value.retry_in == pytest.approx(20)
+    assert len(fake_gemini.log) == sent  # Open circuit: no request made
+
+    clock.now += 20
+    assert client.stats()["circuit"] == "half-open"
+    fake_gemini.default = (200, {}, None, 0)
+    assert client.generate("back", "m") == "echo:back"
+    assert client.stats()["circuit"] == "closed"
+    assert client.stats()["circuit_opened"] == 1
+
+
+def test_failed_trial_call_reopens_the_circuit(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps, max_retries=0, failure_threshold=1, reset_seconds=30)
+    fake_gemini.default = (503, {}, {"error": "down"}, 0)
+    with pytest.raises(GeminiHTTPError):
+        client.generate("x", "m")
+    clock.now += 30
+    with pytest.raises(GeminiHTTPError):
+        client.generate("x", "m")  # The half-open trial
+    with pytest.raises(CircuitOpenError):
+        client.generate("x", "m")
+    assert client.stats()["circuit_opened"] == 2
+
+
+def test_trial_call_raising_an_unexpected_error_reopens_the_circuit(fake_gemini, clock, sleeps, monkeypatch):
+    client = make_client(fake_gemini, clock, sleeps, max_retries=0, failure_threshold=1, reset_seconds=30)
+    fake_gemini.default = (503, {}, {"error": "down"}, 0)
+    with pytest.raises(GeminiHTTPError):
+        client.generate("x", "m")
+    clock.now += 30
+
+    def broken_post(*args, **kwargs):
+        raise RuntimeError("not a requests error")
+
+    monkeypatch.setattr(client.session, "post", broken_post)
+    with pytest.raises(RuntimeError):
+        client.generate("x", "m")  # The half-open trial
+    assert client.stats()["circuit"] == "open"
+
+    monkeypatch.undo()
+    clock.now += 30
+    fake_gemini.default = (200, {}, None, 0)
+    assert client.generate("back", "m") == "echo:back"  # A new trial is allowed, not stuck open
+    assert client.stats()["circuit"] == "closed"
+
+
+def test_retry_after_header_parsing():
+    assert retry_after_seconds("12") == 12
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480) == pytest.approx(10)
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+def test_stream_yields_text_as_it_arrives(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps)
+    pieces = list(client.stream_generate("streamed answer", "m"))
+    assert len(pieces) > 1
+    assert "".join(pieces) == "echo:streamed answer"
+    assert "alt=sse" in fake_gemini.log[0][0]
+
+
+def test_stream_decodes_utf8_without_a_charset(fake_gemini, clock, sleeps):
+    client = make_client(fake_gemini, clock, sleeps)
+    fake_gemini.stream_content_type = "text/event-stream"  # No charset parameter
+    assert "".join(client.stream_generate("Veterans — café •", "m")) == "echo:Veterans — café •"
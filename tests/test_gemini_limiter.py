@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+from gemini_limiter import GeminiLimiter, estimate_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(requests_per_minute=60, tokens_per_minute=1000000, sleep=None):
+    clock = FakeClock()
+    sleeps = []
+    limiter = GeminiLimiter(requests_per_minute, tokens_per_minute, clock=clock, sleep=sleep or sleeps.append)
+    return limiter, clock, sleeps
+
+
+def wait_until(condition, timeout=5):
+    """Poll condition() until it holds, so a test can act once other threads are blocked"""
+    pause = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        pause.wait(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_requests_per_minute_bucket():
+    limiter, clock, sleeps = make_limiter(requests_per_minute=60)
+    for _ in range(60):
+        assert limiter.acquire(1) == 0  # A full minute's burst
+    assert limiter.acquire(1) == pytest.approx(1)
+    assert limiter.acquire(1) == pytest.approx(2)  # Reservations queue in arrival order
+    clock.now += 3
+    assert limiter.acquire(1) == pytest.approx(0)
+    stats = limiter.stats()
+    assert sleeps == pytest.approx([1, 2])
+    assert stats["waited"] == 2 and stats["max_wait"] == pytest.approx(2) and stats["avg_wait"] == pytest.approx(1.5)
+
+
+def test_tokens_per_minute_bucket():
+    limiter, _, sleeps = make_limiter(tokens_per_minute=600)
+    assert limiter.acquire(600) == 0
+    assert limiter.acquire(60) == pytest.approx(6)
+    assert estimate_tokens("x" * 400, 1024) == 100 + 1 + 1024
+
+
+def test_queue_depth_counts_blocked_callers():
+    release = threading.Event()
+    limiter, _, _ = make_limiter(requests_per_minute=1, sleep=lambda seconds: release.wait(5))
+    limiter.acquire(1)
+    waiters = [threading.Thread(target=limiter.acquire, args=(1,)) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    wait_until(lambda: limiter.stats()["queue_depth"] == 3)
+    release.set()
+    for waiter in waiters:
+        waiter.join(timeout=5)
+    assert limiter.stats()["queue_depth"] == 0
+    assert limiter.stats()["max_queue_depth"] == 3
+
+
+def test_identical_in_flight_calls_are_coalesced():
+    limiter, _, _ = make_limiter()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "summary"
+
+    leader = threading.Thread(target=lambda: results.append(limiter.run("same", 10, call)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(limiter.run("same", 10, call))) for _ in range(5)]
+    for follower in followers:
+        follower.start()
+    wait_until(lambda: limiter.stats()["coalesced"] == 5)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == ["summary"] * 6
+    stats = limiter.stats()
+    assert stats["requests"] == 1 and stats["coalesced"] == 5 and stats["in_flight"] == 0
+    assert limiter.run("same", 10, lambda: "fresh") == "fresh"  # Finished calls are not reused
+
+
+def test_coalesced_callers_share_the_error():
+    limiter, _, _ = make_limiter()
+    release = threading.Event()
+    errors = []
+
+    def call():
+        release.wait(5)
+        raise ValueError("quota exceeded")
+
+    def caller():
+        try:
+            limiter.run("same", 10, call)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: limiter.stats()["coalesced"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(errors) == 3 and limiter.stats()["in_flight"] == 0
+
+
+def test_stream_leader_streams_and_followers_get_the_whole_text():
+    limiter, _, _ = make_limiter()
+    release = threading.Event()
+    outputs = []
+
+    def open_stream():
+        yield "first "
+        release.wait(5)
+        yield "second"
+
+    leader = limiter.stream("same", 10, open_stream)
+    assert next(leader) == "first "
+    follower = threading.Thread(target=lambda: outputs.append(list(limiter.stream("same", 10, open_stream))))
+    follower.start()
+    wait_until(lambda: limiter.stats()["coalesced"] == 1)
+    release.set()
+    assert list(leader) == ["second"]
+    follower.join(timeout=5)
+    assert outputs == [["first second"]]
+
+
+def test_abandoned_stream_fails_its_followers():
+    limiter, _, _ = make_limiter()
+    leader = limiter.stream("same", 10, lambda: iter(["first ", "second"]))
+    next(leader)
+    errors = []
+
+    def follower():
+        try:
+            list(limiter.stream("same", 10, lambda: iter(["unused"])))
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    wait_until(lambda: limiter.stats()["coalesced"] == 1)
+    leader.close()
+    thread.join(timeout=5)
+    assert len(errors) == 1 and limiter.stats()["in_flight"] == 0
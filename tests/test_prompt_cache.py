@@ -0,0 +1,49 @@
+import os
+import time
+
+from prompt_cache import PromptCache, prompt_key
+
+
+def age_file(cache, key, seconds):
+    path = cache._path(key)
+    created = time.time() - seconds
+    os.utime(path, (created, created))
+
+
+def test_round_trip_through_disk(tmp_path):
+    key = prompt_key("model", {}, "prompt")
+    PromptCache(tmp_path).put(key, "answer")
+    cache = PromptCache(tmp_path)
+    assert cache.get(key) == "answer" and cache.stats()["disk_hits"] == 1
+
+
+def test_scan_deletes_expired_files(tmp_path):
+    writer = PromptCache(tmp_path, ttl_seconds=60)
+    writer.put("aa-old", "stale")
+    writer.put("bb-new", "fresh")
+    age_file(writer, "aa-old", 120)
+
+    cache = PromptCache(tmp_path, ttl_seconds=60)
+    assert cache.stats()["disk_entries"] is None
+    cache.put("cc-next", "newest")
+    assert not cache._path("aa-old").exists()
+    assert cache._path("bb-new").exists() and cache.stats()["expired"] == 1
+
+
+def test_put_deletes_files_that_expired_since_the_scan(tmp_path):
+    cache = PromptCache(tmp_path, ttl_seconds=60)
+    cache.put("aa-old", "stale")
+    created, size = cache._disk_sizes["aa-old"]
+    cache._disk_sizes["aa-old"] = (created - 120, size)
+    cache.put("bb-new", "fresh")
+    assert not cache._path("aa-old").exists() and cache._path("bb-new").exists()
+    stats = cache.stats()
+    assert stats["expired"] == 1 and stats["evictions"] == 0 and stats["disk_entries"] == 1
+
+
+def test_byte_budget_evicts_oldest_first(tmp_path):
+    cache = PromptCache(tmp_path, disk_bytes=150)
+    for key in ("aa-1", "bb-2", "cc-3"):
+        cache.put(key, "x" * 40)
+    assert not cache._path("aa-1").exists() and cache._path("cc-3").exists()
+    assert cache.stats()["evictions"] >= 1
@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_engine import SCORE_COLUMNS, score_veterans
+from triage_dashboard_3 import calculate_detailed_risk_score, calculate_va_category_and_risk, generate_synthetic_data
+
+C_SSRS_SCREENS = ["Negative", "Positive - Passive Ideation", "Positive - Active Ideation", "Positive - Recent Behavior"]
+
+
+def row_scores(df):
+    """The reference row-wise scoring the dashboard used before risk_engine"""
+    va_info = df.apply(calculate_va_category_and_risk, axis=1, result_type='expand')
+    risk_info = df.apply(calculate_detailed_risk_score, axis=1, result_type='expand')
+    return pd.concat([va_info, risk_info], axis=1).set_axis(SCORE_COLUMNS, axis=1)
+
+
+def assert_parity(df):
+    expected = row_scores(df)
+    actual = score_veterans(df)
+    for column in SCORE_COLUMNS:
+        assert actual[column].tolist() == expected[column].tolist(), column
+
+
+def edge_rows(flag_values):
+    """Every C-SSRS / self-harm / severity band / compounding-factor combination, missing scores included"""
+    rows = []
+    for screen, self_harm, phq9, gad7, pcl5, support, substance, housing in itertools.product(
+            C_SSRS_SCREENS, flag_values, [np.nan, 3, 15, 19, 20], [np.nan, 3, 10, 14, 15], [np.nan, 10, 55],
+            ["Low", "High"], ["High", "Low"], ["Homeless", "Stable"]):
+        rows.append({
+            "C-SSRS Screen": screen,
+            "PHQ-9 Q9 (Self-Harm)": self_harm,
+            "PHQ-9 Score": phq9,
+            "GAD-7 Score": gad7,
+            "PCL-5 Score": pcl5,
+            "Social Support": support,
+            "Substance Use Risk": substance,
+            "Housing Status": housing,
+        })
+    return pd.DataFrame(rows)
+
+
+def test_parity_on_synthetic_data():
+    assert_parity(generate_synthetic_data(2000))
+
+
+@pytest.mark.parametrize("flag_values", [(True, False), ("Yes", "No")], ids=["bool flags", "yes/no flags"])
+def test_parity_on_edge_rows(flag_values):
+    df = edge_rows(flag_values)
+    assert_parity(df)
+    # Every category and risk level is exercised
+    assert set(score_veterans(df)["VA Category"]) == {"Emergent", "Urgent", "Routine"}
+    assert set(score_veterans(df)["Risk Score"]) == {1, 2, 3, 4, 5, 6}
@@ -0,0 +1,12 @@
+import datetime
+
+import pandas as pd
+
+from triage_dashboard_3 import generate_synthetic_data
+
+
+def test_synthetic_dates_follow_the_as_of_day():
+    monday = generate_synthetic_data(50, as_of=datetime.date(2026, 10, 19))
+    tuesday = generate_synthetic_data(50, as_of=datetime.date(2026, 10, 20))
+    assert (tuesday["Intake Date"] - monday["Intake Date"] == pd.Timedelta(days=1)).all()
+    assert monday["Intake Date"].max() <= pd.Timestamp("2026-10-19")
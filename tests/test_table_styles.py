@@ -0,0 +1,23 @@
+import sys
+
+import pandas as pd
+
+from table_styles import _render_payload, badge_table, row_styles, style_table
+
+FRAME = pd.DataFrame({
+    "Veteran ID": ["VET-1", "VET-2", "VET-3"],
+    "VA Category": pd.Categorical(["Emergent", None, "Routine"]),
+    "Intake Date": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+})
+
+
+def test_row_styles_follow_the_category():
+    styles = row_styles(FRAME)
+    assert "220, 38, 38" in styles[0] and styles[1] == "" and "119, 221, 119" in styles[2]
+
+
+def test_render_payload_without_private_streamlit_modules(monkeypatch):
+    monkeypatch.setitem(sys.modules, "streamlit.dataframe_util", None)  # import now raises ImportError
+    plain = _render_payload(badge_table(FRAME))
+    styled = _render_payload(style_table(FRAME))
+    assert 0 < plain < styled
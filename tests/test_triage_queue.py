@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from triage_queue import TriageQueue, triage_order
+
+CATEGORIES = ['Emergent', 'Urgent', 'Routine', None]
+
+
+def random_row(rng, veteran_id):
+    intake = None if rng.random() < 0.1 else pd.Timestamp("2024-01-01") + pd.Timedelta(days=rng.randrange(400))
+    risk = np.nan if rng.random() < 0.05 else rng.randrange(11)
+    return {"Veteran ID": veteran_id, "VA Category": rng.choice(CATEGORIES), "Risk Score": risk, "Intake Date": intake}
+
+
+def reference_order(rows):
+    """Veteran IDs fully re-sorted from scratch"""
+    frame = pd.DataFrame(list(rows.values()))
+    return frame.take(triage_order(frame)).reset_index(drop=True)
+
+
+def assert_matches_reference(queue, rows):
+    reference = reference_order(rows)
+    ids = reference["Veteran ID"].tolist()
+    assert len(queue) == len(ids)
+    assert queue.top(len(ids) + 1) == ids
+    assert queue.top(5) == ids[:5]
+    for category in ['Emergent', 'Urgent', 'Routine']:
+        in_category = reference.loc[reference["VA Category"] == category, "Veteran ID"].tolist()
+        assert queue.count(category) == len(in_category)
+        assert queue.top(3, category) == in_category[:3]
+        assert reference["Veteran ID"].iloc[queue.category_slice(category)].tolist() == in_category
+
+
+def test_push_and_remove_match_a_full_resort():
+    rng = random.Random(7)
+    rows = {f"VET-{i}": random_row(rng, f"VET-{i}") for i in range(300)}
+    queue = TriageQueue.from_frame(pd.DataFrame(list(rows.values())), bucket_size=8)
+    assert_matches_reference(queue, rows)
+
+    next_id = len(rows)
+    for step in range(400):
+        action = rng.random()
+        if action < 0.3 and rows:
+            veteran_id = rng.choice(list(rows))
+            del rows[veteran_id]
+            queue.remove(veteran_id)
+        else:
+            if action < 0.7:
+                veteran_id = rng.choice(list(rows))  # Rescored veteran moves
+            else:
+                veteran_id, next_id = f"VET-{next_id}", next_id + 1
+            row = rows[veteran_id] = random_row(rng, veteran_id)
+            queue.push(veteran_id, row["VA Category"], row["Risk Score"], row["Intake Date"])
+        if step % 50 == 0:
+            assert_matches_reference(queue, rows)
+    assert_matches_reference(queue, rows)
+
+
+def test_remove_unknown_veteran_is_ignored():
+    rng = random.Random(1)
+    rows = {f"VET-{i}": random_row(rng, f"VET-{i}") for i in range(10)}
+    queue = TriageQueue.from_frame(pd.DataFrame(list(rows.values())))
+    queue.remove("VET-missing")
+    assert_matches_reference(queue, rows)
+
+
+def test_copy_is_independent():
+    rng = random.Random(3)
+    rows = {f"VET-{i}": random_row(rng, f"VET-{i}") for i in range(50)}
+    queue = TriageQueue.from_frame(pd.DataFrame(list(rows.values())), bucket_size=4)
+    before = queue.top(len(rows))
+
+    updated = queue.copy()
+    updated.remove("VET-0")
+    updated.push("VET-new", 'Emergent', 10, "2024-01-01")
+    assert queue.top(len(rows)) == before
+    assert updated.top(1) == ["VET-new"] and "VET-0" not in updated
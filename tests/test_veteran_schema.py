@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from triage_dashboard_3 import clean_veterans_frame
+from veteran_schema import format_text
+
+
+def test_format_text_treats_missing_and_blank_as_empty():
+    assert format_text(None) == ""
+    assert format_text(np.nan) == ""
+    assert format_text("   ") == ""
+    assert format_text(" Family concerns ") == "Family concerns"
+
+
+def test_blank_priority_note_is_empty_after_ingest():
+    # '' becomes None, then NaN in the categorical Priority Notes column
+    df = clean_veterans_frame(pd.DataFrame({
+        "Veteran ID": ["VET-1000", "VET-1001"],
+        "Age": [30, 40],
+        "Priority Notes": ["", "Family concerns"],
+    }))
+    assert isinstance(df["Priority Notes"].dtype, pd.CategoricalDtype)
+    notes = [format_text(value) for value in df["Priority Notes"]]
+    assert notes == ["", "Family concerns"]
@@ -1,15 +1,38 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import numpy as np
 import random
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 import json
-import requests
 import time
+import threading
+import os
 from calendar import monthrange
 import calendar
+from risk_engine import score_veterans, SCORE_COLUMNS
+from pipeline_cache import VersionedFrameCache, BackgroundRefresher
+from data_client import VeteransClient
+from delta_sync import DeltaSyncer
+from streaming_ingest import iter_payload_records, read_records_frame
+from snapshot_store import SnapshotStore, format_age
+from synthetic_data import generate_synthetic_frame
+from filter_engine import build_filter_state, FilterIndex, FilterResultCache
+from triage_queue import TriageQueue, triage_order
+from appointment_store import AppointmentStore
+from prompt_cache import PromptCache, prompt_key
+from ai_batch import iter_batch
+from gemini_client import GeminiClient, GeminiError, GEMINI_API_BASE
+from gemini_limiter import GeminiLimiter, estimate_tokens
+from table_styles import style_table, badge_table, use_styler
+from table_pager import sort_positions, page_bounds, page_frame, PAGE_SIZES, DEFAULT_PAGE_SIZE, TRIAGE_ORDER
+from veteran_schema import (apply_veteran_schema, is_yes, format_flag, format_date, format_text, memory_footprint_report,
+                            FLAG_TRUE_VALUES)
+
+# Section-scoped reruns: st.fragment since Streamlit 1.37, experimental_fragment from 1.33.
+# Older releases simply rerun the whole script.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -55,7 +78,7 @@ def initialize_session_state():
     if 'calendar_view' not in st.session_state:
         st.session_state.calendar_view = datetime.now()
     if 'appointments' not in st.session_state:
-        st.session_state.appointments = generate_sample_appointments()
+        st.session_state.appointments = AppointmentStore(generate_sample_appointments())
     if 'selected_calendar_day' not in st.session_state:
         st.session_state.selected_calendar_day = None
 
@@ -297,6 +320,38 @@ def load_enhanced_css():
             z-index: 10;
         }}
         
+        .calendar-grid {{
+            display: grid;
+            grid-template-columns: repeat(7, minmax(0, 1fr));
+            gap: 0.4rem;
+            margin-bottom: 0.75rem;
+        }}
+        
+        .calendar-weekday {{
+            text-align: center;
+            font-weight: 600;
+            padding: 0.5rem;
+            border-bottom: 2px solid {COLORS['neutral_light_gray']};
+            color: {COLORS['neutral_charcoal']};
+        }}
+        
+        .calendar-weekend-label {{
+            color: #dc2626;
+        }}
+        
+        .calendar-weekend {{
+            background-color: #f8f9fa;
+            border-color: #dc2626;
+        }}
+        
+        .calendar-weekend .calendar-day-number {{
+            color: #dc2626;
+        }}
+        
+        .calendar-weekend .calendar-appointment-info {{
+            color: #6b7280;
+        }}
+        
         .calendar-day-empty {{
             border: none;
             cursor: default;
@@ -489,64 +544,129 @@ def load_enhanced_css():
     """, unsafe_allow_html=True)
 
 # --- AI Integration Functions ---
-def call_gemini_api(prompt, model="gemini-2.0-flash"):
+GEMINI_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 1024,
+}
+PROMPT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".triageview_prompt_cache")
+# Process-wide Gemini quota, shared by every session (keep below the provider's per-minute limits)
+GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_TOKENS_PER_MINUTE = 1000000
+AI_SUMMARY_MODEL = "gemini-1.5-flash"  # Summaries, assessments and clinical questions
+
+@st.cache_resource
+def get_gemini_client():
+    """Long-lived pooled Gemini client, shared across reruns and sessions"""
+    return GeminiClient(GEMINI_API_KEY, GEMINI_API_BASE)
+
+@st.cache_resource
+def get_prompt_cache():
+    """Process-wide cache of Gemini responses (memory LRU over disk, with a TTL)"""
+    return PromptCache(PROMPT_CACHE_DIR)
+
+@st.cache_resource
+def get_gemini_limiter():
+    """Process-wide requests/min and tokens/min limiter that also coalesces identical in-flight prompts"""
+    return GeminiLimiter(GEMINI_REQUESTS_PER_MINUTE, GEMINI_TOKENS_PER_MINUTE)
+
+class AIFailure(str):
+    """Message shown in place of an AI answer when the call failed"""
+
+def ai_failed(text):
+    """True when an AI answer is a failure message rather than model output"""
+    return isinstance(text, AIFailure)
+
+def request_gemini(prompt, model="gemini-2.0-flash", use_cache=True):
+    """Answer text for one prompt; raises GeminiError when the call fails
+
+    use_cache=False bypasses the prompt cache entirely: nothing is read from it or written to it.
+    """
+    # Identical prompts (same model and config) are answered from the prompt cache
+    cache_key = prompt_key(model, GEMINI_GENERATION_CONFIG, prompt)
+    if use_cache:
+        cached = get_prompt_cache().get(cache_key)
+        if cached is not None:
+            return cached
+    tokens = estimate_tokens(prompt, GEMINI_GENERATION_CONFIG["maxOutputTokens"])
+    # Pooled session, retries with backoff and a circuit breaker live in the client; the limiter
+    # queues the call inside the shared quota and lets concurrent identical prompts share one request
+    text = get_gemini_limiter().run(
+        cache_key, tokens, lambda: get_gemini_client().generate(prompt, model, GEMINI_GENERATION_CONFIG))
+    # Only real answers are cached; errors are retried on the next call
+    if use_cache:
+        get_prompt_cache().put(cache_key, text, model)
+    return text
+
+def call_gemini_api(prompt, model="gemini-2.0-flash", use_cache=True):
     """Call Gemini API with proper error handling"""
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={GEMINI_API_KEY}"
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        data = {
-            "contents": [
-                {
-                    "parts": [
-                        {
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            "generationConfig": {
-                "temperature": 0.7,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 1024,
-            }
-        }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            if 'candidates' in result and len(result['candidates']) > 0:
-                if 'content' in result['candidates'][0] and 'parts' in result['candidates'][0]['content']:
-                    return result['candidates'][0]['content']['parts'][0]['text']
-                else:
-                    return "AI response format unexpected. Please try again."
-            else:
-                return "No response generated. Please try again."
-        else:
-            error_detail = response.json() if response.content else "Unknown error"
-            return f"API Error ({response.status_code}): {error_detail}"
-            
-    except requests.exceptions.Timeout:
-        return "Request timed out. Please try again."
-    except requests.exceptions.RequestException as e:
-        return f"Network error: {str(e)}"
+        return request_gemini(prompt, model, use_cache)
+    except GeminiError as e:
+        return AIFailure(e)
     except Exception as e:
-        return f"Unexpected error: {str(e)}"
-
-def generate_ai_summary(data, summary_type="all_patients"):
-    """Generate AI summary using enhanced prompts"""
+        return AIFailure(f"Unexpected error: {str(e)}")
+
+def stream_gemini_api(prompt, model="gemini-2.0-flash", use_cache=True):
+    """Like call_gemini_api, but yields the answer in pieces as Gemini streams it"""
+    cache_key = prompt_key(model, GEMINI_GENERATION_CONFIG, prompt)
+    if use_cache:
+        cached = get_prompt_cache().get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+    tokens = estimate_tokens(prompt, GEMINI_GENERATION_CONFIG["maxOutputTokens"])
+    pieces = []
     try:
-        if summary_type == "all_patients":
-            emergent_cases = len(data[data['VA Category'] == 'Emergent'])
-            urgent_cases = len(data[data['VA Category'] == 'Urgent'])
-            routine_cases = len(data[data['VA Category'] == 'Routine'])
-            
-            prompt = f"""
+        # Callers coalesced onto an identical in-flight stream receive its full text in one piece
+        for piece in get_gemini_limiter().stream(
+                cache_key, tokens, lambda: get_gemini_client().stream_generate(prompt, model, GEMINI_GENERATION_CONFIG)):
+            pieces.append(piece)
+            yield piece
+    except GeminiError as e:
+        # Same error strings as call_gemini_api, after whatever text already arrived
+        yield AIFailure(f"\n\n{e}" if pieces else e)
+        return
+    except Exception as e:
+        yield AIFailure(f"\n\nUnexpected error: {str(e)}" if pieces else f"Unexpected error: {str(e)}")
+        return
+    if not pieces:
+        yield AIFailure("No response generated. Please try again.")
+    elif use_cache:
+        get_prompt_cache().put(cache_key, "".join(pieces), model)
+
+def stream_ai_response(chunks, placeholder, render):
+    """Show AI text in placeholder as it arrives, then clear it; returns the full text"""
+    if isinstance(chunks, str):
+        chunks = [chunks]  # Prompt building failed before any request was made
+    text = ""
+    failed = False
+    for chunk in chunks:
+        text += chunk
+        failed = failed or ai_failed(chunk)
+        with placeholder.container():
+            render(text + " ▌")
+    placeholder.empty()
+    # A stream that broke off mid-answer is a failure, even with partial text
+    return AIFailure(text) if failed else text
+
+def all_patients_summary_html(summary_text):
+    return f"""
+            <div class="ai-summary-all-patients">
+            <h4>🎯 AI Clinical Insights - All Patients</h4>
+            <p>{summary_text}</p>
+            </div>
+            """
+
+def ai_summary_prompt(data, summary_type="all_patients"):
+    """Prompt for an all-patients summary or a single veteran's assessment"""
+    if summary_type == "all_patients":
+        emergent_cases = len(data[data['VA Category'] == 'Emergent'])
+        urgent_cases = len(data[data['VA Category'] == 'Urgent'])
+        routine_cases = len(data[data['VA Category'] == 'Routine'])
+        
+        prompt = f"""
 You are a senior clinical psychologist and veteran mental health specialist with 20+ years of experience in VA clinical settings. Analyze this veteran patient population data and provide actionable clinical insights.
 
 VETERAN POPULATION METRICS:
@@ -559,7 +679,7 @@ CLINICAL SEVERITY INDICATORS:
 • Average Depression Severity (PHQ-9): {data['PHQ-9 Score'].mean():.1f}/27
 • Average Anxiety Severity (GAD-7): {data['GAD-7 Score'].mean():.1f}/21
 • Average PTSD Severity (PCL-5): {data['PCL-5 Score'].mean():.1f}/80
-• Veterans with Active Suicidal Ideation: {len(data[data['PHQ-9 Q9 (Self-Harm)'] == 'Yes'])}
+• Veterans with Active Suicidal Ideation: {int(data['PHQ-9 Q9 (Self-Harm)'].isin(FLAG_TRUE_VALUES).sum())}
 
 PSYCHOSOCIAL RISK FACTORS:
 • Housing Instability: {len(data[data['Housing Status'].isin(['At Risk', 'Homeless'])])} veterans ({(len(data[data['Housing Status'].isin(['At Risk', 'Homeless'])]) / len(data) * 100):.1f}%)
@@ -583,12 +703,12 @@ Provide a concise clinical summary (150-200 words) that includes:
 - Specific actions for improving outcomes
 
 Write in professional clinical language suitable for interdisciplinary team meetings.
-            """
+        """
+    
+    elif summary_type == "individual_patient":
+        veteran = data.iloc[0]
         
-        elif summary_type == "individual_patient":
-            veteran = data.iloc[0]
-            
-            prompt = f"""
+        prompt = f"""
 You are a licensed clinical psychologist conducting a comprehensive assessment for a veteran patient. Provide a thorough clinical formulation and treatment recommendations.
 
 VETERAN CLINICAL PROFILE:
@@ -598,7 +718,7 @@ VETERAN CLINICAL PROFILE:
 
 SUICIDE RISK ASSESSMENT:
 • C-SSRS Screening Result: {veteran['C-SSRS Screen']}
-• PHQ-9 Item 9 (Suicidal Ideation): {veteran['PHQ-9 Q9 (Self-Harm)']}
+• PHQ-9 Item 9 (Suicidal Ideation): {format_flag(veteran['PHQ-9 Q9 (Self-Harm)'])}
 • Clinical Risk Explanation: {veteran['Risk Explanation']}
 
 STANDARDIZED ASSESSMENT SCORES:
@@ -612,12 +732,12 @@ PSYCHOSOCIAL DETERMINANTS:
 • Substance Use Risk Level: {veteran['Substance Use Risk']}
 • Emergency Contact Availability: {veteran['Emergency Contact']}
 • Transportation Access: {veteran['Transportation']}
-• Mental Health Treatment History: {veteran['Previous Mental Health Treatment']}
+• Mental Health Treatment History: {format_flag(veteran['Previous Mental Health Treatment'])}
 
 TREATMENT PREFERENCES & READINESS:
 • Preferred Treatment Modality: {veteran['Treatment Preference']}
 • Current Clinical Assignment: {veteran['Assigned Clinician']}
-• Last Clinical Contact: {veteran['Last Contact']}
+• Last Clinical Contact: {format_date(veteran['Last Contact'])}
 
 Provide a comprehensive clinical assessment (250-300 words) including:
 
@@ -629,14 +749,22 @@ Provide a comprehensive clinical assessment (250-300 words) including:
 6. **Prognostic Factors**: Protective and risk factors influencing treatment outcomes
 
 Write in professional clinical language suitable for treatment planning and case consultation.
-            """
-        
-        return call_gemini_api(prompt, "gemini-1.5-flash")
+        """
+    
+    return prompt
+
+def generate_ai_summary(data, summary_type="all_patients", stream=False):
+    """Generate AI summary using enhanced prompts"""
+    try:
+        prompt = ai_summary_prompt(data, summary_type)
+        if stream:
+            return stream_gemini_api(prompt, AI_SUMMARY_MODEL)
+        return call_gemini_api(prompt, AI_SUMMARY_MODEL)
         
     except Exception as e:
-        return f"Error generating AI summary: {str(e)}"
+        return AIFailure(f"Error generating AI summary: {str(e)}")
 
-def ask_ai_question(question, data_context):
+def ask_ai_question(question, data_context, stream=False):
     """Enhanced AI questioning with better prompts"""
     try:
         prompt = f"""
@@ -657,193 +785,171 @@ Please provide a professional, evidence-based response that:
 Respond in clear, professional language appropriate for clinical decision-making. Keep response focused and practical (150-200 words).
         """
         
-        return call_gemini_api(prompt, "gemini-1.5-flash")
+        if stream:
+            return stream_gemini_api(prompt, AI_SUMMARY_MODEL)
+        return call_gemini_api(prompt, AI_SUMMARY_MODEL)
         
     except Exception as e:
-        return f"Error processing question: {str(e)}"
+        return AIFailure(f"Error processing question: {str(e)}")
 
 # --- Enhanced Synthetic Data Generation ---
 @st.cache_data
-def generate_synthetic_data(num_records=100):
+def generate_synthetic_data(num_records=100, as_of=None):
     """Generate realistic synthetic veteran mental health data"""
-    random.seed(42)
-    np.random.seed(42)
-    
-    data = []
-    c_ssrs_options = [
-        'Negative', 'Positive - Passive Ideation', 'Positive - Active Ideation', 'Positive - Recent Behavior'
-    ]
-    
-    # Separate male and female names for accurate gender matching
-    male_first_names = ['James', 'Michael', 'Robert', 'John', 'William', 'David', 'Richard', 'Joseph', 'Thomas', 'Christopher',
-                        'Daniel', 'Matthew', 'Anthony', 'Mark', 'Donald', 'Steven', 'Paul', 'Andrew', 'Joshua', 'Kenneth',
-                        'Kevin', 'Brian', 'George', 'Timothy', 'Ronald', 'Jason', 'Edward', 'Jeffrey', 'Ryan', 'Jacob',
-                        'Nicholas', 'Eric', 'Jonathan', 'Stephen', 'Larry', 'Justin', 'Scott', 'Brandon', 'Benjamin', 'Samuel']
-    
-    female_first_names = ['Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 'Jessica', 'Sarah', 'Karen',
-                          'Lisa', 'Nancy', 'Betty', 'Helen', 'Sandra', 'Donna', 'Carol', 'Ruth', 'Sharon', 'Michelle',
-                          'Laura', 'Kimberly', 'Deborah', 'Dorothy', 'Amy', 'Angela', 'Ashley', 'Brenda', 'Emma', 'Olivia',
-                          'Cynthia', 'Marie', 'Janet', 'Catherine', 'Frances', 'Christine', 'Samantha', 'Debra', 'Rachel', 'Carolyn']
-    
-    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
-                  'Anderson', 'Taylor', 'Thomas', 'Hernandez', 'Moore', 'Martin', 'Jackson', 'Thompson', 'White', 'Lopez',
-                  'Lee', 'Gonzalez', 'Harris', 'Clark', 'Lewis', 'Robinson', 'Walker', 'Perez', 'Hall', 'Young',
-                  'Allen', 'Sanchez', 'Wright', 'King', 'Scott', 'Green', 'Baker', 'Adams', 'Nelson', 'Hill']
-    
-    # Pre-generate ages with median of 50
-    ages = []
-    for _ in range(num_records):
-        # Use normal distribution centered at 50 with appropriate spread
-        age = int(np.random.normal(50, 12))  # Standard deviation of 12 gives good spread
-        # Clamp to realistic veteran age range
-        age = max(22, min(80, age))
-        ages.append(age)
-    
-    # Sort ages to ensure median is close to 50
-    ages.sort()
-    # Adjust if needed to ensure median is exactly 50
-    mid_point = len(ages) // 2
-    if len(ages) % 2 == 0:
-        current_median = (ages[mid_point - 1] + ages[mid_point]) / 2
-        adjustment = 50 - current_median
-        for i in range(len(ages)):
-            ages[i] = max(22, min(80, int(ages[i] + adjustment)))
-    else:
-        ages[mid_point] = 50
-    
-    # Shuffle ages to randomize assignment
-    random.shuffle(ages)
-    
-    for i in range(num_records):
-        # Generate gender first (85% male, 15% female based on VA demographics)
-        gender = random.choices(["Male", "Female"], weights=[0.85, 0.15], k=1)[0]
-        
-        # Choose appropriate first name based on gender - THIS IS THE KEY FIX
-        if gender == "Male":
-            first_name = random.choice(male_first_names)
-        else:  # gender == "Female"
-            first_name = random.choice(female_first_names)
-        
-        # Generate last name
-        last_name = random.choice(last_names)
-        full_name = f"{first_name} {last_name}"
-        
-        # Use pre-generated age with median 50
-        age = ages[i]
-        current_year = 2025
-        birth_year = current_year - age
-        
-        # Determine service era based on realistic age and service periods
-        if age >= 70:  # Born 1955 or earlier
-            service_era = "Vietnam"
-        elif age >= 55:  # Born 1956-1970
-            service_era = random.choices(["Vietnam", "Gulf War"], weights=[0.3, 0.7], k=1)[0]
-        elif age >= 40:  # Born 1971-1985
-            service_era = random.choices(["Gulf War", "OEF/OIF"], weights=[0.4, 0.6], k=1)[0]
-        elif age >= 30:  # Born 1986-1995
-            service_era = "OEF/OIF"
-        else:  # Born 1996+
-            service_era = random.choices(["OEF/OIF", "Recent"], weights=[0.7, 0.3], k=1)[0]
-        
-        # Generate realistic branch distribution
-        branch = random.choices(
-            ["Army", "Navy", "Air Force", "Marines", "Coast Guard"], 
-            weights=[0.36, 0.26, 0.24, 0.13, 0.01], k=1
-        )[0]
-        
-        # Generate clinical scores with realistic correlations
-        c_ssrs_status = random.choices(c_ssrs_options, weights=[0.78, 0.14, 0.06, 0.02], k=1)[0]
-        phq9_q9_suicide = "No"
-        
-        if c_ssrs_status == 'Positive - Recent Behavior':
-            phq9_score = random.randint(18, 27)
-            gad7_score = random.randint(14, 21)
-            pcl5_score = random.randint(55, 80)
-            phq9_q9_suicide = "Yes"
-        elif c_ssrs_status == 'Positive - Active Ideation':
-            phq9_score = random.randint(14, 24)
-            gad7_score = random.randint(11, 20)
-            pcl5_score = random.randint(45, 70)
-            phq9_q9_suicide = "Yes"
-        elif c_ssrs_status == 'Positive - Passive Ideation':
-            phq9_score = random.randint(8, 20)
-            gad7_score = random.randint(6, 16)
-            pcl5_score = random.randint(25, 55)
-            phq9_q9_suicide = random.choices(["Yes", "No"], weights=[0.4, 0.6], k=1)[0]
-        else:
-            phq9_score = random.randint(0, 16)
-            gad7_score = random.randint(0, 12)
-            pcl5_score = random.randint(0, 45)
-            if phq9_score > 12:
-                phq9_q9_suicide = random.choices(["Yes", "No"], weights=[0.1, 0.9], k=1)[0]
-
-        # Generate realistic intake date (last 30 days) - DATE ONLY, NO TIME
-        days_ago = random.randint(0, 30)
-        intake_date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-        
-        # Generate realistic last contact (within last 7 days) - DATE ONLY, NO TIME
-        contact_days_ago = random.randint(0, 7)
-        last_contact = (datetime.now() - timedelta(days=contact_days_ago)).strftime("%Y-%m-%d")
-
-        record = {
-            "Veteran ID": f"VET-{1000 + i:04d}",
-            "Name": full_name,  # Use the properly constructed name
-            "Intake Date": intake_date,  # This will be date only
-            "Age": age,
-            "Gender": gender,
-            "Branch": branch,
-            "Service Era": service_era,
-            "C-SSRS Screen": c_ssrs_status,
-            "PHQ-9 Q9 (Self-Harm)": phq9_q9_suicide,
-            "PHQ-9 Score": phq9_score,
-            "GAD-7 Score": gad7_score,
-            "PCL-5 Score": pcl5_score,
-            "Social Support": random.choices(["Low", "Medium", "High"], weights=[0.3, 0.5, 0.2], k=1)[0],
-            "Substance Use Risk": random.choices(["Low", "Medium", "High"], weights=[0.5, 0.35, 0.15], k=1)[0],
-            "Housing Status": random.choices(["Stable", "At Risk", "Homeless"], weights=[0.75, 0.18, 0.07], k=1)[0],
-            "Previous Mental Health Treatment": random.choices(["Yes", "No"], weights=[0.65, 0.35], k=1)[0],
-            "Treatment Preference": random.choices(["Therapy", "Medication", "Both"], weights=[0.35, 0.25, 0.4], k=1)[0],
-            "Last Contact": last_contact,  # This will be date only
-            "Assigned Clinician": random.choice(["Dr. Smith", "Dr. Johnson", "Dr. Williams", "Dr. Brown", "Dr. Davis", "Unassigned"]),
-            "Priority Notes": random.choice(["", "Family concerns", "Recent hospitalization", "Employment issues", 
-                                           "Financial stress", "Medication compliance", "Transportation barriers", ""]),
-            "Contact Method": random.choice(["Phone", "Email", "Video Call", "In-Person"]),
-            "Emergency Contact": random.choices(["Available", "Limited", "None"], weights=[0.7, 0.2, 0.1], k=1)[0],
-            "Transportation": random.choices(["Own Vehicle", "Public Transit", "VA Transport", "Family/Friends", "None"], 
-                                           weights=[0.6, 0.15, 0.1, 0.1, 0.05], k=1)[0],
-        }
-        data.append(record)
-        
-    return pd.DataFrame(data)
-
-def pull_data_from_database():
+    # Column-wise NumPy generator, see synthetic_data.py for the distributions. Dates count back from
+    # as_of, which is part of the cache key: pass today's date so the cached data rolls over each day
+    return generate_synthetic_frame(num_records, seed=42, as_of=as_of)
+
+VETERANS_API_URL = "https://rapidroute-api.vercel.app/api/veterans/dashboard"
+SYNTHETIC_DATASET_VERSION = "synthetic"
+DELTA_SYNC_ENABLED = True  # Merge only changed veterans on refresh instead of rebuilding the frame
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".triageview_snapshot")
+DATASET_REFRESH_SECONDS = 30  # Minimum gap between background refreshes of the live feed
+
+@st.cache_resource
+def get_veterans_client():
+    """Long-lived pooled client for the veterans endpoint, shared across reruns"""
+    return VeteransClient(VETERANS_API_URL)
+
+def clean_veterans_frame(df):
+    """Normalize missing or invalid values in a freshly ingested veterans frame"""
+    # Handle missing or invalid values
+    df['Age'] = pd.to_numeric(df['Age'], errors='coerce')
+    df['Age'] = df['Age'].where(df['Age'] > 0)  # Convert negative or zero ages to None
+    
+    # Convert empty strings to None for consistency
+    for column in df.columns:
+        if df[column].dtype == object or pd.api.types.is_string_dtype(df[column]):
+            df[column] = df[column].replace('', None)
+
+    # Compact categoricals, small ints, bool flags and dates (see veteran_schema.py)
+    return apply_veteran_schema(df)
+
+def pull_data_from_database(body=None):
     """Pull data from the database or generate synthetic data if no database connection"""
-    try:
-        response = requests.get("https://rapidroute-api.vercel.app/api/veterans/dashboard", timeout=10)
-        response.raise_for_status()  # Raise an error for HTTP errors
-        json_response = response.json()
-        
-        # Extract the data array from the response
-        if isinstance(json_response, dict) and 'data' in json_response:
-            data = json_response['data']
+    if body is None:
+        return generate_synthetic_data(as_of=datetime.now().date())  # Generate 100 records of synthetic data
+
+    # Stream the `data` array straight into typed DataFrame chunks
+    return read_records_frame(iter_payload_records(body), prepare_chunk=clean_veterans_frame)
+
+def prepare_veteran_rows(records):
+    """Build a cleaned, scored frame from a list of veteran records"""
+    df = clean_veterans_frame(pd.DataFrame(records))
+    df[SCORE_COLUMNS] = score_veterans(df)
+    return apply_veteran_schema(df)
+
+def order_triage_frame(df):
+    """Sort by VA Category priority, then by Risk Score, then oldest intake first"""
+    # One sort over packed triage keys (see triage_queue.py) instead of a temporary sort column
+    return df.take(triage_order(df)).reset_index(drop=True)
+
+def build_triage_dataset(body=None):
+    """Ingest, score and sort the veterans dataset for display"""
+    df = pull_data_from_database(body)
+    
+    # Apply VA category and risk scoring (column-wise, see risk_engine.py)
+    df[SCORE_COLUMNS] = score_veterans(df)
+    
+    return order_triage_frame(apply_veteran_schema(df))
+
+@st.cache_resource
+def get_dataset_cache():
+    """Process-wide cache of scored datasets, shared across reruns and sessions"""
+    return VersionedFrameCache()
+
+@st.cache_resource
+def get_delta_syncer():
+    """Process-wide delta syncer that merges changed veterans into the scored frame"""
+    return DeltaSyncer(get_veterans_client(), prepare_veteran_rows, order_triage_frame, build_queue=TriageQueue.from_frame)
+
+@st.cache_resource
+def get_snapshot_store():
+    """On-disk columnar snapshot of the last good dataset"""
+    return SnapshotStore(SNAPSHOT_DIR)
+
+def fetch_live_dataset(cache, client, syncer):
+    """Pull the live feed and return (frame, version), reusing cached frames where possible"""
+    if DELTA_SYNC_ENABLED:
+        frame, version = syncer.refresh()
+        return cache.get_or_build(version, lambda: frame), version
+
+    def refetch():
+        return build_triage_dataset(client.stream(revalidate=False).body)
+
+    # Unchanged data comes back as a cheap 304 while its frame is still cached
+    result = client.stream(revalidate=client.last_version in cache)
+    if result.not_modified:
+        return cache.get_or_build(client.last_version, refetch), client.last_version
+    if result.body.version in cache:  # Known up front when the server sends an ETag
+        result.body.close()
+        return cache.get_or_build(result.body.version, refetch), result.body.version
+    frame = build_triage_dataset(result.body)
+    return cache.get_or_build(result.body.version, lambda: frame), result.body.version
+
+@st.cache_resource
+def get_dataset_refresher():
+    """Process-wide refresher that keeps the latest dataset and updates it off the script thread"""
+    cache, client, syncer, store = get_dataset_cache(), get_veterans_client(), get_delta_syncer(), get_snapshot_store()
+
+    def refresh():
+        frame, version = fetch_live_dataset(cache, client, syncer)
+        if version != store.saved_version:
+            try:
+                store.save(frame, version)
+            except OSError:
+                pass  # A read-only disk only costs us the warm start
+        return frame, version, "live"
+
+    return BackgroundRefresher(refresh, min_interval=DATASET_REFRESH_SECONDS)
+
+def load_triage_dataset():
+    """Return (frame, version) for the latest scored dataset without blocking on the network when a copy is available"""
+    refresher = get_dataset_refresher()
+    if refresher.frame is None and not refresher.last_attempt:
+        # Cold start: render the last good snapshot immediately and refresh behind it
+        try:
+            snapshot, manifest = get_snapshot_store().load()
+        except (OSError, ValueError):
+            snapshot, manifest = None, None
+        if snapshot is not None:
+            refresher.seed(snapshot, f"snapshot:{manifest['version']}", "snapshot")
+            refresher.refresh_in_background(force=True)
         else:
-            data = json_response
-            
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-        
-        # Handle missing or invalid values
-        df['Age'] = pd.to_numeric(df['Age'], errors='coerce')
-        df['Age'] = df['Age'].apply(lambda x: None if x <= 0 else x)  # Convert negative or zero ages to None
-        
-        # Convert empty strings to None for consistency
-        for column in df.columns:
-            df[column] = df[column].replace('')
-    
-        return df
-    except Exception as e:
-        st.warning(f"Database connection failed: {str(e)}. Generating synthetic data instead.")
-        return generate_synthetic_data()  # Generate 100 records of synthetic data
+            refresher.refresh_now()
+    else:
+        refresher.refresh_in_background()
+    
+    # Treat the returned frame as read-only; it is shared by every rerun and session
+    frame, version, source = refresher.current()
+    if frame is None:
+        st.warning(f"Database connection failed: {str(refresher.last_error)}. Generating synthetic data instead.")
+        # One synthetic version per day, matching generate_synthetic_data's as_of
+        version = f"{SYNTHETIC_DATASET_VERSION}:{datetime.now().date().isoformat()}"
+        return get_dataset_cache().get_or_build(version, build_triage_dataset), version
+    if refresher.last_error is not None:
+        st.warning(f"Live data refresh failed: {str(refresher.last_error)}. Showing the last {source} dataset.")
+    return frame, version
+
+def value_count_label(index, column):
+    """Multiselect format_func that appends each value's row count"""
+    counts = index.counts(column)
+    return lambda value: f"{value} ({counts.get(value, 0):,})"
+
+@st.cache_resource
+def get_filter_result_cache():
+    """Byte-bounded LRU of filtered frames shared across reruns and sessions"""
+    return FilterResultCache()
+
+@st.cache_resource
+def get_triage_queue_cache():
+    """Triage queues keyed by dataset version; the frame is laid out in queue order"""
+    return VersionedFrameCache()
+
+@st.cache_resource
+def get_filter_index_cache():
+    """Bitmap and range filter indexes keyed by dataset version, built once per version"""
+    return VersionedFrameCache()
 
 # --- VA-Compliant Risk Scoring Logic ---
 def calculate_va_category_and_risk(row):
@@ -851,12 +957,12 @@ def calculate_va_category_and_risk(row):
     
     # EMERGENT: Imminent risk of suicide or harm to self or others
     if (row["C-SSRS Screen"] == 'Positive - Recent Behavior' or 
-        (row["C-SSRS Screen"] == 'Positive - Active Ideation' and row["PHQ-9 Q9 (Self-Harm)"] == "Yes")):
+        (row["C-SSRS Screen"] == 'Positive - Active Ideation' and is_yes(row["PHQ-9 Q9 (Self-Harm)"]))):
         return "Emergent", 6, "EMERGENT - Imminent risk of suicide or harm. Requires immediate crisis response."
     
     # URGENT: Same day evaluation or care needed
     if (row["C-SSRS Screen"] in ['Positive - Active Ideation', 'Positive - Passive Ideation'] or
-        row["PHQ-9 Q9 (Self-Harm)"] == "Yes" or
+        is_yes(row["PHQ-9 Q9 (Self-Harm)"]) or
         row["PHQ-9 Score"] >= 20 or 
         row["GAD-7 Score"] >= 15 or 
         row["PCL-5 Score"] >= 55):
@@ -875,7 +981,7 @@ def calculate_detailed_risk_score(row):
     if row["C-SSRS Screen"] == 'Positive - Active Ideation':
         return 5, "Critical - Ideation", "C-SSRS Positive: Active suicidal ideation with plan/intent. Requires urgent evaluation."
     
-    if row["PHQ-9 Q9 (Self-Harm)"] == "Yes":
+    if is_yes(row["PHQ-9 Q9 (Self-Harm)"]):
         score = 4
         explanation.append("PHQ-9 Q9 Positive (Self-Harm)")
     
@@ -942,7 +1048,117 @@ def handle_button_click(button_type, veteran_id=None, context=""):
     
     return response
 
+# --- Priority Case Lists ---
+# Only one page of cases gets action buttons, so widgets per rerun stay bounded on busy days
+PRIORITY_PAGE_SIZE = 10
+
+# (label, action, key prefix, help, message style) per button column
+EMERGENT_CASE_ACTIONS = [
+    ("📋 Review", "review", "review_top", "Open clinical review", "success"),
+    ("📞 Contact", "contact", "contact_top", "Prepare contact info", "success"),
+    ("🏥 Crisis", "crisis", "crisis_top", "Activate crisis protocol", "error"),
+    ("📅 Schedule", "schedule", "schedule_top", "Emergency scheduling", "info"),
+]
+URGENT_CASE_ACTIONS = [
+    ("📋 Review", "review", "review_urgent_top", "Open clinical review", "success"),
+    ("📞 Contact", "contact", "contact_urgent_top", "Prepare contact info", "success"),
+    ("⚠️ Urgent", "schedule", "urgent_top", "Same-day scheduling", "warning"),
+    ("📅 Schedule", "schedule", "schedule_urgent_top", "Same-day appointment", "info"),
+]
+
+def shift_priority_page(page_key, step):
+    """Move a priority list one page back or forward"""
+    st.session_state[page_key] = st.session_state.get(page_key, 1) + step
+
+def render_priority_cases(cases, list_name, actions):
+    """Render one page of a priority case list with its action buttons"""
+    page_key = f"{list_name}_cases_page"
+    start, stop, page, pages = page_bounds(len(cases), st.session_state.get(page_key, 1), PRIORITY_PAGE_SIZE)
+    st.session_state[page_key] = page
+
+    for _, veteran in cases.iloc[start:stop].iterrows():
+        columns = st.columns([3, 1, 1, 1, 1])
+        with columns[0]:
+            st.markdown(f"**{veteran['Name']}** ({veteran['Veteran ID']}) - {veteran['VA Category']}")
+        for column, (label, action, key_prefix, help_text, style) in zip(columns[1:], actions):
+            with column:
+                if st.button(label, key=f"{key_prefix}_{veteran['Veteran ID']}", help=help_text):
+                    response = handle_button_click(action, veteran['Veteran ID'])
+                    getattr(st, style)(response)
+
+    if pages > 1:
+        nav_prev, nav_label, nav_next = st.columns([1, 3, 1])
+        with nav_prev:
+            st.button("◀ Previous", key=f"{list_name}_cases_prev", disabled=page == 1,
+                      on_click=shift_priority_page, args=(page_key, -1))
+        with nav_label:
+            st.caption(f"Showing {start + 1}–{stop} of {len(cases)} cases · page {page} of {pages}")
+        with nav_next:
+            st.button("Next ▶", key=f"{list_name}_cases_next", disabled=page == pages,
+                      on_click=shift_priority_page, args=(page_key, 1))
+
 # --- Enhanced Calendar Functions ---
+def shift_calendar_month(step):
+    """Move the calendar view one month back or forward"""
+    current = st.session_state.calendar_view
+    month_index = current.year * 12 + current.month - 1 + step
+    st.session_state.calendar_view = datetime(month_index // 12, month_index % 12 + 1, 1)
+
+def close_calendar_day(picker_key):
+    """Hide the selected day's appointment details"""
+    st.session_state.selected_calendar_day = None
+    st.session_state[picker_key] = None
+
+def render_calendar_day(appointments, date_obj, selected):
+    """HTML for one calendar cell, from the store's per-day counters"""
+    day = date_obj.day
+    outline = ' style="outline: 2px solid #1f2937;"' if selected else ''
+    if date_obj.weekday() in [5, 6]:
+        # Weekend - no appointments, different styling
+        return (f'<div class="calendar-day calendar-weekend"{outline}><div class="calendar-day-number">{day}</div>'
+                f'<div class="calendar-appointment-info">No Appointments</div></div>')
+    
+    counts = appointments.day_counts(date_obj)
+    available_count, reserved_count, cancelled_count = counts['available'], counts['reserved'], counts['cancelled']
+    if available_count + reserved_count + cancelled_count == 0:
+        return f'<div class="calendar-day"{outline}><div class="calendar-day-number">{day}</div></div>'
+    
+    # Colour the day by its most common status
+    max_count = max(reserved_count, available_count, cancelled_count)
+    if reserved_count == max_count:
+        day_class = "appointment-reserved"
+    elif available_count == max_count:
+        day_class = "appointment-available"
+    else:
+        day_class = "appointment-cancelled"
+    
+    appointment_lines = []
+    for count, color, icon in ((reserved_count, "#2563eb", "🔵"), (available_count, "#16a34a", "🟢"),
+                               (cancelled_count, "#dc2626", "🔴"), (counts['Face-to-Face'], "#8b5cf6", "🏥"),
+                               (counts['Video Call'], "#06b6d4", "💻")):
+        if count > 0:
+            appointment_lines.append(f'<div class="calendar-appointment-line" style="color: {color};">{icon} {count}</div>')
+    
+    # Limit to max 4 lines to prevent overflow
+    if len(appointment_lines) > 4:
+        appointment_lines = appointment_lines[:3]
+        appointment_lines.append('<div class="calendar-appointment-line" style="color: #6b7280;">...</div>')
+    
+    return (f'<div class="calendar-day {day_class}"{outline}><div class="calendar-day-number">{day}</div>'
+            f'<div class="calendar-appointment-info">{"".join(appointment_lines)}</div></div>')
+
+def render_calendar_grid(appointments, year, month, selected_day=None):
+    """One HTML/CSS grid for a whole month, weekday header included"""
+    cells = [f'<div class="calendar-weekday{" calendar-weekend-label" if day in ("Sat", "Sun") else ""}">{day}</div>'
+             for day in ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']]
+    for week in calendar.monthcalendar(year, month):
+        for day in week:
+            if day == 0:
+                cells.append('<div class="calendar-day calendar-day-empty"></div>')
+            else:
+                cells.append(render_calendar_day(appointments, datetime(year, month, day).date(), day == selected_day))
+    return f'<div class="calendar-grid">{"".join(cells)}</div>'
+
 def create_calendar_view(appointments, year, month):
     """Create an improved calendar view for appointments with better text handling"""
     cal = calendar.monthcalendar(year, month)
@@ -953,143 +1169,34 @@ def create_calendar_view(appointments, year, month):
     # Calendar navigation
     col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
-        if st.button("◀ Previous", key="prev_month"):
-            if month == 1:
-                st.session_state.calendar_view = datetime(year - 1, 12, 1)
-            else:
-                st.session_state.calendar_view = datetime(year, month - 1, 1)
-            st.rerun()
+        # Callbacks update the month before the calendar fragment reruns, so no full rerun is needed
+        st.button("◀ Previous", key="prev_month", on_click=shift_calendar_month, args=(-1,))
     
     with col2:
         st.markdown(f"<div style='text-align: center; font-size: 1.2rem; font-weight: 600;'>{month_name} {year}</div>", unsafe_allow_html=True)
     
     with col3:
-        if st.button("Next ▶", key="next_month"):
-            if month == 12:
-                st.session_state.calendar_view = datetime(year + 1, 1, 1)
-            else:
-                st.session_state.calendar_view = datetime(year, month + 1, 1)
-            st.rerun()
-    
-    # Calendar header with weekend colors
-    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    cols = st.columns(7)
-    for i, day in enumerate(days):
-        with cols[i]:
-            # Color weekends (Sat, Sun) in red
-            if day in ['Sat', 'Sun']:
-                color = '#dc2626'  # Red color for weekends
-            else:
-                color = COLORS['neutral_charcoal']  # Normal color for weekdays
-                
-            st.markdown(f"<div style='text-align: center; font-weight: 600; padding: 0.5rem; border-bottom: 2px solid {COLORS['neutral_light_gray']}; color: {color};'>{day}</div>", unsafe_allow_html=True)
-    
-    # Calendar body
-    for week in cal:
-        cols = st.columns(7)
-        for i, day in enumerate(week):
-            with cols[i]:
-                if day == 0:
-                    # Empty day - no content
-                    st.markdown('<div style="height: 90px;"></div>', unsafe_allow_html=True)
-                else:
-                    date_obj = datetime(year, month, day).date()
-                    weekday = date_obj.weekday()  # Monday = 0, Sunday = 6
-                    
-                    # Check if it's weekend (Saturday = 5, Sunday = 6)
-                    is_weekend = weekday in [5, 6]
-                    
-                    if is_weekend:
-                        # Weekend - no appointments, different styling
-                        day_html = f"""
-                        <div class="calendar-day" style="background-color: #f8f9fa; border-color: #dc2626; min-height: 90px; max-height: 90px;">
-                            <div class="calendar-day-number" style="color: #dc2626;">{day}</div>
-                            <div class="calendar-appointment-info" style="color: #6b7280; font-size: 0.6rem;">No Appointments</div>
-                        </div>
-                        """
-                        st.markdown(day_html, unsafe_allow_html=True)
-                    else:
-                        # Weekday - normal appointment logic
-                        day_appointments = [apt for apt in appointments if apt['date'] == date_obj]
-                        
-                        # Count appointments by status
-                        available_count = len([apt for apt in day_appointments if apt['status'] == 'available'])
-                        reserved_count = len([apt for apt in day_appointments if apt['status'] == 'reserved'])
-                        cancelled_count = len([apt for apt in day_appointments if apt['status'] == 'cancelled'])
-                        
-                        # Count by mode
-                        face_to_face_count = len([apt for apt in day_appointments if apt['mode'] == 'Face-to-Face'])
-                        video_count = len([apt for apt in day_appointments if apt['mode'] == 'Video Call'])
-                        
-                        # Check if there are any appointments at all
-                        total_appointments = available_count + reserved_count + cancelled_count
-                        
-                        if total_appointments == 0:
-                            # No appointments - show clean empty day
-                            day_html = f"""
-                            <div class="calendar-day" style="min-height: 90px; max-height: 90px;">
-                                <div class="calendar-day-number">{day}</div>
-                            </div>
-                            """
-                            st.markdown(day_html, unsafe_allow_html=True)
-                        else:
-                            # Has appointments - show with appointment info
-                            # Determine day style based on HIGHEST COUNT
-                            day_classes = ["calendar-day"]
-                            
-                            # Find which appointment type has the highest count
-                            max_count = max(reserved_count, available_count, cancelled_count)
-                            
-                            if reserved_count == max_count:
-                                day_classes.append("appointment-reserved")
-                            elif available_count == max_count:
-                                day_classes.append("appointment-available")
-                            elif cancelled_count == max_count:
-                                day_classes.append("appointment-cancelled")
-                            
-                            # Build appointment info with better formatting
-                            appointment_lines = []
-                            
-                            # Status lines (prioritize most important)
-                            if reserved_count > 0:
-                                appointment_lines.append(f'<div class="calendar-appointment-line" style="color: #2563eb;">🔵 {reserved_count}</div>')
-                            if available_count > 0:
-                                appointment_lines.append(f'<div class="calendar-appointment-line" style="color: #16a34a;">🟢 {available_count}</div>')
-                            if cancelled_count > 0:
-                                appointment_lines.append(f'<div class="calendar-appointment-line" style="color: #dc2626;">🔴 {cancelled_count}</div>')
-                            
-                            # Mode lines (only if there are appointments)
-                            if face_to_face_count > 0:
-                                appointment_lines.append(f'<div class="calendar-appointment-line" style="color: #8b5cf6;">🏥 {face_to_face_count}</div>')
-                            if video_count > 0:
-                                appointment_lines.append(f'<div class="calendar-appointment-line" style="color: #06b6d4;">💻 {video_count}</div>')
-                            
-                            # Limit to max 4 lines to prevent overflow
-                            if len(appointment_lines) > 4:
-                                appointment_lines = appointment_lines[:3]
-                                appointment_lines.append('<div class="calendar-appointment-line" style="color: #6b7280;">...</div>')
-                            
-                            appointment_info = ''.join(appointment_lines)
-                            
-                            day_html = f"""
-                            <div class="{' '.join(day_classes)}" style="min-height: 90px; max-height: 90px;">
-                                <div class="calendar-day-number">{day}</div>
-                                <div class="calendar-appointment-info">
-                                    {appointment_info}
-                                </div>
-                            </div>
-                            """
-                            st.markdown(day_html, unsafe_allow_html=True)
-                            
-                            # Day details button only for weekdays with appointments
-                            if st.button(f"View", key=f"view_day_{day}", help=f"View appointments for {month_name} {day}"):
-                                st.session_state.selected_calendar_day = day
+        st.button("Next ▶", key="next_month", on_click=shift_calendar_month, args=(1,))
+    
+    # The whole month is one HTML grid element; day selection is a single picker below it
+    busy_days = [day for week in cal for day in week[:5] if day and appointments.count_on(datetime(year, month, day).date())]
+    picker_key = f"calendar_day_picker_{year}_{month}"
+    if st.session_state.get(picker_key) not in busy_days:
+        st.session_state[picker_key] = None
+    st.markdown(render_calendar_grid(appointments, year, month, st.session_state[picker_key]), unsafe_allow_html=True)
+    
+    st.session_state.selected_calendar_day = st.selectbox(
+        "View appointments for",
+        [None] + busy_days,
+        format_func=lambda day: "Select a day..." if day is None else f"{calendar.day_abbr[calendar.weekday(year, month, day)]} {month_name} {day}",
+        key=picker_key,
+    )
     
     # Show selected day details
     if st.session_state.selected_calendar_day:
         selected_day = st.session_state.selected_calendar_day
         date_obj = datetime(year, month, selected_day).date()
-        day_appointments = [apt for apt in appointments if apt['date'] == date_obj]
+        day_appointments = appointments.on(date_obj)
         
         if day_appointments:
             st.markdown(f"""
@@ -1098,7 +1205,7 @@ def create_calendar_view(appointments, year, month):
             </div>
             """, unsafe_allow_html=True)
             
-            for apt in sorted(day_appointments, key=lambda x: x['time']):
+            for apt in day_appointments:
                 status_colors = {"available": "#16a34a", "reserved": "#2563eb", "cancelled": "#dc2626"}
                 status_icons = {"available": "🟢", "reserved": "🔵", "cancelled": "🔴"}
                 mode_icons = {"Face-to-Face": "🏥", "Video Call": "💻"}
@@ -1124,14 +1231,13 @@ def create_calendar_view(appointments, year, month):
                     </div>
                     """, unsafe_allow_html=True)
             
-            if st.button("Close Details", key="close_day_details"):
-                st.session_state.selected_calendar_day = None
-                st.rerun()
+            st.button("Close Details", key="close_day_details", on_click=close_calendar_day, args=(picker_key,))
                 
 # --- Enhanced Visualization Functions ---
 def create_va_category_chart(df):
     """Create VA Category distribution chart"""
     category_counts = df['VA Category'].value_counts()
+    category_counts = category_counts[category_counts > 0]  # Categoricals also count unobserved values
     
     color_map = {
         'Emergent': '#dc2626',
@@ -1174,6 +1280,7 @@ def create_va_category_chart(df):
 def create_treatment_preference_chart(df):
     """Create treatment preference distribution chart"""
     treatment_counts = df['Treatment Preference'].value_counts()
+    treatment_counts = treatment_counts[treatment_counts > 0]  # Categoricals also count unobserved values
     
     color_map = {
         'Therapy': COLORS['primary_teal'],
@@ -1213,8 +1320,8 @@ def create_treatment_preference_chart(df):
 
 def create_intake_timeline(df):
     """Create intake timeline chart"""
-    df['Intake Date'] = pd.to_datetime(df['Intake Date'])
-    daily_intakes = df.groupby(df['Intake Date'].dt.date).size().reset_index()
+    intake_dates = pd.to_datetime(df['Intake Date'])  # Already datetime64 after apply_veteran_schema()
+    daily_intakes = df.groupby(intake_dates.dt.date).size().reset_index()
     daily_intakes.columns = ['Date', 'Count']
     
     fig = px.line(
@@ -1255,17 +1362,20 @@ def create_intake_timeline(df):
 # --- Enhanced UI Styling Functions ---
 def style_veterans_table(df):
     """Style the veterans table based on VA categories"""
-    def highlight_row(row):
-        category = row['VA Category']
-        if category == 'Emergent':
-            return ['background-color: rgba(220, 38, 38, 0.1); color: #7f1d1d'] * len(row)
-        elif category == 'Urgent':
-            return ['background-color: rgba(245, 158, 11, 0.1); color: #78350f'] * len(row)
-        elif category == 'Routine':
-            return ['background-color: rgba(119, 221, 119, 0.1); color: #166534'] * len(row)
-        else:
-            return [''] * len(row)
-    return df.style.apply(highlight_row, axis=1)
+    # Small pages keep the coloured rows; larger ones skip the Styler (see table_styles.py)
+    if use_styler(df):
+        return style_table(df), None
+    return badge_table(df), veterans_column_config(df)
+
+def veterans_column_config(df):
+    """Column formatting for the Styler-free table"""
+    config = {'VA Category': st.column_config.TextColumn('VA Category', help="🔴 Emergent · 🟠 Urgent · 🟢 Routine")}
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            config[column] = st.column_config.DateColumn(column, format="YYYY-MM-DD")
+        elif column.endswith('Score') and pd.api.types.is_numeric_dtype(df[column]):
+            config[column] = st.column_config.NumberColumn(column, format="%d")
+    return config
 
 # --- Reset Filters Function ---
 def reset_all_filters():
@@ -1316,142 +1426,94 @@ DETAILED DATA FOLLOWS BELOW:
     csv_data = df_filtered.to_csv(index=False)
     return report + "\n" + csv_data
 
-# --- Main Application ---
-def main():
-    initialize_session_state()
-    load_enhanced_css()
-    
-    # Generate consistent dataset
-    df = pull_data_from_database()
-    
-    # Apply VA category and risk scoring
-    va_info = df.apply(calculate_va_category_and_risk, axis=1, result_type='expand')
-    df[['VA Category', 'VA Risk Score', 'VA Explanation']] = va_info
-    
-    risk_info = df.apply(calculate_detailed_risk_score, axis=1, result_type='expand')
-    df[['Risk Score', 'Risk Level', 'Risk Explanation']] = risk_info
-    
-    # Sort by VA Category priority, then by Risk Score
-    category_order = {'Emergent': 3, 'Urgent': 2, 'Routine': 1}
-    df['Category Order'] = df['VA Category'].map(category_order)
-    df = df.sort_values(by=['Category Order', 'Risk Score'], ascending=[False, False]).reset_index(drop=True)
-    df = df.drop('Category Order', axis=1)
-
-    # --- Header ---
-    st.title("🏥 TriageView: Veteran Mental Health Dashboard")
-    st.markdown("*Advanced AI-powered clinical decision support for veteran mental health triage*")
+# --- Dashboard Sections ---
+# Each section is a fragment: clicks inside one rerun that section alone, not ingest,
+# scoring, filtering and the charts. Sections receive the data from the last full run.
 
-    # Enhanced alert for emergent cases
-    emergent_cases = len(df[df['VA Category'] == 'Emergent'])
-    urgent_cases = len(df[df['VA Category'] == 'Urgent'])
-    
-    if emergent_cases > 0:
-        st.markdown(f"""
-        <div class="priority-alert">
-        🚨 EMERGENT ALERT: {emergent_cases} veteran(s) at imminent risk require immediate crisis intervention
-        </div>
-        """, unsafe_allow_html=True)
-    elif urgent_cases > 0:
-        st.warning(f"⚠️ URGENT: {urgent_cases} veteran(s) require same-day evaluation")
+AI_BATCH_WORKERS = 4
+AI_BATCH_REQUESTS_PER_MINUTE = 30  # Client-side cap so a batch stays inside the Gemini quota
 
-    # --- PRIORITY CASES SECTION - RIGHT AFTER ALERT ---
-    emergent_in_view = df[df['VA Category'] == 'Emergent']
-    urgent_in_view = df[df['VA Category'] == 'Urgent']
-    
+@fragment
+def priority_cases_section(emergent_in_view, urgent_in_view):
+    """Emergent and Urgent case lists; their buttons rerun only this section"""
     if not emergent_in_view.empty:
         st.header("🚨 Emergent Cases - Immediate Action Required")
-        # Show ALL emergent cases, not just first 5
-        for _, veteran in emergent_in_view.iterrows():
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-            with col1:
-                st.markdown(f"**{veteran['Name']}** ({veteran['Veteran ID']}) - {veteran['VA Category']}")
-            with col2:
-                if st.button("📋 Review", key=f"review_top_{veteran['Veteran ID']}", help="Open clinical review"):
-                    response = handle_button_click("review", veteran['Veteran ID'])
-                    st.success(response)
-            with col3:
-                if st.button("📞 Contact", key=f"contact_top_{veteran['Veteran ID']}", help="Prepare contact info"):
-                    response = handle_button_click("contact", veteran['Veteran ID'])
-                    st.success(response)
-            with col4:
-                if st.button("🏥 Crisis", key=f"crisis_top_{veteran['Veteran ID']}", help="Activate crisis protocol"):
-                    response = handle_button_click("crisis", veteran['Veteran ID'])
-                    st.error(response)
-            with col5:
-                if st.button("📅 Schedule", key=f"schedule_top_{veteran['Veteran ID']}", help="Emergency scheduling"):
-                    response = handle_button_click("schedule", veteran['Veteran ID'])
-                    st.info(response)
+        render_priority_cases(emergent_in_view, "emergent", EMERGENT_CASE_ACTIONS)
     
     if not urgent_in_view.empty:
         st.header("⚠️ Urgent Cases - Same Day Evaluation Required")
-        # Show ALL urgent cases, not just first 3
-        for _, veteran in urgent_in_view.iterrows():
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-            with col1:
-                st.markdown(f"**{veteran['Name']}** ({veteran['Veteran ID']}) - {veteran['VA Category']}")
-            with col2:
-                if st.button("📋 Review", key=f"review_urgent_top_{veteran['Veteran ID']}", help="Open clinical review"):
-                    response = handle_button_click("review", veteran['Veteran ID'])
-                    st.success(response)
-            with col3:
-                if st.button("📞 Contact", key=f"contact_urgent_top_{veteran['Veteran ID']}", help="Prepare contact info"):
-                    response = handle_button_click("contact", veteran['Veteran ID'])
-                    st.success(response)
-            with col4:
-                if st.button("⚠️ Urgent", key=f"urgent_top_{veteran['Veteran ID']}", help="Same-day scheduling"):
-                    response = handle_button_click("schedule", veteran['Veteran ID'])
-                    st.warning(response)
-            with col5:
-                if st.button("📅 Schedule", key=f"schedule_urgent_top_{veteran['Veteran ID']}", help="Same-day appointment"):
-                    response = handle_button_click("schedule", veteran['Veteran ID'])
-                    st.info(response)
-    
-    # if not urgent_in_view.empty:
-    #     st.header("⚠️ Urgent Cases - Same Day Evaluation Required")
-    #     for _, veteran in urgent_in_view.head(3).iterrows():
-    #         col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-    #         with col1:
-    #             st.markdown(f"**{veteran['Name']}** ({veteran['Veteran ID']}) - {veteran['VA Category']}")
-    #         with col2:
-    #             if st.button("📋 Review", key=f"review_urgent_{veteran['Veteran ID']}", help="Open clinical review"):
-    #                 response = handle_button_click("review", veteran['Veteran ID'])
-    #                 st.success(response)
-    #         with col3:
-    #             if st.button("📞 Contact", key=f"contact_urgent_{veteran['Veteran ID']}", help="Prepare contact info"):
-    #                 response = handle_button_click("contact", veteran['Veteran ID'])
-    #                 st.success(response)
-    #         with col4:
-    #             if st.button("⚠️ Urgent", key=f"urgent_{veteran['Veteran ID']}", help="Same-day scheduling"):
-    #                 response = handle_button_click("schedule", veteran['Veteran ID'])
-    #                 st.warning(response)
-    #         with col5:
-    #             if st.button("📅 Schedule", key=f"schedule_urgent_{veteran['Veteran ID']}", help="Same-day appointment"):
-    #                 response = handle_button_click("schedule", veteran['Veteran ID'])
-    #                 st.info(response)
+        render_priority_cases(urgent_in_view, "urgent", URGENT_CASE_ACTIONS)
+    
+    if not emergent_in_view.empty or not urgent_in_view.empty:
+        render_batch_assessments(pd.concat([emergent_in_view, urgent_in_view]))
+
+def render_batch_assessments(priority_cases):
+    """Button that pre-assesses every Emergent/Urgent veteran without a stored AI assessment"""
+    summaries = st.session_state.ai_summaries
+    # Only IDs and positions here: rows are taken inside the workers, once the button is pressed
+    assessed = {veteran_id for veteran_id, summary in summaries.items() if not ai_failed(summary)}
+    pending = [
+        (veteran_id, position)
+        for position, veteran_id in enumerate(priority_cases['Veteran ID'])
+        if veteran_id not in assessed
+    ]
+    status = st.empty()
+    status.caption(f"🧠 AI assessments ready for {len(priority_cases) - len(pending)} of {len(priority_cases)} Emergent/Urgent veterans")
+    if not pending or not st.button(f"🧠 Pre-assess {len(pending)} Emergent/Urgent Veterans", key="batch_ai_assessments"):
+        return
+    
+    progress = st.progress(0.0, text="Starting AI assessments...")
+    failures = 0
+    # Workers share this run's context so cached resources (Gemini client, prompt cache) resolve without warnings
+    script_ctx = get_script_run_ctx()
+
+    def attach_ctx():
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+
+    def assess(position):
+        return request_gemini(ai_summary_prompt(priority_cases.iloc[[position]], "individual_patient"), AI_SUMMARY_MODEL)
+
+    # Assessments run concurrently under a client-side rate limit; each lands in session state as it completes.
+    # request_gemini raises on failure, so failed calls arrive as outcome.error and are retried on the next run
+    for outcome in iter_batch(pending, assess, AI_BATCH_WORKERS, AI_BATCH_REQUESTS_PER_MINUTE, initializer=attach_ctx):
+        summary = outcome.result if outcome.error is None else AIFailure(f"Error generating AI summary: {outcome.error}")
+        summaries[outcome.key] = summary
+        if ai_failed(summary):
+            failures += 1
+        progress.progress(outcome.done / outcome.total,
+                          text=f"Assessed {outcome.done} of {outcome.total} veterans ({outcome.elapsed:.1f}s)")
+    progress.empty()
+    status.caption(f"🧠 AI assessments ready for {len(priority_cases) - failures} of {len(priority_cases)} Emergent/Urgent veterans")
+    if failures:
+        st.error(f"❌ {failures} of {len(pending)} AI assessments failed; run again to retry them")
+    else:
+        st.success(f"✅ {len(pending)} AI assessments generated")
 
-    # --- AI Summary Section ---
+@fragment
+def ai_overview_section(df):
+    """AI summary and question box for all patients"""
     st.header("🤖 AI Clinical Overview")
     col1, col2 = st.columns([3, 1])
     
     with col1:
         if st.button("🧠 Generate AI Summary for All Patients", key="generate_summary", type="primary"):
-            with st.spinner("🤖 Generating AI clinical summary for all patients..."):
-                summary = generate_ai_summary(df, "all_patients")
-                st.session_state.ai_summaries['all_patients'] = summary
-                
-                if "Error" not in summary and "API Error" not in summary:
-                    st.success("✅ AI Summary Generated Successfully")
-                else:
-                    st.error("❌ AI Summary Generation Failed")
+            # Text renders as it streams in; the saved summary is shown below once complete
+            placeholder = st.empty()
+            placeholder.caption("🤖 Generating AI clinical summary for all patients...")
+            summary = stream_ai_response(
+                generate_ai_summary(df, "all_patients", stream=True), placeholder,
+                lambda text: st.markdown(all_patients_summary_html(text), unsafe_allow_html=True),
+            )
+            st.session_state.ai_summaries['all_patients'] = summary
+            
+            if not ai_failed(summary):
+                st.success("✅ AI Summary Generated Successfully")
+            else:
+                st.error("❌ AI Summary Generation Failed")
         
         if 'all_patients' in st.session_state.ai_summaries:
             summary_text = st.session_state.ai_summaries['all_patients']
-            st.markdown(f"""
-            <div class="ai-summary-all-patients">
-            <h4>🎯 AI Clinical Insights - All Patients</h4>
-            <p>{summary_text}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(all_patients_summary_html(summary_text), unsafe_allow_html=True)
     
     with col2:
         st.subheader("💬 Ask AI About All Patients")
@@ -1476,241 +1538,69 @@ def main():
                 - Average GAD-7: {df['GAD-7 Score'].mean():.1f}
                 - Treatment Preferences - Therapy: {len(df[df['Treatment Preference'] == 'Therapy'])}, Medication: {len(df[df['Treatment Preference'] == 'Medication'])}, Both: {len(df[df['Treatment Preference'] == 'Both'])}
                 """
-                answer = ask_ai_question(question, context)
+                response_header = st.empty()
+                placeholder = st.empty()
+                answer = stream_ai_response(ask_ai_question(question, context, stream=True), placeholder, st.info)
                 
-                if "Error" not in answer and "API Error" not in answer:
-                    st.success("🤖 AI Response:")
+                if not ai_failed(answer):
+                    response_header.success("🤖 AI Response:")
                     st.info(answer)
                 else:
                     st.error("❌ AI service unavailable. Please try again.")
 
-    # --- Enhanced Sidebar Filters ---
-    st.sidebar.header("🔍 Advanced Filtering")
-    
-    if st.sidebar.button("🔄 Reset All Filters", key=f"reset_button_{st.session_state.filter_reset_counter}"):
-        reset_all_filters()
-        st.sidebar.success("✅ Filters Reset!")
-        st.rerun()
-    
-    # Get unique values for filters
-    va_categories = sorted(df["VA Category"].unique(), key=lambda x: ['Emergent', 'Urgent', 'Routine'].index(x))
-    c_ssrs_unique = sorted(df["C-SSRS Screen"].unique())
-    risk_level_unique = sorted(df["Risk Level"].unique(), key=lambda x: (
-        0 if "Critical" in x else 1 if "High" in x else 2 if "Medium" in x else 3
-    ))
-    
-    # Default values
-    defaults = {
-        'va_category': va_categories,
-        'c_ssrs': c_ssrs_unique,
-        'risk_level': risk_level_unique,
-        'gender': sorted(df["Gender"].unique()),
-        'branch': sorted(df["Branch"].unique()),
-        'clinician': sorted(df["Assigned Clinician"].unique()),
-        'treatment_preference': sorted(df["Treatment Preference"].unique())
-    }
+@fragment
+def calendar_section():
+    """Appointment calendar with its legend and monthly statistics"""
+    st.header("📅 Appointment Calendar")
     
-    # Enhanced filters
-    va_category_filter = st.sidebar.multiselect(
-        "VA Triage Category", va_categories, defaults['va_category'],
-        key=f"va_category_filter_{st.session_state.filter_reset_counter}",
-        help="Official VA triage categories: Emergent (imminent risk), Urgent (same day eval), Routine (timely care)"
-    )
+    col1, col2 = st.columns([2, 1])
     
-    c_ssrs_filter = st.sidebar.multiselect(
-        "C-SSRS Status", c_ssrs_unique, defaults['c_ssrs'],
-        key=f"c_ssrs_filter_{st.session_state.filter_reset_counter}"
-    )
+    with col1:
+        current_date = st.session_state.calendar_view
+        create_calendar_view(st.session_state.appointments, current_date.year, current_date.month)
     
-    risk_level_filter = st.sidebar.multiselect(
-        "Risk Level", risk_level_unique, defaults['risk_level'],
-        key=f"risk_level_filter_{st.session_state.filter_reset_counter}"
-    )
+    with col2:
+        st.subheader("📊 Calendar Legend")
+        st.markdown("""
+        <div style="padding: 1rem; background: white; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+        <div style="margin-bottom: 0.5rem;"><span style="color: #77dd77;">🟢</span> Available slots</div>
+        <div style="margin-bottom: 0.5rem;"><span style="color: #5B9BD3;">🔵</span> Reserved appointments</div>
+        <div style="margin-bottom: 0.5rem;"><span style="color: #FF7F50;">🔴</span> Cancelled appointments</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.subheader("📈 Calendar Statistics")
+        current_date = st.session_state.calendar_view
+        month_counts = st.session_state.appointments.month_counts(current_date.year, current_date.month)
+        
+        available_total = month_counts['available']
+        reserved_total = month_counts['reserved']
+        cancelled_total = month_counts['cancelled']
+        
+        st.metric("Available Slots", available_total)
+        st.metric("Reserved Appointments", reserved_total)
+        st.metric("Cancelled Slots", cancelled_total)
+
+@fragment
+def triage_queue_section(df_filtered, dataset_version, filter_state):
+    """Paged Triage Queue table with its view, sort and export controls"""
+    # Get the display data first to calculate correct count
+    show_priority_only = False
+    show_routine_only = False
     
-    # New Treatment Preference Filter
-    treatment_preference_filter = st.sidebar.multiselect(
-        "Treatment Preference", sorted(df["Treatment Preference"].unique()), defaults['treatment_preference'],
-        key=f"treatment_preference_filter_{st.session_state.filter_reset_counter}",
-        help="Filter by veteran's preferred treatment modality"
-    )
+    # Controls
+    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
+    with col1:
+        st.markdown("*Veterans prioritized by VA categories and AI risk assessment. Click actions for immediate response.*")
     
-    gender_filter = st.sidebar.multiselect(
-        "Gender", sorted(df["Gender"].unique()), defaults['gender'],
-        key=f"gender_filter_{st.session_state.filter_reset_counter}"
-    )
+    with col2:
+        show_priority_only = st.checkbox("Emergent/Urgent Only", value=False)
     
-    clinician_filter = st.sidebar.multiselect(
-        "Assigned Clinician", sorted(df["Assigned Clinician"].unique()), defaults['clinician'],
-        key=f"clinician_filter_{st.session_state.filter_reset_counter}"
-    )
+    with col3:
+        show_routine_only = st.checkbox("Routine Only", value=False)
     
-    # Score sliders
-    phq9_slider = st.sidebar.slider(
-        "PHQ-9 Depression Score", 0, 27, (0, 27),
-        key=f"phq9_slider_{st.session_state.filter_reset_counter}"
-    )
-    
-    gad7_slider = st.sidebar.slider(
-        "GAD-7 Anxiety Score", 0, 21, (0, 21),
-        key=f"gad7_slider_{st.session_state.filter_reset_counter}"
-    )
-
-    # --- Apply Filters ---
-    df_filtered = df.copy()
-    
-    if va_category_filter:
-        df_filtered = df_filtered[df_filtered["VA Category"].isin(va_category_filter)]
-    if c_ssrs_filter:
-        df_filtered = df_filtered[df_filtered["C-SSRS Screen"].isin(c_ssrs_filter)]
-    if risk_level_filter:
-        df_filtered = df_filtered[df_filtered["Risk Level"].isin(risk_level_filter)]
-    if treatment_preference_filter:
-        df_filtered = df_filtered[df_filtered["Treatment Preference"].isin(treatment_preference_filter)]
-    if gender_filter:
-        df_filtered = df_filtered[df_filtered["Gender"].isin(gender_filter)]
-    if clinician_filter:
-        df_filtered = df_filtered[df_filtered["Assigned Clinician"].isin(clinician_filter)]
-    
-    df_filtered = df_filtered[
-        (df_filtered["PHQ-9 Score"] >= phq9_slider[0]) & 
-        (df_filtered["PHQ-9 Score"] <= phq9_slider[1]) &
-        (df_filtered["GAD-7 Score"] >= gad7_slider[0]) & 
-        (df_filtered["GAD-7 Score"] <= gad7_slider[1])
-    ]
-
-    # --- Analytics Overview ---
-    st.header("📊 Analytics Overview")
-    
-    col1, col2, col3 = st.columns([1, 1, 1], gap="medium")
-    
-    with col1:
-        if not df_filtered.empty:
-            fig1 = create_va_category_chart(df_filtered)
-            st.plotly_chart(fig1, use_container_width=True, config={'displayModeBar': False})
-        else:
-            st.info("No data available for VA category chart.")
-    
-    with col2:
-        if not df_filtered.empty:
-            fig2 = create_treatment_preference_chart(df_filtered)
-            st.plotly_chart(fig2, use_container_width=True, config={'displayModeBar': False})
-        else:
-            st.info("No data available for treatment preference chart.")
-    
-    with col3:
-        if not df_filtered.empty:
-            fig3 = create_intake_timeline(df_filtered)
-            st.plotly_chart(fig3, use_container_width=True, config={'displayModeBar': False})
-        else:
-            st.info("No data available for intake timeline.")
-
-    # --- Key Metrics Dashboard ---
-    st.header("📈 VA Triage Overview")
-    
-    col1, col2, col3, col4, col5, col6 = st.columns(6, gap="small")
-    
-    with col1:
-        emergent_count = len(df_filtered[df_filtered['VA Category'] == 'Emergent'])
-        st.metric("🚨 Emergent", emergent_count, help="Veterans at imminent risk requiring immediate crisis intervention")
-    
-    with col2:
-        urgent_count = len(df_filtered[df_filtered['VA Category'] == 'Urgent'])
-        st.metric("⚠️ Urgent", urgent_count, help="Veterans requiring same-day evaluation or care")
-    
-    with col3:
-        routine_count = len(df_filtered[df_filtered['VA Category'] == 'Routine'])
-        st.metric("📋 Routine", routine_count, help="Veterans needing timely care but not at imminent risk")
-    
-    with col4:
-        therapy_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Therapy'])
-        st.metric("🗣️ Therapy", therapy_count, help="Veterans preferring therapy-only treatment")
-    
-    with col5:
-        medication_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Medication'])
-        st.metric("💊 Medication", medication_count, help="Veterans preferring medication-only treatment")
-    
-    with col6:
-        both_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Both'])
-        st.metric("🔄 Both", both_count, help="Veterans preferring both therapy and medication")
-
-    # Additional clinical metrics
-    if not df_filtered.empty:
-        st.subheader("🔍 Risk Factor Analysis")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            homeless_count = len(df_filtered[df_filtered['Housing Status'] == 'Homeless'])
-            homeless_pct = (homeless_count / len(df_filtered)) * 100
-            st.metric("🏠 Housing Risk", f"{homeless_count} ({homeless_pct:.1f}%)",
-                     help="Veterans experiencing homelessness")
-        
-        with col2:
-            high_substance = len(df_filtered[df_filtered['Substance Use Risk'] == 'High'])
-            substance_pct = (high_substance / len(df_filtered)) * 100
-            st.metric("🍺 Substance Risk", f"{high_substance} ({substance_pct:.1f}%)",
-                     help="Veterans with high substance use risk")
-        
-        with col3:
-            low_support = len(df_filtered[df_filtered['Social Support'] == 'Low'])
-            support_pct = (low_support / len(df_filtered)) * 100
-            st.metric("👥 Social Risk", f"{low_support} ({support_pct:.1f}%)",
-                     help="Veterans with limited social support")
-        
-        with col4:
-            avg_phq9 = df_filtered['PHQ-9 Score'].mean()
-            st.metric("📊 Avg PHQ-9", f"{avg_phq9:.1f}",
-                     help="Average depression severity score")
-
-    # --- Appointment Calendar ---
-    st.header("📅 Appointment Calendar")
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        current_date = st.session_state.calendar_view
-        create_calendar_view(st.session_state.appointments, current_date.year, current_date.month)
-    
-    with col2:
-        st.subheader("📊 Calendar Legend")
-        st.markdown("""
-        <div style="padding: 1rem; background: white; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-        <div style="margin-bottom: 0.5rem;"><span style="color: #77dd77;">🟢</span> Available slots</div>
-        <div style="margin-bottom: 0.5rem;"><span style="color: #5B9BD3;">🔵</span> Reserved appointments</div>
-        <div style="margin-bottom: 0.5rem;"><span style="color: #FF7F50;">🔴</span> Cancelled appointments</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.subheader("📈 Calendar Statistics")
-        current_date = st.session_state.calendar_view
-        month_appointments = [apt for apt in st.session_state.appointments 
-                            if apt['date'].month == current_date.month and apt['date'].year == current_date.year]
-        
-        available_total = len([apt for apt in month_appointments if apt['status'] == 'available'])
-        reserved_total = len([apt for apt in month_appointments if apt['status'] == 'reserved'])
-        cancelled_total = len([apt for apt in month_appointments if apt['status'] == 'cancelled'])
-        
-        st.metric("Available Slots", available_total)
-        st.metric("Reserved Appointments", reserved_total)
-        st.metric("Cancelled Slots", cancelled_total)
-
-# --- Triage Queue ---
-    # Get the display data first to calculate correct count
-    show_priority_only = False
-    show_routine_only = False
-    
-    # Controls
-    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
-    with col1:
-        st.markdown("*Veterans prioritized by VA categories and AI risk assessment. Click actions for immediate response.*")
-    
-    with col2:
-        show_priority_only = st.checkbox("Emergent/Urgent Only", value=False)
-    
-    with col3:
-        show_routine_only = st.checkbox("Routine Only", value=False)
-    
-    with col4:
-        show_all_columns = st.checkbox("All Columns", value=False)
+    with col4:
+        show_all_columns = st.checkbox("All Columns", value=False)
     
     with col5:
         if not df_filtered.empty:
@@ -1725,15 +1615,18 @@ def main():
                 )
 
     # Apply display filters based on checkbox selections
+    view_mode = "all"
     if show_priority_only and show_routine_only:
         # If both are selected, show all (ignore both filters)
         df_display = df_filtered
     elif show_priority_only:
         # Show only Emergent and Urgent cases
         df_display = df_filtered[df_filtered['VA Category'].isin(['Emergent', 'Urgent'])]
+        view_mode = "priority"
     elif show_routine_only:
         # Show only Routine cases
         df_display = df_filtered[df_filtered['VA Category'] == 'Routine']
+        view_mode = "routine"
     else:
         # Show all cases (default)
         df_display = df_filtered
@@ -1752,13 +1645,44 @@ def main():
                 'Assigned Clinician', 'Last Contact'
             ]
         
-        display_df = df_display[display_columns].copy()
-        
+        # Server-side paging: sort row positions, then style and send only the visible page
+        page_col1, page_col2, page_col3, page_col4 = st.columns([2, 1, 1, 1])
+        with page_col1:
+            sort_column = st.selectbox("Sort By", [TRIAGE_ORDER] + display_columns, key="triage_sort_column")
+        with page_col2:
+            sort_descending = st.checkbox("Descending", value=False, key="triage_sort_descending")
+        with page_col3:
+            page_size = st.selectbox("Rows per Page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                     key="triage_page_size")
+        # Sorted positions are reused until the data, filters, view or sort change (e.g. while paging)
+        sort_key = (dataset_version, filter_state, view_mode, sort_column, sort_descending)
+        cached_sort = st.session_state.get("triage_sort_cache")
+        if cached_sort is None or cached_sort[0] != sort_key:
+            if cached_sort is not None:
+                # A different table or ordering starts again from its first page
+                st.session_state.triage_page = 1
+            cached_sort = (sort_key, sort_positions(df_display, sort_column, sort_descending))
+            st.session_state.triage_sort_cache = cached_sort
+        positions = cached_sort[1]
+
+        total_pages = page_bounds(len(positions), 1, page_size)[3]
+        if st.session_state.get("triage_page", 1) > total_pages:
+            st.session_state.triage_page = total_pages
+        with page_col4:
+            page_number = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages,
+                                          step=1, key="triage_page")
+
+        start, stop, page_number, total_pages = page_bounds(len(positions), page_number, page_size)
+        display_df = page_frame(df_display, positions, page_number, page_size, display_columns)
+
+        table_data, column_config = style_veterans_table(display_df)
         st.dataframe(
-            style_veterans_table(display_df),
+            table_data,
             use_container_width=True,
             hide_index=True,
+            column_config=column_config,
         )
+        st.caption(f"Showing veterans {start + 1}–{stop} of {len(positions)} · page {page_number} of {total_pages}")
         
         # REMOVED: All duplicate priority cases sections that were previously here
         # Priority cases are now shown at the top of the dashboard only
@@ -1766,7 +1690,9 @@ def main():
     else:
         st.warning("⚠️ No veterans match the current criteria. Adjust filters to view data.")
 
-# --- Individual Veteran Analysis ---
+@fragment
+def individual_analysis_section(df_filtered):
+    """Per-veteran details, AI assessment and actions"""
     st.header("🔍 Individual Patient Analysis")
     
     if not df_filtered.empty:
@@ -1795,10 +1721,12 @@ def main():
                 if selected_vet_id:
                     with st.spinner("🤖 Generating individual patient AI assessment..."):
                         vet_data = df_filtered[df_filtered["Veteran ID"] == selected_vet_id]
-                        individual_summary = generate_ai_summary(vet_data, "individual_patient")
+                        individual_summary = stream_ai_response(
+                            generate_ai_summary(vet_data, "individual_patient", stream=True), st.empty(), st.markdown
+                        )
                         st.session_state.ai_summaries[selected_vet_id] = individual_summary
                         
-                        if "Error" not in individual_summary and "API Error" not in individual_summary:
+                        if not ai_failed(individual_summary):
                             st.success("✅ AI Assessment Generated")
                         else:
                             st.error("❌ AI Assessment Failed")
@@ -1828,7 +1756,10 @@ def main():
             if ask_individual_button and individual_question:
                 with st.spinner("🤖 Analyzing patient profile..."):
                     vet_data = df_filtered[df_filtered["Veteran ID"] == selected_vet_id]
-                    individual_answer = ask_ai_question(individual_question, f"Individual patient data: {vet_data.iloc[0].to_dict()}")
+                    individual_answer = stream_ai_response(
+                        ask_ai_question(individual_question, f"Individual patient data: {vet_data.iloc[0].to_dict()}", stream=True),
+                        st.empty(), st.info,
+                    )
                     
                     qa_key = f"{selected_vet_id}_qa"
                     if qa_key not in st.session_state:
@@ -1847,7 +1778,7 @@ def main():
                 for i, qa in enumerate(reversed(st.session_state[qa_key])):
                     with st.expander(f"Q: {qa['question'][:50]}... ({qa['timestamp']})", expanded=(i==0)):
                         st.markdown(f"**Question:** {qa['question']}")
-                        if "Error" not in qa['answer'] and "API Error" not in qa['answer']:
+                        if not ai_failed(qa['answer']):
                             st.success("🤖 AI Response:")
                             st.info(qa['answer'])
                         else:
@@ -1856,7 +1787,7 @@ def main():
             # Display AI assessment if available
             if selected_vet_id in st.session_state.ai_summaries:
                 assessment_text = st.session_state.ai_summaries[selected_vet_id]
-                if "Error" not in assessment_text and "API Error" not in assessment_text:
+                if not ai_failed(assessment_text):
                     st.markdown(f"""
                     <div class="ai-summary-individual">
                     <h4>🤖 AI Clinical Assessment for {veteran['Name']}</h4>
@@ -1892,9 +1823,11 @@ def main():
                 else:
                     st.markdown("**Treatment Preference:** 🔄 Both Therapy & Medication")
                 
-                if veteran['Priority Notes']:
+                # Blank notes arrive as NaN in the categorical column, and NaN is truthy
+                priority_notes = format_text(veteran['Priority Notes'])
+                if priority_notes:
                     st.markdown("**Priority Notes:**")
-                    st.markdown(f"> {veteran['Priority Notes']}")
+                    st.markdown(f"> {priority_notes}")
 
             with col2:
                 st.markdown("### 👤 Demographics")
@@ -1903,7 +1836,7 @@ def main():
                 st.markdown(f"**Branch:** {veteran['Branch']}")
                 st.markdown(f"**Service Era:** {veteran['Service Era']}")
                 # Clean the intake date display to remove time
-                intake_date_clean = str(veteran['Intake Date']).split(' ')[0] if ' ' in str(veteran['Intake Date']) else str(veteran['Intake Date'])
+                intake_date_clean = format_date(veteran['Intake Date'])
                 st.markdown(f"**Intake:** {intake_date_clean}")
                 st.markdown(f"**Clinician:** {veteran['Assigned Clinician']}")    
 
@@ -1951,7 +1884,7 @@ def main():
             st.markdown("### ⚠️ Risk Factor Analysis")
             risk_factors = {
                 "Suicide Risk (C-SSRS)": veteran['C-SSRS Screen'],
-                "Self-Harm Ideation": veteran['PHQ-9 Q9 (Self-Harm)'],
+                "Self-Harm Ideation": format_flag(veteran['PHQ-9 Q9 (Self-Harm)']),
                 "Social Support": veteran['Social Support'],
                 "Substance Use Risk": veteran['Substance Use Risk'],
                 "Housing Stability": veteran['Housing Status'],
@@ -2084,6 +2017,267 @@ Generated by TriageView Clinical Decision Support System
                     mime="text/plain"
                 )
 
+# --- Main Application ---
+def main():
+    initialize_session_state()
+    load_enhanced_css()
+    
+    # Load the scored dataset (reused across reruns while the payload is unchanged)
+    df, dataset_version = load_triage_dataset()
+    filter_index = get_filter_index_cache().get_or_build(dataset_version, lambda: FilterIndex(df))
+
+    def build_triage_queue():
+        # Delta versions reuse the queue the syncer moved veteran by veteran
+        queue = get_delta_syncer().queue_for(dataset_version)
+        return queue if queue is not None else TriageQueue.from_frame(df)
+
+    triage_queue = get_triage_queue_cache().get_or_build(dataset_version, build_triage_queue)
+
+    # --- Header ---
+    st.title("🏥 TriageView: Veteran Mental Health Dashboard")
+    st.markdown("*Advanced AI-powered clinical decision support for veteran mental health triage*")
+
+    # Enhanced alert for emergent cases (counts kept by the triage queue)
+    emergent_cases = triage_queue.count('Emergent')
+    urgent_cases = triage_queue.count('Urgent')
+    
+    if emergent_cases > 0:
+        st.markdown(f"""
+        <div class="priority-alert">
+        🚨 EMERGENT ALERT: {emergent_cases} veteran(s) at imminent risk require immediate crisis intervention
+        </div>
+        """, unsafe_allow_html=True)
+    elif urgent_cases > 0:
+        st.warning(f"⚠️ URGENT: {urgent_cases} veteran(s) require same-day evaluation")
+
+    # --- PRIORITY CASES SECTION - RIGHT AFTER ALERT ---
+    # df is in triage order, so each category is one contiguous block of rows
+    emergent_in_view = df.iloc[triage_queue.category_slice('Emergent')]
+    urgent_in_view = df.iloc[triage_queue.category_slice('Urgent')]
+    
+    priority_cases_section(emergent_in_view, urgent_in_view)
+
+    # if not urgent_in_view.empty:
+    #     st.header("⚠️ Urgent Cases - Same Day Evaluation Required")
+    #     for _, veteran in urgent_in_view.head(3).iterrows():
+    #         col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
+    #         with col1:
+    #             st.markdown(f"**{veteran['Name']}** ({veteran['Veteran ID']}) - {veteran['VA Category']}")
+    #         with col2:
+    #             if st.button("📋 Review", key=f"review_urgent_{veteran['Veteran ID']}", help="Open clinical review"):
+    #                 response = handle_button_click("review", veteran['Veteran ID'])
+    #                 st.success(response)
+    #         with col3:
+    #             if st.button("📞 Contact", key=f"contact_urgent_{veteran['Veteran ID']}", help="Prepare contact info"):
+    #                 response = handle_button_click("contact", veteran['Veteran ID'])
+    #                 st.success(response)
+    #         with col4:
+    #             if st.button("⚠️ Urgent", key=f"urgent_{veteran['Veteran ID']}", help="Same-day scheduling"):
+    #                 response = handle_button_click("schedule", veteran['Veteran ID'])
+    #                 st.warning(response)
+    #         with col5:
+    #             if st.button("📅 Schedule", key=f"schedule_urgent_{veteran['Veteran ID']}", help="Same-day appointment"):
+    #                 response = handle_button_click("schedule", veteran['Veteran ID'])
+    #                 st.info(response)
+
+    # --- AI Summary Section ---
+    ai_overview_section(df)
+
+    # --- Enhanced Sidebar Filters ---
+    st.sidebar.header("🔍 Advanced Filtering")
+    
+    if st.sidebar.button("🔄 Reset All Filters", key=f"reset_button_{st.session_state.filter_reset_counter}"):
+        reset_all_filters()
+        st.sidebar.success("✅ Filters Reset!")
+        st.rerun()
+    
+    if st.sidebar.button("♻️ Reload Dataset", key="invalidate_dataset_cache", help="Discard the cached scored dataset and rebuild it from source"):
+        get_dataset_cache().invalidate()
+        get_filter_index_cache().invalidate()
+        get_filter_result_cache().invalidate()
+        get_triage_queue_cache().invalidate()
+        get_delta_syncer().reset()
+        with st.spinner("Reloading dataset..."):
+            get_dataset_refresher().refresh_now()
+        st.rerun()
+    
+    # Get unique values for filters (option labels carry bitmap-index row counts)
+    va_categories = sorted(df["VA Category"].unique(), key=lambda x: ['Emergent', 'Urgent', 'Routine'].index(x))
+    c_ssrs_unique = sorted(df["C-SSRS Screen"].unique())
+    risk_level_unique = sorted(df["Risk Level"].unique(), key=lambda x: (
+        0 if "Critical" in x else 1 if "High" in x else 2 if "Medium" in x else 3
+    ))
+    
+    # Default values
+    defaults = {
+        'va_category': va_categories,
+        'c_ssrs': c_ssrs_unique,
+        'risk_level': risk_level_unique,
+        'gender': sorted(df["Gender"].unique()),
+        'branch': sorted(df["Branch"].unique()),
+        'clinician': sorted(df["Assigned Clinician"].unique()),
+        'treatment_preference': sorted(df["Treatment Preference"].unique())
+    }
+    
+    # Enhanced filters
+    va_category_filter = st.sidebar.multiselect(
+        "VA Triage Category", va_categories, defaults['va_category'],
+        format_func=value_count_label(filter_index, "VA Category"),
+        key=f"va_category_filter_{st.session_state.filter_reset_counter}",
+        help="Official VA triage categories: Emergent (imminent risk), Urgent (same day eval), Routine (timely care)"
+    )
+    
+    c_ssrs_filter = st.sidebar.multiselect(
+        "C-SSRS Status", c_ssrs_unique, defaults['c_ssrs'],
+        format_func=value_count_label(filter_index, "C-SSRS Screen"),
+        key=f"c_ssrs_filter_{st.session_state.filter_reset_counter}"
+    )
+    
+    risk_level_filter = st.sidebar.multiselect(
+        "Risk Level", risk_level_unique, defaults['risk_level'],
+        format_func=value_count_label(filter_index, "Risk Level"),
+        key=f"risk_level_filter_{st.session_state.filter_reset_counter}"
+    )
+    
+    # New Treatment Preference Filter
+    treatment_preference_filter = st.sidebar.multiselect(
+        "Treatment Preference", sorted(df["Treatment Preference"].unique()), defaults['treatment_preference'],
+        format_func=value_count_label(filter_index, "Treatment Preference"),
+        key=f"treatment_preference_filter_{st.session_state.filter_reset_counter}",
+        help="Filter by veteran's preferred treatment modality"
+    )
+    
+    gender_filter = st.sidebar.multiselect(
+        "Gender", sorted(df["Gender"].unique()), defaults['gender'],
+        format_func=value_count_label(filter_index, "Gender"),
+        key=f"gender_filter_{st.session_state.filter_reset_counter}"
+    )
+    
+    clinician_filter = st.sidebar.multiselect(
+        "Assigned Clinician", sorted(df["Assigned Clinician"].unique()), defaults['clinician'],
+        format_func=value_count_label(filter_index, "Assigned Clinician"),
+        key=f"clinician_filter_{st.session_state.filter_reset_counter}"
+    )
+    
+    # Score sliders
+    phq9_slider = st.sidebar.slider(
+        "PHQ-9 Depression Score", 0, 27, (0, 27),
+        key=f"phq9_slider_{st.session_state.filter_reset_counter}"
+    )
+    
+    gad7_slider = st.sidebar.slider(
+        "GAD-7 Anxiety Score", 0, 21, (0, 21),
+        key=f"gad7_slider_{st.session_state.filter_reset_counter}"
+    )
+
+    # --- Apply Filters ---
+    # One combined mask over the typed columns; sliders resolve through sorted range indexes (filter_engine.py)
+    filter_state = build_filter_state(
+        {
+            "VA Category": va_category_filter,
+            "C-SSRS Screen": c_ssrs_filter,
+            "Risk Level": risk_level_filter,
+            "Treatment Preference": treatment_preference_filter,
+            "Gender": gender_filter,
+            "Assigned Clinician": clinician_filter,
+        },
+        {"PHQ-9 Score": phq9_slider, "GAD-7 Score": gad7_slider},
+    )
+    # Recently used filter combinations are served from the filter-result cache
+    df_filtered = get_filter_result_cache().apply(df, dataset_version, filter_state, filter_index)
+
+    # --- Analytics Overview ---
+    st.header("📊 Analytics Overview")
+    
+    col1, col2, col3 = st.columns([1, 1, 1], gap="medium")
+    
+    with col1:
+        if not df_filtered.empty:
+            fig1 = create_va_category_chart(df_filtered)
+            st.plotly_chart(fig1, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info("No data available for VA category chart.")
+    
+    with col2:
+        if not df_filtered.empty:
+            fig2 = create_treatment_preference_chart(df_filtered)
+            st.plotly_chart(fig2, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info("No data available for treatment preference chart.")
+    
+    with col3:
+        if not df_filtered.empty:
+            fig3 = create_intake_timeline(df_filtered)
+            st.plotly_chart(fig3, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info("No data available for intake timeline.")
+
+    # --- Key Metrics Dashboard ---
+    st.header("📈 VA Triage Overview")
+    
+    col1, col2, col3, col4, col5, col6 = st.columns(6, gap="small")
+    
+    with col1:
+        emergent_count = len(df_filtered[df_filtered['VA Category'] == 'Emergent'])
+        st.metric("🚨 Emergent", emergent_count, help="Veterans at imminent risk requiring immediate crisis intervention")
+    
+    with col2:
+        urgent_count = len(df_filtered[df_filtered['VA Category'] == 'Urgent'])
+        st.metric("⚠️ Urgent", urgent_count, help="Veterans requiring same-day evaluation or care")
+    
+    with col3:
+        routine_count = len(df_filtered[df_filtered['VA Category'] == 'Routine'])
+        st.metric("📋 Routine", routine_count, help="Veterans needing timely care but not at imminent risk")
+    
+    with col4:
+        therapy_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Therapy'])
+        st.metric("🗣️ Therapy", therapy_count, help="Veterans preferring therapy-only treatment")
+    
+    with col5:
+        medication_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Medication'])
+        st.metric("💊 Medication", medication_count, help="Veterans preferring medication-only treatment")
+    
+    with col6:
+        both_count = len(df_filtered[df_filtered['Treatment Preference'] == 'Both'])
+        st.metric("🔄 Both", both_count, help="Veterans preferring both therapy and medication")
+
+    # Additional clinical metrics
+    if not df_filtered.empty:
+        st.subheader("🔍 Risk Factor Analysis")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            homeless_count = len(df_filtered[df_filtered['Housing Status'] == 'Homeless'])
+            homeless_pct = (homeless_count / len(df_filtered)) * 100
+            st.metric("🏠 Housing Risk", f"{homeless_count} ({homeless_pct:.1f}%)",
+                     help="Veterans experiencing homelessness")
+        
+        with col2:
+            high_substance = len(df_filtered[df_filtered['Substance Use Risk'] == 'High'])
+            substance_pct = (high_substance / len(df_filtered)) * 100
+            st.metric("🍺 Substance Risk", f"{high_substance} ({substance_pct:.1f}%)",
+                     help="Veterans with high substance use risk")
+        
+        with col3:
+            low_support = len(df_filtered[df_filtered['Social Support'] == 'Low'])
+            support_pct = (low_support / len(df_filtered)) * 100
+            st.metric("👥 Social Risk", f"{low_support} ({support_pct:.1f}%)",
+                     help="Veterans with limited social support")
+        
+        with col4:
+            avg_phq9 = df_filtered['PHQ-9 Score'].mean()
+            st.metric("📊 Avg PHQ-9", f"{avg_phq9:.1f}",
+                     help="Average depression severity score")
+
+    # --- Appointment Calendar ---
+    calendar_section()
+
+    # --- Triage Queue ---
+    triage_queue_section(df_filtered, dataset_version, filter_state)
+
+    # --- Individual Veteran Analysis ---
+    individual_analysis_section(df_filtered)
+
     # --- System Information ---
     st.markdown("---")
     st.markdown("### 📊 System Status")
@@ -2094,12 +2288,34 @@ Generated by TriageView Clinical Decision Support System
     with col2:
         st.info(f"**Current View:** {len(df_filtered)}")
     with col3:
-        ai_count = len([k for k in st.session_state.ai_summaries.keys() if not st.session_state.ai_summaries[k].startswith("Error")])
+        ai_count = len([k for k in st.session_state.ai_summaries.keys() if not ai_failed(st.session_state.ai_summaries[k])])
         st.info(f"**AI Summaries:** {ai_count}")
     with col4:
         st.info(f"**Calendar Slots:** {len(st.session_state.appointments)}")
     with col5:
         st.info(f"**Last Updated:** {datetime.now().strftime('%H:%M:%S')}")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        cache_stats = get_dataset_cache().stats()
+        st.info(f"**Dataset Cache:** {cache_stats['hits']} hits / {cache_stats['misses']} builds")
+    with col4:
+        filter_stats = get_filter_result_cache().stats()
+        st.info(f"**Filter Cache:** {filter_stats['hits']} hits / {filter_stats['misses']} misses "
+                f"({filter_stats['bytes'] / 1024:,.0f} KB, {filter_stats['entries']} entries)")
+    with col2:
+        refresher = get_dataset_refresher()
+        source = refresher.source or "synthetic"
+        st.info(f"**Data Source:** {source}{' (refreshing)' if refresher.refreshing else ''}")
+    with col3:
+        st.info(f"**Snapshot Age:** {format_age(get_snapshot_store().age_seconds())}")
+
+    with st.expander("🧮 Memory Footprint"):
+        if st.button("Measure DataFrame memory", key="memory_report"):
+            report = memory_footprint_report(df)
+            total = report.iloc[-1]
+            st.caption(f"{total['Before (KB)'] / 1024:.1f} MB untyped → {total['After (KB)'] / 1024:.1f} MB typed ({total['Saved %']}% saved)")
+            st.dataframe(report, use_container_width=True, hide_index=True)
 
     # Quick add veteran button
     if st.button("➕ Add New Veteran", key="add_veteran"):
@@ -2110,12 +2326,22 @@ Generated by TriageView Clinical Decision Support System
     st.sidebar.markdown("### 🤖 AI Status")
     if st.sidebar.button("🔧 Test AI Connection"):
         with st.spinner("Testing Gemini AI..."):
-            test_response = call_gemini_api("Hello, respond with 'AI connection successful'")
+            test_response = call_gemini_api("Hello, respond with 'AI connection successful'", use_cache=False)
             if "AI connection successful" in test_response:
                 st.sidebar.success("✅ AI Connected")
             else:
                 st.sidebar.error("❌ AI Connection Failed")
                 st.sidebar.error(test_response)
+    client_stats = get_gemini_client().stats()
+    st.sidebar.caption(f"Gemini: {client_stats['requests']} requests, {client_stats['retries']} retries, "
+                       f"{client_stats['failures']} failures · circuit {client_stats['circuit']}")
+    limiter_stats = get_gemini_limiter().stats()
+    st.sidebar.caption(f"Gemini queue: {limiter_stats['queue_depth']} waiting (max {limiter_stats['max_queue_depth']}), "
+                       f"{limiter_stats['in_flight']} in flight · {limiter_stats['coalesced']} coalesced · "
+                       f"wait avg {limiter_stats['avg_wait']:.1f}s / max {limiter_stats['max_wait']:.1f}s")
+    prompt_stats = get_prompt_cache().stats()
+    st.sidebar.caption(f"Prompt cache: {prompt_stats['hits']} hits ({prompt_stats['disk_hits']} from disk) / "
+                       f"{prompt_stats['misses']} misses · {prompt_stats['memory_entries']} in memory")
 
 if __name__ == "__main__":
     main()        
@@ -0,0 +1,231 @@
+import math
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+# --- Triage Priority Queue ---
+# Keeps veterans in triage order, most urgent first: VA Category rank, then
+# risk score (both descending), then intake date (oldest first). Each veteran
+# is one int64 key packing those fields above a serial number, so ordering
+# is plain integer comparison. Keys live in a list of bounded sorted buckets:
+# insert, update and remove cost a binary search plus a shift of at most one
+# bucket, and the top k come straight off the front.
+#
+# Key layout (high to low bits):
+#   rank 2 | risk 4 | intake day 18 | serial 32
+
+CATEGORY_RANK = {'Emergent': 3, 'Urgent': 2, 'Routine': 1}
+BUCKET_SIZE = 1000
+
+_SERIAL_BITS = 32
+_DAY_BITS = 18
+_RISK_BITS = 4
+_DAY_SHIFT = _SERIAL_BITS
+_RISK_SHIFT = _DAY_SHIFT + _DAY_BITS
+_RANK_SHIFT = _RISK_SHIFT + _RISK_BITS
+_SERIAL_MASK = (1 << _SERIAL_BITS) - 1
+_MAX_DAY = (1 << _DAY_BITS) - 1  # Missing intake dates sort last within their score
+_MAX_RISK = (1 << _RISK_BITS) - 1
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+
+def _intake_days(values):
+    days = pd.to_datetime(values, errors='coerce').to_numpy(dtype="datetime64[D]")
+    missing = np.isnat(days)
+    days = np.where(missing, _EPOCH_DAY, days)
+    offsets = (days - _EPOCH_DAY).astype(np.int64)
+    return np.where(missing, _MAX_DAY, np.clip(offsets, 0, _MAX_DAY - 1))
+
+
+def triage_keys(categories, risk_scores, intake_dates, serials):
+    """Vectorized int64 triage keys; smaller keys are more urgent"""
+    codes, values = pd.factorize(pd.Series(categories, copy=False))
+    # Rank each distinct category once; code -1 (missing) picks the trailing 0
+    ranks = np.append([CATEGORY_RANK.get(value, 0) for value in values], 0).astype(np.int64)[codes]
+    risks = np.clip(np.nan_to_num(pd.to_numeric(risk_scores, errors='coerce').astype(float), nan=0), 0, _MAX_RISK)
+    return (
+        ((3 - ranks) << _RANK_SHIFT)
+        | ((_MAX_RISK - risks.astype(np.int64)) << _RISK_SHIFT)
+        | (_intake_days(intake_dates) << _DAY_SHIFT)
+        | np.asarray(serials, dtype=np.int64)
+    )
+
+
+def _scalar_key(category, risk_score, intake_date, serial):
+    """triage_keys() for one veteran without the pandas round trip"""
+    rank = CATEGORY_RANK.get(category, 0)
+    try:
+        risk = float(risk_score)
+    except (TypeError, ValueError):
+        risk = 0.0
+    risk = 0 if math.isnan(risk) else int(min(max(risk, 0), _MAX_RISK))
+    intake = pd.to_datetime(intake_date, errors='coerce')
+    if pd.isna(intake):
+        day = _MAX_DAY
+    else:
+        day = min(max((intake.normalize() - pd.Timestamp("1970-01-01")).days, 0), _MAX_DAY - 1)
+    return ((3 - rank) << _RANK_SHIFT) | ((_MAX_RISK - risk) << _RISK_SHIFT) | (day << _DAY_SHIFT) | serial
+
+
+def triage_order(df):
+    """Row positions of df in triage order; ties keep their current relative order"""
+    keys = triage_keys(df['VA Category'], df['Risk Score'], df['Intake Date'], np.arange(len(df)))
+    # Keys are unique (they end in the row position), so a plain sort already is the stable order
+    return np.sort(keys) & _SERIAL_MASK
+
+
+class TriageQueue:
+    """Veterans in triage order, updatable one veteran at a time"""
+
+    def __init__(self, bucket_size=BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self._buckets = []  # Sorted lists of keys, each at most 2 * bucket_size long
+        self._maxes = []    # Last key of each bucket
+        self._key_map = {}  # veteran_id -> key, built on first update (see _keys)
+        self._ids = []      # serial -> veteran_id (None once removed)
+        self._counts = [0, 0, 0, 0]  # Veterans per rank part (Emergent, Urgent, Routine, other)
+        self._size = 0
+
+    @classmethod
+    def from_frame(cls, df, key="Veteran ID", bucket_size=BUCKET_SIZE):
+        """Build a queue from a scored frame; serials are df's row positions"""
+        queue = cls(bucket_size)
+        keys = np.sort(triage_keys(df['VA Category'], df['Risk Score'], df['Intake Date'], np.arange(len(df))))
+        sorted_keys = keys.tolist()
+        queue._buckets = [sorted_keys[i:i + bucket_size] for i in range(0, len(sorted_keys), bucket_size)]
+        queue._maxes = [bucket[-1] for bucket in queue._buckets]
+        queue._ids = df[key].tolist()
+        queue._key_map = None
+        queue._counts = np.bincount(keys >> _RANK_SHIFT, minlength=4).tolist()
+        queue._size = len(sorted_keys)
+        return queue
+
+    def copy(self):
+        """Independent copy, so the next dataset version can be updated without touching this one"""
+        queue = TriageQueue(self.bucket_size)
+        queue._buckets = [list(bucket) for bucket in self._buckets]
+        queue._maxes = list(self._maxes)
+        queue._key_map = None if self._key_map is None else dict(self._key_map)
+        queue._ids = list(self._ids)
+        queue._counts = list(self._counts)
+        queue._size = self._size
+        return queue
+
+    @property
+    def _keys(self):
+        # Read-only queues (one per dataset version) never pay for the ID map
+        if self._key_map is None:
+            self._key_map = {self._ids[k & _SERIAL_MASK]: k for bucket in self._buckets for k in bucket}
+        return self._key_map
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, veteran_id):
+        return veteran_id in self._keys
+
+    def _insert(self, k):
+        self._size += 1
+        self._counts[k >> _RANK_SHIFT] += 1
+        if not self._buckets:
+            self._buckets.append([k])
+            self._maxes.append(k)
+            return
+        i = min(bisect_left(self._maxes, k), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, k)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.bucket_size:
+            half = len(bucket) // 2
+            self._buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+
+    def _delete(self, k):
+        self._size -= 1
+        self._counts[k >> _RANK_SHIFT] -= 1
+        i = bisect_left(self._maxes, k)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, k)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def push(self, veteran_id, category, risk_score, intake_date):
+        """Insert a veteran, or move them after their category, score or intake date changed"""
+        old = self._keys.get(veteran_id)
+        if old is not None:
+            self._delete(old)
+            serial = old & _SERIAL_MASK
+        else:
+            serial = len(self._ids)
+            self._ids.append(veteran_id)
+        k = _scalar_key(category, risk_score, intake_date, serial)
+        self._keys[veteran_id] = k
+        self._insert(k)
+
+    def push_rows(self, df, key="Veteran ID"):
+        """push() every veteran in a scored frame"""
+        for row in zip(df[key], df['VA Category'], df['Risk Score'], df['Intake Date']):
+            self.push(*row)
+
+    def remove(self, veteran_id):
+        """Drop a veteran from the queue; unknown IDs are ignored"""
+        k = self._keys.pop(veteran_id, None)
+        if k is not None:
+            self._delete(k)
+            self._ids[k & _SERIAL_MASK] = None
+
+    def _iter_keys(self, start_key=0):
+        i = bisect_left(self._maxes, start_key)
+        if i == len(self._buckets):
+            return
+        bucket = self._buckets[i]
+        for j in range(bisect_left(bucket, start_key), len(bucket)):
+            yield bucket[j]
+        for j in range(i + 1, len(self._buckets)):
+            yield from self._buckets[j]
+
+    def top_serials(self, k, category=None):
+        """Serials of the k most urgent veterans, optionally within one VA Category
+
+        For a queue built by from_frame() these are row positions in that frame.
+        """
+        serials = []
+        if k <= 0:
+            return serials
+        start_key, end_key = 0, None
+        if category is not None:
+            rank_part = 3 - CATEGORY_RANK.get(category, 0)
+            start_key, end_key = rank_part << _RANK_SHIFT, (rank_part + 1) << _RANK_SHIFT
+        for key in self._iter_keys(start_key):
+            if end_key is not None and key >= end_key:
+                break
+            serials.append(key & _SERIAL_MASK)
+            if len(serials) == k:
+                break
+        return serials
+
+    def top(self, k, category=None):
+        """Veteran IDs of the k most urgent veterans, optionally within one VA Category"""
+        return [self._ids[serial] for serial in self.top_serials(k, category)]
+
+    def count(self, category):
+        """Number of veterans in one VA Category"""
+        return self._counts[3 - CATEGORY_RANK.get(category, 0)]
+
+    def category_slice(self, category):
+        """Row slice holding one VA Category in a frame laid out in this queue's order
+
+        Categories are contiguous in triage order, so the slice follows from the
+        counts alone; df.iloc[slice][:k] is then the category's top k in O(k).
+        """
+        rank_part = 3 - CATEGORY_RANK.get(category, 0)
+        start = sum(self._counts[:rank_part])
+        return slice(start, start + self._counts[rank_part])
+
+    def ids(self):
+        """All veteran IDs in triage order"""
+        return [self._ids[k & _SERIAL_MASK] for bucket in self._buckets for k in bucket]
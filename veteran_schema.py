@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# --- Veterans DataFrame Schema ---
+# Declared compact dtypes applied at ingest: low-cardinality text becomes
+# pandas categoricals, bounded scores use int8/int16, Yes/No answers become
+# bool flags and dates become datetime64. Columns not listed keep the dtype
+# pandas inferred.
+
+CATEGORY = "category"
+FLAG = "flag"
+DATE = "date"
+
+VETERAN_SCHEMA = {
+    "Gender": CATEGORY,
+    "Branch": CATEGORY,
+    "Service Era": CATEGORY,
+    "C-SSRS Screen": CATEGORY,
+    "Social Support": CATEGORY,
+    "Substance Use Risk": CATEGORY,
+    "Housing Status": CATEGORY,
+    "Treatment Preference": CATEGORY,
+    "Assigned Clinician": CATEGORY,
+    "Priority Notes": CATEGORY,
+    "Contact Method": CATEGORY,
+    "Emergency Contact": CATEGORY,
+    "Transportation": CATEGORY,
+    "VA Category": CATEGORY,
+    "VA Explanation": CATEGORY,
+    "Risk Level": CATEGORY,
+    "Risk Explanation": CATEGORY,
+    "PHQ-9 Q9 (Self-Harm)": FLAG,
+    "Previous Mental Health Treatment": FLAG,
+    "Intake Date": DATE,
+    "Last Contact": DATE,
+    "Age": "int8",
+    "PHQ-9 Score": "int8",
+    "GAD-7 Score": "int8",
+    "PCL-5 Score": "int16",
+    "VA Risk Score": "int8",
+    "Risk Score": "int8",
+}
+
+FLAG_TRUE_VALUES = {True, "Yes", "yes", "YES", "Y", "y", "True", "true"}
+
+
+def _to_flag(series):
+    if series.dtype == bool:
+        return series
+    return series.isin(FLAG_TRUE_VALUES)
+
+
+def _to_small_int(series, dtype):
+    values = pd.to_numeric(series, errors='coerce')
+    if values.isna().any() or (values % 1 != 0).any():
+        return values.astype(np.float32)  # Keep missing values as NaN rather than a nullable extension type
+    bounds = np.iinfo(dtype)
+    if len(values) and (values.min() < bounds.min or values.max() > bounds.max):
+        return values.astype(np.int32)
+    return values.astype(dtype)
+
+
+def apply_veteran_schema(df):
+    """Convert the columns of df that appear in VETERAN_SCHEMA to their declared dtypes"""
+    for column, kind in VETERAN_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if kind == CATEGORY:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[column] = series.astype("category")
+        elif kind == FLAG:
+            df[column] = _to_flag(series)
+        elif kind == DATE:
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                df[column] = pd.to_datetime(series, errors='coerce')
+        elif series.dtype != kind:
+            df[column] = _to_small_int(series, kind)
+    return df
+
+
+def concat_frames(frames):
+    """pd.concat that keeps categorical columns categorical by unioning their categories"""
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    categorical = [
+        column for column in frames[0].columns
+        if all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    if categorical:
+        categories = {
+            column: pd.api.types.union_categoricals([frame[column] for frame in frames]).categories
+            for column in categorical
+        }
+        aligned = []
+        for frame in frames:
+            frame = frame.copy(deep=False)
+            for column in categorical:
+                frame[column] = frame[column].cat.set_categories(categories[column])
+            aligned.append(frame)
+        frames = aligned
+    return pd.concat(frames, ignore_index=True)
+
+
+def is_yes(value):
+    """True for a set bool flag or a legacy "Yes" string"""
+    return value in FLAG_TRUE_VALUES
+
+
+def format_flag(value):
+    """Render a bool flag (or legacy Yes/No string) as Yes/No for display"""
+    return "Yes" if is_yes(value) else "No"
+
+
+def format_date(value):
+    """Render a datetime64 value (or legacy date string) as YYYY-MM-DD for display"""
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return "Unknown"
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime("%Y-%m-%d")
+    return str(value).split(' ')[0]
+
+
+def format_text(value):
+    """Stripped text of a free-text or categorical value; "" when missing (None/NaN) or blank"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def _legacy_column(series):
+    """Rebuild a column the way it was stored before the schema: object strings and int64"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(object)
+    if series.dtype == bool:
+        return series.map({True: "Yes", False: "No"}).astype(object)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y-%m-%d").astype(object)
+    if pd.api.types.is_integer_dtype(series):
+        return series.astype(np.int64)
+    if pd.api.types.is_float_dtype(series):
+        return series.astype(np.float64)
+    return series
+
+
+def memory_footprint_report(df):
+    """Per-column memory usage of df versus the untyped object/int64 layout it replaces"""
+    rows = []
+    for column in df.columns:
+        typed = df[column]
+        legacy = _legacy_column(typed)
+        rows.append({
+            "Column": column,
+            "Before dtype": str(legacy.dtype),
+            "After dtype": str(typed.dtype),
+            "Before (KB)": legacy.memory_usage(deep=True, index=False) / 1024,
+            "After (KB)": typed.memory_usage(deep=True, index=False) / 1024,
+        })
+    report = pd.DataFrame(rows)
+    totals = {
+        "Column": "TOTAL", "Before dtype": "", "After dtype": "",
+        "Before (KB)": report["Before (KB)"].sum(), "After (KB)": report["After (KB)"].sum(),
+    }
+    report = pd.concat([report, pd.DataFrame([totals])], ignore_index=True)
+    report["Saved %"] = (1 - report["After (KB)"] / report["Before (KB)"]).mul(100).round(1)
+    return report